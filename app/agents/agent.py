@@ -1,17 +1,50 @@
-from langgraph.graph import StateGraph, MessagesState
+import json
+import logging
+import operator
+from typing import Annotated, Any
+
+from langgraph.graph import END, START, StateGraph, MessagesState
 from langgraph.prebuilt import ToolNode
 
 from app.agents.llm import build_llm
+from app.agents.structured_output import (
+    DIMENSION_KEYS,
+    AnalysisOutputError,
+    load_json_object,
+    parse_resume_screen,
+    weighted_match_score,
+)
+from app.core.config import settings
+from app.core.tracing import tracer
 from app.agents.tools import TOOLS
-from app.prompts.resume_analysis_prompt import RESUME_ANALYSIS_SYSTEM_PROMPT
-from langchain_core.messages import SystemMessage
+from app.prompts.resume_analysis_prompt import (
+    CONTACT_KEYS,
+    DIMENSION_GROUPS,
+    RESUME_ANALYSIS_SYSTEM_PROMPT,
+    build_dimension_group_prompt,
+    build_dimension_overview_prompt,
+)
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+def _invoke_llm(llm, messages, provider: str | None = None, model: str | None = None):
+    """Invoke the LLM inside an `llm.invoke` span."""
+
+    with tracer.start_as_current_span("llm.invoke") as span:
+        span.set_attribute("llm.provider", provider or settings.llm_provider)
+        span.set_attribute("llm.model", model or settings.llm_model)
+        span.set_attribute("llm.input_messages", len(messages))
+        return llm.invoke(messages)
 
 
 def build_agent():
     llm = build_llm()
 
     def call_model(state: MessagesState):
-        response = llm.invoke(state["messages"])
+        response = _invoke_llm(llm, state["messages"])
         return {"messages": state["messages"] + [response]}
 
     graph = StateGraph(MessagesState)
@@ -23,20 +56,22 @@ def build_agent():
     return graph.compile()
 
 
-def build_resume_processing_agent():
+def build_resume_processing_agent(provider: str | None = None, model: str | None = None):
     """Agent specialized for JD + resume analysis, seeded with a system prompt.
 
     Currently thin wrapper around the base LLM; can be extended with tools/memory.
+    Uses the provider's JSON mode unless LLM_JSON_MODE is off; provider/model
+    default to LLM_PROVIDER/LLM_MODEL.
     """
 
-    llm = build_llm()
+    llm = build_llm(json_mode=settings.llm_json_mode, provider=provider, model=model)
 
     def call_model(state: MessagesState):
         # Prepend resume analysis system prompt once at start
         messages = state["messages"]
         if not messages or not isinstance(messages[0], SystemMessage):
             messages = [SystemMessage(content=RESUME_ANALYSIS_SYSTEM_PROMPT)] + messages
-        response = llm.invoke(messages)
+        response = _invoke_llm(llm, messages, provider, model)
         return {"messages": messages + [response]}
 
     graph = StateGraph(MessagesState)
@@ -45,3 +80,144 @@ def build_resume_processing_agent():
     graph.set_finish_point("agent")
 
     return graph.compile()
+
+
+class ScreenThenAnalyzeState(MessagesState):
+    """`messages`: the full analysis prompt; `screen_messages`: the quick-screen prompt."""
+
+    screen_messages: list[BaseMessage]
+    screen_cutoff: float
+    # estimated_score, reason, passed (and errors when the reply was unusable)
+    screen: dict[str, Any]
+
+
+def build_screen_then_analyze_agent(
+    provider: str | None = None,
+    model: str | None = None,
+    screen_provider: str | None = None,
+    screen_model: str | None = None,
+):
+    """Two-phase agent: a short screen prompt, then the full analysis if it passes.
+
+    The "screen" node asks screen_provider/screen_model (default: the analysis
+    model) for an estimated match score and a reason only. The "analyze" node
+    runs the full resume analysis prompt with provider/model, and only when
+    the estimate reaches `screen_cutoff`; otherwise the graph ends after the
+    screen. A screen reply that cannot be parsed lets the resume through.
+    """
+
+    llm = build_llm(json_mode=settings.llm_json_mode, provider=provider, model=model)
+    if screen_provider or screen_model:
+        screen_llm = build_llm(json_mode=settings.llm_json_mode, provider=screen_provider, model=screen_model)
+    else:
+        screen_llm, screen_provider, screen_model = llm, provider, model
+
+    def screen(state: ScreenThenAnalyzeState):
+        response = _invoke_llm(screen_llm, state["screen_messages"], screen_provider, screen_model)
+        try:
+            # Ollama (BaseLLM) providers reply with a plain str
+            result = parse_resume_screen(str(getattr(response, "content", response)))
+        except AnalysisOutputError as exc:
+            logger.warning("Unusable screen output, continuing to full analysis: %s", exc)
+            return {"screen": {"passed": True, "errors": exc.errors}}
+        return {
+            "screen": {
+                "estimated_score": result.estimated_score,
+                "reason": result.reason,
+                "passed": result.estimated_score >= state["screen_cutoff"],
+            }
+        }
+
+    def analyze(state: ScreenThenAnalyzeState):
+        messages = state["messages"]
+        if not messages or not isinstance(messages[0], SystemMessage):
+            messages = [SystemMessage(content=RESUME_ANALYSIS_SYSTEM_PROMPT)] + messages
+        return {"messages": [_invoke_llm(llm, messages, provider, model)]}
+
+    graph = StateGraph(ScreenThenAnalyzeState)
+    graph.add_node("screen", screen)
+    graph.add_node("analyze", analyze)
+    graph.set_entry_point("screen")
+    graph.add_conditional_edges(
+        "screen", lambda state: "analyze" if state["screen"]["passed"] else END, ["analyze", END]
+    )
+    graph.set_finish_point("analyze")
+
+    return graph.compile()
+
+
+class DimensionFanoutState(MessagesState):
+    """Inputs: the JD and resume blocks and the contact keys still to extract."""
+
+    jd_block: str
+    resume_block: str
+    contact_keys: tuple[str, ...]
+    # one JSON object per assessing node, combined by the "merge" node
+    parts: Annotated[list[dict[str, Any]], operator.add]
+
+
+def build_dimension_fanout_agent(provider: str | None = None, model: str | None = None):
+    """Parallel per-dimension analysis agent for low-latency single-resume analysis.
+
+    One node per DIMENSION_GROUPS entry scores its dimensions with a focused
+    prompt, an "overview" node writes the summary, skills, issues and contact
+    keys, and all of them run in parallel. The "merge" node combines their
+    replies into the full analysis schema, with match_score computed from the
+    dimension scores (weighted_match_score), as the last message. A group
+    whose reply cannot be parsed leaves its dimensions out, so validation
+    and repair handle it like any incomplete analysis.
+    """
+
+    llm = build_llm(json_mode=settings.llm_json_mode, provider=provider, model=model)
+
+    def assessor(node: str, system_prompt):
+        def assess(state: DimensionFanoutState):
+            messages = [
+                SystemMessage(content=system_prompt(state)),
+                HumanMessage(content=f"JOB DESCRIPTION:\n{state['jd_block']}"),
+                HumanMessage(content=f"RESUME:\n{state['resume_block']}"),
+            ]
+            response = _invoke_llm(llm, messages, provider, model)
+            try:
+                part = load_json_object(str(getattr(response, "content", response)))
+            except AnalysisOutputError as exc:
+                logger.warning("Unusable %s output in per-dimension analysis: %s", node, exc)
+                part = {}
+            return {"parts": [{**part, "_node": node}]}
+
+        return assess
+
+    def merge(state: DimensionFanoutState):
+        overview: dict[str, Any] = {}
+        dimensions: dict[str, Any] = {}
+        for part in state["parts"]:
+            if part["_node"] == "overview":
+                overview = part
+            elif isinstance(part.get("dimensions"), dict):
+                group_keys = DIMENSION_GROUPS[part["_node"]]
+                dimensions.update((key, value) for key, value in part["dimensions"].items() if key in group_keys)
+
+        merged: dict[str, Any] = {
+            key: overview[key] for key in CONTACT_KEYS if key in state["contact_keys"] and key in overview
+        }
+        match_score = weighted_match_score(dimensions)
+        if match_score is not None:
+            merged["match_score"] = match_score
+        merged.update((key, overview[key]) for key in ("summary", "skills", "issues") if key in overview)
+        merged["dimensions"] = {key: dimensions[key] for key in DIMENSION_KEYS if key in dimensions}
+        return {"messages": [AIMessage(content=json.dumps(merged, ensure_ascii=False))]}
+
+    graph = StateGraph(DimensionFanoutState)
+    nodes = ["overview", *DIMENSION_GROUPS]
+    graph.add_node(
+        "overview", assessor("overview", lambda state: build_dimension_overview_prompt(state["contact_keys"]))
+    )
+    for group in DIMENSION_GROUPS:
+        graph.add_node(group, assessor(group, lambda state, group=group: build_dimension_group_prompt(group)))
+    graph.add_node("merge", merge)
+    for node in nodes:
+        graph.add_edge(START, node)
+    graph.add_edge(nodes, "merge")
+    graph.set_finish_point("merge")
+
+    return graph.compile()
@@ -0,0 +1,227 @@
+"""Record/replay of LLM calls (LLM_CASSETTE_MODE=record|replay).
+
+Record mode wraps the real provider model and stores every response under a
+fingerprint of the request messages. Replay mode serves those responses back
+without network access, sleeping the recorded latency times
+LLM_CASSETTE_LATENCY_SCALE, so worker batches and JD endpoints can be
+profiled deterministically.
+
+The store is a single SQLite file with zlib-compressed JSON payloads.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManager,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+
+class CassetteMissError(LookupError):
+    """Replay found no recorded response for the request fingerprint."""
+
+
+def fingerprint_messages(messages: list[BaseMessage], namespace: str = "") -> str:
+    """Stable SHA-256 of message types and contents.
+
+    A non-empty namespace (a secondary model answering the same messages)
+    is mixed in; the default namespace keeps fingerprints of existing
+    recordings unchanged.
+    """
+
+    canonical = json.dumps(
+        [[message.type, message.content] for message in messages],
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    if namespace:
+        canonical = f"{namespace}\x00{canonical}"
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CassetteStore:
+    """fingerprint -> recorded response, in a small SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cassette (
+                fingerprint TEXT PRIMARY KEY,
+                llm_provider TEXT,
+                llm_model TEXT,
+                latency_ms INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def put(self, fingerprint: str, *, provider: str, model: str, latency_ms: int, content: str, usage: dict | None) -> None:
+        payload = zlib.compress(json.dumps({"content": content, "usage": usage}).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cassette VALUES (?, ?, ?, ?, ?, ?)",
+                (fingerprint, provider, model, latency_ms, payload, time.time()),
+            )
+            self._conn.commit()
+
+    def get(self, fingerprint: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT llm_provider, llm_model, latency_ms, payload FROM llm_cassette WHERE fingerprint = ?",
+                (fingerprint,),
+            ).fetchone()
+        if row is None:
+            return None
+        provider, model, latency_ms, payload = row
+        return {
+            "llm_provider": provider,
+            "llm_model": model,
+            "latency_ms": latency_ms,
+            **json.loads(zlib.decompress(payload)),
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cassette").fetchone()[0]
+
+
+_stores: dict[str, CassetteStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_cassette_store(path: str) -> CassetteStore:
+    """One shared store per path (both agents write to the same file)."""
+
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = CassetteStore(path)
+        return _stores[path]
+
+
+def _child_callbacks(run_manager) -> CallbackManager | None:
+    """Callbacks for the wrapped model's run, nested under this run.
+
+    Nesting keeps LLMUsageRecorder from counting the call twice.
+    """
+
+    if run_manager is None:
+        return None
+    return CallbackManager(
+        handlers=run_manager.inheritable_handlers,
+        inheritable_handlers=run_manager.inheritable_handlers,
+        parent_run_id=run_manager.run_id,
+        tags=run_manager.inheritable_tags,
+        inheritable_tags=run_manager.inheritable_tags,
+        metadata=run_manager.inheritable_metadata,
+        inheritable_metadata=run_manager.inheritable_metadata,
+    )
+
+
+def _message_from_recording(recording: dict[str, Any]) -> AIMessage:
+    usage = recording.get("usage")
+    return AIMessage(
+        content=recording["content"],
+        usage_metadata=usage or None,
+        response_metadata={"model_name": recording.get("llm_model"), "cassette": True},
+    )
+
+
+class CassetteChatModel(BaseChatModel):
+    """Record (wrapping `inner`) or replay LLM responses keyed by request fingerprint."""
+
+    mode: str
+    store_path: str
+    inner: Any = None
+    provider: str = ""
+    model_name: str = ""
+    latency_scale: float = 1.0
+    namespace: str = ""
+
+    _store: CassetteStore = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported cassette mode: {self.mode}")
+        if self.mode == "record" and self.inner is None:
+            raise ValueError("Cassette record mode needs an inner LLM")
+        self._store = get_cassette_store(self.store_path)
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.mode}"
+
+    def _replay(self, messages: list[BaseMessage]) -> tuple[AIMessage, float]:
+        fingerprint = fingerprint_messages(messages, self.namespace)
+        recording = self._store.get(fingerprint)
+        if recording is None:
+            raise CassetteMissError(f"No recorded LLM response for fingerprint {fingerprint[:12]}")
+        delay = max(recording["latency_ms"], 0) / 1000 * self.latency_scale
+        return _message_from_recording(recording), delay
+
+    def _record(self, messages: list[BaseMessage], response: Any, latency_ms: int) -> AIMessage:
+        message = response if isinstance(response, AIMessage) else AIMessage(content=str(response))
+        self._store.put(
+            fingerprint_messages(messages, self.namespace),
+            provider=self.provider,
+            model=self.model_name,
+            latency_ms=latency_ms,
+            content=message.content if isinstance(message.content, str) else json.dumps(message.content),
+            usage=dict(message.usage_metadata) if message.usage_metadata else None,
+        )
+        return message
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.mode == "replay":
+            message, delay = self._replay(messages)
+            if delay:
+                time.sleep(delay)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        started = time.perf_counter()
+        config = {"callbacks": _child_callbacks(run_manager)}
+        response = self.inner.invoke(messages, config=config)
+        message = self._record(messages, response, int((time.perf_counter() - started) * 1000))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.mode == "replay":
+            message, delay = self._replay(messages)
+            if delay:
+                await asyncio.sleep(delay)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        started = time.perf_counter()
+        config = {"callbacks": _child_callbacks(run_manager)}
+        response = await self.inner.ainvoke(messages, config=config)
+        message = self._record(messages, response, int((time.perf_counter() - started) * 1000))
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,445 @@
+"""Offline, deterministic chat model for load and throughput testing (LLM_PROVIDER=fake).
+
+Responses are derived from a hash of the input messages, so the same JD +
+resume always yields the same analysis. Latency and failures (errors,
+timeouts, 429s, malformed JSON) are drawn from a seeded RNG and configured
+through the FAKE_LLM_* settings. Like a provider prompt cache, the model
+reports the input tokens of the longest message prefix it has already seen
+as cached.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from app.agents.structured_output import compact_analysis
+from app.prompts.resume_analysis_prompt import COMPACT_CONTACT_KEYS
+from app.core.config import settings
+
+
+DIMENSION_KEYS = [
+    "tech_stack_match",
+    "relevant_experience",
+    "responsibilities_impact",
+    "seniority_fit",
+    "domain_fit",
+    "red_flags_gaps",
+    "communication_clarity",
+    "soft_skills_professionalism",
+    "project_complexity",
+    "consistency_trajectory",
+]
+
+JD_REVIEW_SECTIONS = [
+    "standardized_job_title",
+    "role",
+    "primary_technical_stack",
+    "good_have_skills",
+    "responsibilities",
+    "experience",
+    "education_equivalent",
+    "soft_skills",
+    "work_model_location",
+    "domain_knowledge_business_context",
+    "company_product_context",
+    "work_culture_ways_of_working",
+    "growth_impact",
+]
+
+# Prefix hashes remembered by the simulated prompt cache
+_PREFIX_CACHE_SIZE = 4096
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_TERM_RE = re.compile(r"[A-Za-z][A-Za-z0-9+#.]*[A-Za-z0-9+#]|[A-Za-z]")
+
+_STOPWORDS = {
+    "and", "the", "for", "with", "you", "our", "are", "will", "have", "has", "from", "this",
+    "that", "years", "year", "experience", "work", "team", "role", "job", "description",
+    "resume", "skills", "building", "built", "using", "strong", "senior", "engineer",
+}
+
+
+class FakeLLMError(Exception):
+    """Simulated provider failure; `status_code` mirrors the HTTP status it stands for."""
+
+    status_code = 500
+
+
+class FakeRateLimitError(FakeLLMError):
+    status_code = 429
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class FakeLLMTimeoutError(TimeoutError):
+    pass
+
+
+def _terms(text: str) -> list[str]:
+    seen: dict[str, str] = {}
+    for match in _TERM_RE.findall(text or ""):
+        key = match.lower()
+        if len(key) < 2 or key in _STOPWORDS or key in seen:
+            continue
+        seen[key] = match
+    return list(seen.values())
+
+
+def _first_sentences(text: str, count: int) -> str:
+    sentences = re.split(r"(?<=[.!?])\s+", " ".join((text or "").split()))
+    return " ".join(sentences[:count])[:600]
+
+
+def _split_jd_resume(text: str) -> tuple[str, str]:
+    jd_text, sep, resume_text = (text or "").partition("RESUME:")
+    if not sep:
+        return "", text or ""
+    return jd_text.replace("JOB DESCRIPTION:", "", 1).strip(), resume_text.strip()
+
+
+def fake_resume_analysis(
+    jd_text: str,
+    resume_text: str,
+    rng: random.Random,
+    contact_keys: tuple[str, ...] = ("candidate_name", "candidate_email", "candidate_phone"),
+) -> dict[str, Any]:
+    """Schema-valid resume analysis output derived from the JD and resume.
+
+    Only the contact keys the prompt variant asks for are emitted.
+    """
+
+    jd_terms = _terms(jd_text)
+    resume_keys = {term.lower() for term in _terms(resume_text)}
+    matched = [term for term in jd_terms if term.lower() in resume_keys]
+    missing = [term for term in jd_terms if term.lower() not in resume_keys]
+    overlap = len(matched) / len(jd_terms) if jd_terms else 0.0
+
+    dimensions = {}
+    for key in DIMENSION_KEYS:
+        score = max(0, min(10, round(overlap * 10 + rng.uniform(-2, 2))))
+        dimensions[key] = {"score": score, "note": f"Synthetic {key.replace('_', ' ')} assessment ({score}/10)."}
+
+    mean_dimension = sum(d["score"] for d in dimensions.values()) / len(dimensions)
+    match_score = max(0, min(100, round(mean_dimension * 10 + rng.uniform(-5, 5))))
+
+    first_line = next((line.strip() for line in resume_text.splitlines() if line.strip()), "")
+    name_like = 0 < len(first_line.split()) <= 4 and not _EMAIL_RE.search(first_line) and not any(c.isdigit() for c in first_line)
+    email = _EMAIL_RE.search(resume_text)
+    phone = _PHONE_RE.search(resume_text)
+
+    contact = {
+        "candidate_name": first_line if name_like else None,
+        "candidate_email": email.group(0) if email else None,
+        "candidate_phone": phone.group(0).strip() if phone else None,
+    }
+    return {
+        **{key: value for key, value in contact.items() if key in contact_keys},
+        "match_score": match_score,
+        "summary": f"Synthetic assessment: {len(matched)} of {len(jd_terms)} JD terms found in the resume.",
+        "skills": matched[:15],
+        "issues": [f"No evidence of {term}" for term in missing[:5]],
+        "dimensions": dimensions,
+    }
+
+
+def fake_resume_screen(jd_text: str, resume_text: str, rng: random.Random) -> dict[str, Any]:
+    """RESUME_SCREEN_SYSTEM_PROMPT output: the match score a full analysis would give, roughly."""
+
+    analysis = fake_resume_analysis(jd_text, resume_text, rng, contact_keys=())
+    return {"estimated_score": analysis["match_score"], "reason": analysis["summary"]}
+
+
+def fake_jd_analysis(jd_text: str) -> dict[str, Any]:
+    """JD_ANALYZE_SYSTEM_PROMPT output: first line as title, first sentences as summary."""
+
+    first_line = next((line.strip() for line in (jd_text or "").splitlines() if line.strip()), "")
+    title = re.split(r"[.:\n]", first_line)[0].strip()[:120] or "Untitled Role"
+    return {"title": title, "summary": _first_sentences(jd_text, 4) or title}
+
+
+def fake_jd_profile(jd_text: str) -> dict[str, Any]:
+    """JD_PROFILE_SYSTEM_PROMPT output: leading JD terms as skills, first sentences as duties."""
+
+    terms = _terms(jd_text)
+    analysis = fake_jd_analysis(jd_text)
+    lowered = (jd_text or "").lower()
+    seniority = next((level for level in ("staff", "lead", "senior", "junior") if level in lowered), None)
+    years = re.search(r"(\d+)\+?\s*years", lowered)
+    return {
+        **analysis,
+        "must_have_skills": terms[:8],
+        "nice_to_have_skills": terms[8:12],
+        "seniority": seniority,
+        "min_years_experience": int(years.group(1)) if years else None,
+        "domain": None,
+        "responsibilities": [s for s in re.split(r"(?<=[.!?])\s+", _first_sentences(jd_text, 3)) if s][:3],
+        "other_requirements": [],
+    }
+
+
+def fake_jd_review(jd_text: str, rng: random.Random) -> dict[str, Any]:
+    """REVIEW_JOB_DESCRIPTION_SYSTEM_PROMPT output with every required section."""
+
+    snippet = _first_sentences(jd_text, 1)[:200] or "[MISSING]"
+    review: dict[str, Any] = {"jd_strength_score": rng.randint(30, 90)}
+    for section in JD_REVIEW_SECTIONS:
+        review[section] = {
+            "confidence": rng.choice(["low", "medium", "high"]),
+            "extracted": snippet,
+            "suggested": "NA",
+            "explanation": "NA",
+        }
+    review.update(
+        {
+            "critical_gaps_technical": [],
+            "critical_gaps_administrative": ["[Insert location]"],
+            "dx_suggestions": ["Synthetic suggestion."],
+            "consistency_insights": [],
+            "summary": _first_sentences(jd_text, 2) or "Synthetic review.",
+            "conclusion": "Revision Needed for Tech Competitiveness and Clarity",
+            "improved_jd": jd_text or "",
+        }
+    )
+    return review
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers the app's prompts without any network access."""
+
+    model_name: str = "fake"
+    latency_distribution: str = "fixed"
+    latency_ms: float = 0.0
+    latency_spread: float = 0.0
+    ms_per_output_token: float = 0.0
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 0.0
+    malformed_json_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: int = 0
+
+    _rng: random.Random = PrivateAttr()
+    _rng_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _seen_prefixes: set[str] = PrivateAttr(default_factory=set)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model_name": self.model_name}
+
+    def _sample_latency(self) -> float:
+        """Latency in seconds from the configured distribution."""
+
+        with self._rng_lock:
+            distribution = self.latency_distribution.lower()
+            if distribution == "uniform":
+                ms = self._rng.uniform(self.latency_ms - self.latency_spread, self.latency_ms + self.latency_spread)
+            elif distribution == "normal":
+                ms = self._rng.gauss(self.latency_ms, self.latency_spread)
+            elif distribution == "lognormal" and self.latency_ms > 0:
+                ms = self._rng.lognormvariate(math.log(self.latency_ms), self.latency_spread)
+            else:
+                ms = self.latency_ms
+        return max(ms, 0.0) / 1000
+
+    def _draw_fault(self) -> str | None:
+        """Pick at most one injected fault for this call."""
+
+        with self._rng_lock:
+            roll = self._rng.random()
+        for fault, rate in (
+            ("rate_limit", self.rate_limit_rate),
+            ("error", self.error_rate),
+            ("timeout", self.timeout_rate),
+            ("malformed", self.malformed_json_rate),
+        ):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def _respond(self, messages: list[BaseMessage]) -> str:
+        system_text = "\n".join(str(m.content) for m in messages if isinstance(m, SystemMessage))
+        human_text = "\n".join(str(m.content) for m in messages if isinstance(m, HumanMessage))
+
+        # Content depends only on the input, never on the shared RNG
+        digest = hashlib.sha256((system_text + "\x00" + human_text).encode("utf-8")).digest()
+        rng = random.Random(int.from_bytes(digest[:8], "big"))
+
+        if "jd_strength_score" in system_text:
+            payload = fake_jd_review(human_text, rng)
+        elif '"estimated_score"' in system_text:
+            payload = fake_resume_screen(*_split_jd_resume(human_text), rng)
+        elif '"dimensions", whose object' in system_text:
+            # Per-dimension fan-out: one group of dimensions
+            analysis = fake_resume_analysis(*_split_jd_resume(human_text), rng, contact_keys=())
+            payload = {
+                "dimensions": {
+                    key: value for key, value in analysis["dimensions"].items() if f'"{key}"' in system_text
+                }
+            }
+        elif "write the overview of the assessment" in system_text:
+            contact_keys = tuple(key for key in COMPACT_CONTACT_KEYS if f'"{key}" (string or null' in system_text)
+            analysis = fake_resume_analysis(*_split_jd_resume(human_text), rng, contact_keys)
+            payload = {key: value for key, value in analysis.items() if key not in ("match_score", "dimensions")}
+        elif "INVALID OUTPUT:" in human_text:
+            # Repair request: the JD and resume are not resent
+            payload = fake_resume_analysis("", "", rng, contact_keys=())
+        elif "match_score" in system_text:
+            contact_keys = tuple(
+                key
+                for key, short in COMPACT_CONTACT_KEYS.items()
+                if f'"{key}" (string or null' in system_text or f'"{short}" (string or null' in system_text
+            )
+            # Prefix-cache layout: the contact-key note follows the resume
+            note = next((line for line in human_text.splitlines() if line.startswith("CONTACT KEYS:")), None)
+            if note is not None:
+                instruction = note.split(";")[0]
+                contact_keys = tuple(
+                    key
+                    for key in contact_keys
+                    if "output only" in instruction
+                    and (f"`{key}`" in instruction or f"`{COMPACT_CONTACT_KEYS[key]}`" in instruction)
+                )
+                human_text = human_text.replace(note, "")
+            payload = fake_resume_analysis(*_split_jd_resume(human_text), rng, contact_keys)
+            if "Expected Output (compact JSON" in system_text:
+                payload = compact_analysis(payload)
+                # Notes are optional for mid-range scores; the fake leaves them out
+                payload["d"] = {
+                    key: value[:1] if 4 <= value[0] <= 6 else value for key, value in payload["d"].items()
+                }
+        elif '"must_have_skills"' in system_text:
+            payload = fake_jd_profile(human_text)
+        elif '"title"' in system_text:
+            payload = fake_jd_analysis(human_text)
+        else:
+            return f"[fake] {_first_sentences(human_text, 1)}"
+        return json.dumps(payload, ensure_ascii=False)
+
+    def _cached_prefix_chars(self, messages: list[BaseMessage]) -> int:
+        """Characters of the longest leading run of messages seen in an earlier call."""
+
+        cached = 0
+        chars = 0
+        digest = hashlib.sha256()
+        with self._rng_lock:
+            if len(self._seen_prefixes) > _PREFIX_CACHE_SIZE:
+                self._seen_prefixes.clear()
+            for message in messages[:-1]:
+                content = str(message.content)
+                digest.update(f"{message.type}\x00{content}\x00".encode("utf-8"))
+                chars += len(content)
+                key = digest.hexdigest()
+                if key in self._seen_prefixes:
+                    cached = chars
+                self._seen_prefixes.add(key)
+        return cached
+
+    def _result(self, messages: list[BaseMessage], fault: str | None) -> ChatResult:
+        content = self._respond(messages)
+        if fault == "malformed":
+            content = content[: max(1, len(content) // 2)]
+
+        input_chars = sum(len(str(m.content)) for m in messages)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_chars // 4,
+                "output_tokens": len(content) // 4,
+                "total_tokens": input_chars // 4 + len(content) // 4,
+                "input_token_details": {"cache_read": self._cached_prefix_chars(messages) // 4},
+            },
+            response_metadata={"model_name": self.model_name},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _fault_delay(self, fault: str) -> float:
+        if fault == "timeout":
+            return self.timeout_seconds
+        if fault == "rate_limit":
+            return 0.0
+        return self._sample_latency()
+
+    def _decode_seconds(self, result: ChatResult) -> float:
+        """Generation time of the reply at ms_per_output_token."""
+
+        message = result.generations[0].message
+        return (message.usage_metadata or {}).get("output_tokens", 0) * self.ms_per_output_token / 1000
+
+    def _raise_fault(self, fault: str | None) -> None:
+        if fault == "rate_limit":
+            raise FakeRateLimitError("Simulated 429 Too Many Requests")
+        if fault == "error":
+            raise FakeLLMError("Simulated provider error")
+        if fault == "timeout":
+            raise FakeLLMTimeoutError("Simulated LLM timeout")
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        fault = self._draw_fault()
+        if fault in ("rate_limit", "error", "timeout"):
+            time.sleep(self._fault_delay(fault))
+            self._raise_fault(fault)
+        result = self._result(messages, fault)
+        time.sleep(self._sample_latency() + self._decode_seconds(result))
+        return result
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        fault = self._draw_fault()
+        if fault in ("rate_limit", "error", "timeout"):
+            await asyncio.sleep(self._fault_delay(fault))
+            self._raise_fault(fault)
+        result = self._result(messages, fault)
+        await asyncio.sleep(self._sample_latency() + self._decode_seconds(result))
+        return result
+
+
+def fake_model_kwargs() -> dict[str, Any]:
+    """FakeChatModel configuration from settings."""
+
+    return {
+        "model_name": settings.llm_model,
+        "latency_distribution": settings.fake_llm_latency_distribution,
+        "latency_ms": settings.fake_llm_latency_ms,
+        "latency_spread": settings.fake_llm_latency_spread,
+        "ms_per_output_token": settings.fake_llm_ms_per_output_token,
+        "error_rate": settings.fake_llm_error_rate,
+        "timeout_rate": settings.fake_llm_timeout_rate,
+        "timeout_seconds": settings.fake_llm_timeout_seconds,
+        "malformed_json_rate": settings.fake_llm_malformed_json_rate,
+        "rate_limit_rate": settings.fake_llm_rate_limit_rate,
+        "seed": settings.fake_llm_seed,
+    }
@@ -1,41 +1,368 @@
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
 from langchain_openai import ChatOpenAI
 from langchain_community.llms import Ollama
 
+from app.agents.cassette import CassetteChatModel
+from app.agents.fake_llm import FakeChatModel, fake_model_kwargs
+from app.agents.rate_limit import RateLimitedChatModel, get_rate_limiter
+from app.agents.router import RouteConfig, RoutingChatModel, parse_routes
 from app.core.config import settings
+from app.core.metrics import LLM_ERRORS, LLM_REQUEST_DURATION, LLM_TOKENS
+
+
+def classify_llm_error(exc: BaseException) -> str:
+    """Map a provider/client exception to a coarse error type.
+
+    Returns one of: rate_limit, timeout, server_error, auth, bad_request,
+    connection, other.
+    """
+
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        response = getattr(exc, "response", None)
+        status_code = getattr(response, "status_code", None)
+
+    name = type(exc).__name__.lower()
+
+    if status_code == 429 or "ratelimit" in name:
+        return "rate_limit"
+    if isinstance(exc, TimeoutError) or "timeout" in name:
+        return "timeout"
+    if isinstance(status_code, int) and status_code >= 500:
+        return "server_error"
+    if status_code in (401, 403) or "authentication" in name or "permission" in name:
+        return "auth"
+    if isinstance(status_code, int) and 400 <= status_code < 500:
+        return "bad_request"
+    if isinstance(exc, ConnectionError) or "connection" in name:
+        return "connection"
+    return "other"
+
+
+def extract_token_usage(response: LLMResult) -> dict[str, int | None]:
+    """Best-effort token counts from a LangChain LLMResult.
+
+    Handles chat messages carrying `usage_metadata`, Ollama `generation_info`
+    (prompt_eval_count / eval_count) and OpenAI-style `llm_output.token_usage`.
+    `cached_input_tokens` is the part of the input the provider served from
+    its prompt cache, where the provider reports it.
+    """
+
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    cached_input_tokens: int | None = None
+
+    for generation_list in response.generations or []:
+        for generation in generation_list:
+            message = getattr(generation, "message", None)
+            usage = getattr(message, "usage_metadata", None) if message is not None else None
+            if usage:
+                input_tokens = (input_tokens or 0) + int(usage.get("input_tokens") or 0)
+                output_tokens = (output_tokens or 0) + int(usage.get("output_tokens") or 0)
+                cache_read = (usage.get("input_token_details") or {}).get("cache_read")
+                if cache_read is not None:
+                    cached_input_tokens = (cached_input_tokens or 0) + int(cache_read)
+                continue
+
+            info = generation.generation_info or {}
+            if "prompt_eval_count" in info or "eval_count" in info:
+                input_tokens = (input_tokens or 0) + int(info.get("prompt_eval_count") or 0)
+                output_tokens = (output_tokens or 0) + int(info.get("eval_count") or 0)
+
+    if input_tokens is None and output_tokens is None:
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        if token_usage:
+            input_tokens = int(token_usage.get("prompt_tokens") or 0)
+            output_tokens = int(token_usage.get("completion_tokens") or 0)
+            cached = (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+            if cached is not None:
+                cached_input_tokens = int(cached)
+
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cached_input_tokens": cached_input_tokens,
+    }
+
+
+class LLMMetricsCallbackHandler(BaseCallbackHandler):
+    """Prometheus instrumentation for every call made through a built LLM."""
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self._started: dict[UUID, float] = {}
+
+    def on_llm_start(self, serialized: dict[str, Any], prompts: list[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: list, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        start = self._started.pop(run_id, None)
+        if start is not None:
+            LLM_REQUEST_DURATION.labels(provider=self.provider, model=self.model).observe(
+                time.perf_counter() - start
+            )
+
+        usage = extract_token_usage(response)
+        if usage["input_tokens"]:
+            LLM_TOKENS.labels(provider=self.provider, model=self.model, direction="input").inc(
+                usage["input_tokens"]
+            )
+        if usage["output_tokens"]:
+            LLM_TOKENS.labels(provider=self.provider, model=self.model, direction="output").inc(
+                usage["output_tokens"]
+            )
+        if usage["cached_input_tokens"]:
+            LLM_TOKENS.labels(provider=self.provider, model=self.model, direction="cached_input").inc(
+                usage["cached_input_tokens"]
+            )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+        LLM_ERRORS.labels(
+            provider=self.provider,
+            model=self.model,
+            error_type=classify_llm_error(error),
+        ).inc()
+
+
+class LLMUsageRecorder(BaseCallbackHandler):
+    """Collect token usage, model and latency of the LLM calls made during one invoke.
+
+    Pass it per call: `agent.invoke(state, config={"callbacks": [recorder]})`.
+    Only leaf model runs are counted, so a wrapper model that delegates to
+    another model is not double counted.
+    """
+
+    def __init__(self):
+        self.calls: list[dict[str, Any]] = []
+        self._started: dict[UUID, tuple[float, dict[str, Any]]] = {}
+        self._parents: set[UUID] = set()
+
+    def _start(self, run_id: UUID, parent_run_id: UUID | None, kwargs: dict[str, Any]) -> None:
+        if parent_run_id is not None and parent_run_id in self._started:
+            self._parents.add(parent_run_id)
+
+        metadata = kwargs.get("metadata") or {}
+        params = kwargs.get("invocation_params") or {}
+        info = {
+            # Graph node the call was made from (LangGraph run metadata)
+            "node": metadata.get("langgraph_node"),
+            "endpoint": metadata.get("llm_endpoint"),
+            "provider": metadata.get("llm_provider") or metadata.get("ls_provider"),
+            "model": metadata.get("llm_model")
+            or metadata.get("ls_model_name")
+            or params.get("model")
+            or params.get("model_name"),
+        }
+        self._started[run_id] = (time.perf_counter(), info)
+
+    def on_llm_start(self, serialized: dict[str, Any], prompts: list[str], *, run_id: UUID, parent_run_id: UUID | None = None, **kwargs: Any) -> None:
+        self._start(run_id, parent_run_id, kwargs)
 
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: list, *, run_id: UUID, parent_run_id: UUID | None = None, **kwargs: Any) -> None:
+        self._start(run_id, parent_run_id, kwargs)
 
-def _build_openai_llm():
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        if run_id in self._parents:
+            self._parents.discard(run_id)
+            return
+        if started is None:
+            return
+
+        start, info = started
+        self.calls.append(
+            {
+                **info,
+                **extract_token_usage(response),
+                "latency_ms": int((time.perf_counter() - start) * 1000),
+            }
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+        self._parents.discard(run_id)
+
+    def _sum(self, key: str) -> int | None:
+        values = [call[key] for call in self.calls if call.get(key) is not None]
+        return sum(values) if values else None
+
+    @property
+    def input_tokens(self) -> int | None:
+        return self._sum("input_tokens")
+
+    @property
+    def output_tokens(self) -> int | None:
+        return self._sum("output_tokens")
+
+    @property
+    def cached_input_tokens(self) -> int | None:
+        return self._sum("cached_input_tokens")
+
+    @property
+    def latency_ms(self) -> int | None:
+        return self._sum("latency_ms")
+
+    @property
+    def model(self) -> str | None:
+        return self.calls[-1]["model"] if self.calls else None
+
+    @property
+    def provider(self) -> str | None:
+        return self.calls[-1]["provider"] if self.calls else None
+
+    @property
+    def endpoint(self) -> str | None:
+        return self.calls[-1]["endpoint"] if self.calls else None
+
+    def pop_node_calls(self, node: str) -> "LLMUsageRecorder":
+        """Move the calls made from graph node `node` into a new recorder.
+
+        Lets one graph invoke be logged as separate usage entries per phase.
+        """
+
+        popped = LLMUsageRecorder()
+        popped.calls = [call for call in self.calls if call.get("node") == node]
+        self.calls = [call for call in self.calls if call.get("node") != node]
+        return popped
+
+
+def _llm_metadata(provider: str, model: str, endpoint: str | None = None) -> dict[str, str]:
+    """Constructor metadata surfaced to callbacks (used by LLMUsageRecorder)."""
+    return {"llm_provider": provider, "llm_model": model, "llm_endpoint": endpoint or provider}
+
+
+def _build_openai_llm(model: str, json_mode: bool = False, route: RouteConfig | None = None):
+    endpoint = route.name if route else None
     return ChatOpenAI(
-        model=settings.llm_model,
-        api_key=settings.openai_api_key,
+        model=model,
+        api_key=(route and route.api_key) or settings.openai_api_key,
+        base_url=route.base_url if route else None,
+        model_kwargs={"response_format": {"type": "json_object"}} if json_mode else {},
+        # OpenAI caches prompt prefixes automatically; the key keeps calls that
+        # share a prefix on the same cache
+        extra_body=(
+            {"prompt_cache_key": settings.openai_prompt_cache_key} if settings.openai_prompt_cache_key else None
+        ),
+        callbacks=[LLMMetricsCallbackHandler("openai", model)],
+        metadata=_llm_metadata("openai", model, endpoint),
     )
 
 
-def _build_deepseek_llm():
+def _build_deepseek_llm(model: str, json_mode: bool = False, route: RouteConfig | None = None):
     """Build an LLM client for DeepSeek (OpenAI-compatible endpoint)."""
     return Ollama(
-        model=settings.llm_model,
+        model=model,
         temperature=0.5,
-        base_url=settings.deepseek_base_url,
+        base_url=(route and route.base_url) or settings.deepseek_base_url,
+        format="json" if json_mode else None,
+        keep_alive=settings.ollama_keep_alive or None,
+        callbacks=[LLMMetricsCallbackHandler("deepseek", model)],
+        metadata=_llm_metadata("deepseek", model, route.name if route else None),
     )
 
 
-def _build_mistral_llm():
+def _build_mistral_llm(model: str, json_mode: bool = False, route: RouteConfig | None = None):
     """Build an LLM client for Mistral (OpenAI-compatible endpoint)."""
     return Ollama(
-        model=settings.llm_model,
+        model=model,
         temperature=0.5,
-        base_url=settings.mistral_base_url,
+        base_url=(route and route.base_url) or settings.mistral_base_url,
+        format="json" if json_mode else None,
+        keep_alive=settings.ollama_keep_alive or None,
+        callbacks=[LLMMetricsCallbackHandler("mistral", model)],
+        metadata=_llm_metadata("mistral", model, route.name if route else None),
     )
 
 
-def build_llm():
-    """Return an LLM instance based on LLM_PROVIDER in settings."""
-    provider = settings.llm_provider.lower()
+def _build_fake_llm(model: str, route: RouteConfig | None = None):
+    """Build the offline fake chat model (no network, deterministic content)."""
+    return FakeChatModel(
+        **{**fake_model_kwargs(), "model_name": model},
+        callbacks=[LLMMetricsCallbackHandler("fake", model)],
+        metadata=_llm_metadata("fake", model, route.name if route else None),
+    )
+
+
+def _build_provider_llm(provider: str, model: str, json_mode: bool = False, route: RouteConfig | None = None):
+    provider = provider.lower()
     if provider == "openai":
-        return _build_openai_llm()
-    if provider == "deepseek":
-        return _build_deepseek_llm()
-    if provider == "mistral":
-        return _build_mistral_llm()
-    raise ValueError(f"Unsupported LLM_PROVIDER: {settings.llm_provider}")
+        llm = _build_openai_llm(model, json_mode, route)
+    elif provider == "deepseek":
+        llm = _build_deepseek_llm(model, json_mode, route)
+    elif provider == "mistral":
+        llm = _build_mistral_llm(model, json_mode, route)
+    elif provider == "fake":
+        llm = _build_fake_llm(model, route)
+    else:
+        raise ValueError(f"Unsupported LLM_PROVIDER: {provider}")
+    return _with_rate_limit(llm, provider, model, route)
+
+
+def _with_rate_limit(llm, provider: str, model: str, route: RouteConfig | None = None):
+    """Put the shared token buckets of the model (or route) in front of `llm`."""
+    rpm = route.rpm if route and route.rpm is not None else settings.llm_rate_limit_rpm
+    tpm = route.tpm if route and route.tpm is not None else settings.llm_rate_limit_tpm
+    limiter = get_rate_limiter(route.name if route else f"{provider}:{model}", rpm, tpm)
+    if limiter is None:
+        return llm
+    return RateLimitedChatModel(inner=llm, limiter=limiter)
+
+
+def _build_routed_llm(json_mode: bool = False) -> RoutingChatModel:
+    """One model per LLM_ROUTES_JSON endpoint behind a RoutingChatModel."""
+    routes = parse_routes(settings.llm_routes_json)
+    return RoutingChatModel(
+        routes=routes,
+        models={route.name: _build_provider_llm(route.provider, route.model, json_mode, route) for route in routes},
+        acquire_timeout=settings.llm_route_acquire_timeout_seconds,
+    )
+
+
+def build_llm(json_mode: bool = False, *, provider: str | None = None, model: str | None = None):
+    """Return an LLM instance based on LLM_PROVIDER in settings.
+
+    provider/model override LLM_PROVIDER/LLM_MODEL (e.g. for the cascade's
+    cheap tier); without them LLM_ROUTES_JSON, when set, routes calls over
+    several endpoints with failover (see app/agents/router.py). json_mode asks the provider for a bare JSON object where it has such a
+    mode (OpenAI, Ollama-served models); the fake model always returns JSON.
+    With LLM_CASSETTE_MODE=record the provider model is wrapped so every
+    response is stored; with replay no provider model is built at all.
+    """
+    routed = bool(settings.llm_routes_json) and provider is None and model is None
+    provider = provider or settings.llm_provider
+    model = model or settings.llm_model
+    mode = settings.llm_cassette_mode.lower()
+    # Recordings of a non-default model must not collide with LLM_MODEL's
+    namespace = "" if model == settings.llm_model else model
+    if mode == "replay":
+        return CassetteChatModel(
+            mode="replay",
+            store_path=settings.llm_cassette_path,
+            model_name=model,
+            latency_scale=settings.llm_cassette_latency_scale,
+            namespace=namespace,
+            callbacks=[LLMMetricsCallbackHandler("cassette", model)],
+            metadata=_llm_metadata("cassette", model),
+        )
+
+    llm = _build_routed_llm(json_mode) if routed else _build_provider_llm(provider, model, json_mode)
+    if mode == "record":
+        return CassetteChatModel(
+            mode="record",
+            store_path=settings.llm_cassette_path,
+            inner=llm,
+            provider="router" if routed else provider.lower(),
+            model_name=model,
+            namespace=namespace,
+        )
+    return llm
@@ -0,0 +1,321 @@
+"""Token-bucket rate limiting of LLM calls, shared across processes.
+
+Every provider model is wrapped in `RateLimitedChatModel` when a requests-
+or tokens-per-minute limit applies to it. Before a call, one request and the
+estimated tokens (prompt chars / 4 plus a running average of output tokens)
+are taken from the model's buckets, waiting while they are empty; after the
+call the token bucket is corrected by the actual usage.
+
+Bucket state lives in the `llm_rate_limit_bucket` table, so all worker
+processes and nodes draw from one budget (LLM_RATE_LIMIT_BACKEND=database),
+or in a JSON file guarded by a file lock for processes on a single node
+(LLM_RATE_LIMIT_BACKEND=file).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable
+
+from langchain_core.callbacks import BaseCallbackHandler, CallbackManager, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult, LLMResult
+from pydantic import ConfigDict
+from sqlalchemy import text
+
+from app.agents.cassette import _child_callbacks
+from app.core.config import settings
+from app.core.metrics import LLM_RATE_LIMIT_WAIT
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: in-process locking only
+    fcntl = None
+
+
+# Weight of the newest observation in the running output-token estimate
+_OUTPUT_ESTIMATE_ALPHA = 0.2
+# Longest single sleep while waiting, so a refund by another process is noticed
+_MAX_SLEEP_SECONDS = 2.0
+
+
+class RateLimitWaitTimeout(TimeoutError):
+    """The call could not get rate-limit budget within LLM_RATE_LIMIT_MAX_WAIT_SECONDS."""
+
+
+Buckets = dict[str, list[float]]  # bucket key -> [available, updated_at (epoch seconds)]
+
+
+class DatabaseBucketStore:
+    """Bucket rows locked for the duration of one read-modify-write."""
+
+    def __init__(self, engine=None):
+        if engine is None:
+            from app.models.db import engine
+        self.engine = engine
+
+    def update(self, capacities: dict[str, float], fn: Callable[[Buckets], Any]) -> Any:
+        keys = sorted(capacities)
+        params = {f"key_{i}": key for i, key in enumerate(keys)}
+        in_clause = ", ".join(f":key_{i}" for i in range(len(keys)))
+        postgres = self.engine.dialect.name == "postgresql"
+        now = time.time()
+
+        with self.engine.begin() as conn:
+            for key in keys:
+                conn.execute(
+                    text(
+                        "INSERT INTO llm_rate_limit_bucket (bucket_key, available, updated_at) "
+                        "VALUES (:key, :available, :now) ON CONFLICT (bucket_key) DO NOTHING"
+                    ),
+                    {"key": key, "available": capacities[key], "now": now},
+                )
+            if not postgres:
+                # Take SQLite's write lock before reading, so the read-modify-write is atomic
+                conn.execute(
+                    text(f"UPDATE llm_rate_limit_bucket SET updated_at = updated_at WHERE bucket_key IN ({in_clause})"),
+                    params,
+                )
+            lock = " FOR UPDATE" if postgres else ""
+            rows = conn.execute(
+                text(
+                    "SELECT bucket_key, available, updated_at FROM llm_rate_limit_bucket "
+                    f"WHERE bucket_key IN ({in_clause}) ORDER BY bucket_key{lock}"
+                ),
+                params,
+            ).all()
+            buckets = {key: [float(available), float(updated_at)] for key, available, updated_at in rows}
+            before = {key: list(value) for key, value in buckets.items()}
+            result = fn(buckets)
+            for key, (available, updated_at) in buckets.items():
+                if before.get(key) != [available, updated_at]:
+                    conn.execute(
+                        text(
+                            "UPDATE llm_rate_limit_bucket SET available = :available, updated_at = :updated_at "
+                            "WHERE bucket_key = :key"
+                        ),
+                        {"key": key, "available": available, "updated_at": updated_at},
+                    )
+        return result
+
+
+class FileBucketStore:
+    """Buckets in a JSON file, read and rewritten under an exclusive file lock."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _file_lock(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.path}.lock", "a+") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def update(self, capacities: dict[str, float], fn: Callable[[Buckets], Any]) -> Any:
+        with self._file_lock():
+            try:
+                with open(self.path) as f:
+                    stored = json.load(f)
+            except (FileNotFoundError, ValueError):
+                stored = {}
+            now = time.time()
+            buckets = {key: list(stored.get(key) or [capacity, now]) for key, capacity in capacities.items()}
+            result = fn(buckets)
+            stored.update(buckets)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self.path)
+        return result
+
+
+_stores: dict[str, Any] = {}
+_stores_lock = threading.Lock()
+
+
+def get_bucket_store():
+    backend = settings.llm_rate_limit_backend.lower()
+    with _stores_lock:
+        if backend not in _stores:
+            if backend == "database":
+                _stores[backend] = DatabaseBucketStore()
+            elif backend == "file":
+                _stores[backend] = FileBucketStore(settings.llm_rate_limit_file)
+            else:
+                raise ValueError(f"Unsupported LLM_RATE_LIMIT_BACKEND: {settings.llm_rate_limit_backend}")
+        return _stores[backend]
+
+
+class TokenBucketLimiter:
+    """Requests-per-minute and tokens-per-minute buckets of one model/endpoint."""
+
+    def __init__(self, key: str, rpm: int, tpm: int, store):
+        self.key = key
+        self.rpm = rpm
+        self.tpm = tpm
+        self.store = store
+        # bucket key -> (capacity, refill per second); capacity = one minute of quota
+        self.limits: dict[str, tuple[float, float]] = {}
+        if rpm > 0:
+            self.limits[f"{key}:requests"] = (float(rpm), rpm / 60.0)
+        if tpm > 0:
+            self.limits[f"{key}:tokens"] = (float(tpm), tpm / 60.0)
+        self.output_estimate = float(settings.llm_rate_limit_output_estimate)
+        self._estimate_lock = threading.Lock()
+
+    def _capacities(self, keys) -> dict[str, float]:
+        return {key: self.limits[key][0] for key in keys}
+
+    def _refill(self, buckets: Buckets, now: float) -> None:
+        for key, bucket in buckets.items():
+            capacity, rate = self.limits[key]
+            bucket[0] = min(capacity, bucket[0] + max(0.0, now - bucket[1]) * rate)
+            bucket[1] = now
+
+    def _try_take(self, tokens: float) -> float:
+        """Take one request and `tokens`; 0.0 when granted, else seconds until they could be."""
+
+        demands = {}
+        for key in self.limits:
+            demands[key] = 1.0 if key.endswith(":requests") else tokens
+
+        def take(buckets: Buckets) -> float:
+            self._refill(buckets, time.time())
+            wait = 0.0
+            for key, amount in demands.items():
+                capacity, rate = self.limits[key]
+                # A call larger than the whole bucket goes through once the bucket is full
+                needed = min(amount, capacity)
+                if buckets[key][0] < needed:
+                    wait = max(wait, (needed - buckets[key][0]) / rate)
+            if wait == 0.0:
+                for key, amount in demands.items():
+                    buckets[key][0] -= amount
+            return wait
+
+        return self.store.update(self._capacities(demands), take)
+
+    def acquire(self, tokens: float) -> float:
+        """Block until budget for one call of `tokens` is taken; returns seconds waited."""
+
+        started = time.monotonic()
+        while True:
+            wait = self._try_take(tokens)
+            waited = time.monotonic() - started
+            if wait == 0.0:
+                if waited > 0:
+                    LLM_RATE_LIMIT_WAIT.labels(bucket=self.key).observe(waited)
+                return waited
+            if waited + wait > settings.llm_rate_limit_max_wait_seconds:
+                raise RateLimitWaitTimeout(
+                    f"LLM rate limit budget for {self.key} not available within "
+                    f"{settings.llm_rate_limit_max_wait_seconds:g}s"
+                )
+            time.sleep(min(wait, _MAX_SLEEP_SECONDS))
+
+    def reconcile(self, estimated_tokens: float, actual_tokens: float) -> None:
+        """Return over-estimated tokens to the bucket (or charge the shortfall)."""
+
+        key = f"{self.key}:tokens"
+        if key not in self.limits or estimated_tokens == actual_tokens:
+            return
+
+        def adjust(buckets: Buckets) -> None:
+            self._refill(buckets, time.time())
+            capacity, _ = self.limits[key]
+            buckets[key][0] = min(capacity, buckets[key][0] + estimated_tokens - actual_tokens)
+
+        self.store.update(self._capacities([key]), adjust)
+
+    def estimate_tokens(self, messages: list[BaseMessage]) -> float:
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        with self._estimate_lock:
+            return prompt_chars / 4 + self.output_estimate
+
+    def observe_output_tokens(self, output_tokens: int) -> None:
+        with self._estimate_lock:
+            self.output_estimate += _OUTPUT_ESTIMATE_ALPHA * (output_tokens - self.output_estimate)
+
+
+_limiters: dict[str, TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str, rpm: int, tpm: int) -> TokenBucketLimiter | None:
+    """Process-wide limiter for a model/endpoint key; None when unlimited."""
+
+    if rpm <= 0 and tpm <= 0:
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None or (limiter.rpm, limiter.tpm) != (rpm, tpm):
+            limiter = TokenBucketLimiter(key, rpm, tpm, get_bucket_store())
+            _limiters[key] = limiter
+        return limiter
+
+
+class _UsageCapture(BaseCallbackHandler):
+    def __init__(self):
+        self.input_tokens: int | None = None
+        self.output_tokens: int | None = None
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        from app.agents.llm import extract_token_usage
+
+        usage = extract_token_usage(response)
+        if usage["input_tokens"] is not None or usage["output_tokens"] is not None:
+            self.input_tokens = (self.input_tokens or 0) + (usage["input_tokens"] or 0)
+            self.output_tokens = (self.output_tokens or 0) + (usage["output_tokens"] or 0)
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """Wraps a provider model; every call first takes budget from its limiter."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: Any
+    limiter: Any  # TokenBucketLimiter
+
+    @property
+    def _llm_type(self) -> str:
+        return "rate-limited"
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        estimated = self.limiter.estimate_tokens(messages)
+        self.limiter.acquire(estimated)
+
+        capture = _UsageCapture()
+        callbacks = _child_callbacks(run_manager) or CallbackManager(handlers=[])
+        callbacks.add_handler(capture, inherit=True)
+        try:
+            # Call-time options (.bind(...), response_format, tools) go on to the provider model
+            response = self.inner.invoke(messages, stop=stop, config={"callbacks": callbacks}, **kwargs)
+        except Exception:
+            # The prompt may have been counted by the provider; the output was not
+            self.limiter.reconcile(estimated, estimated - self.limiter.output_estimate)
+            raise
+
+        if capture.input_tokens is not None:
+            actual = capture.input_tokens + (capture.output_tokens or 0)
+            self.limiter.reconcile(estimated, actual)
+            self.limiter.observe_output_tokens(capture.output_tokens or 0)
+
+        message = response if isinstance(response, AIMessage) else AIMessage(content=str(response))
+        return ChatResult(generations=[ChatGeneration(message=message)])
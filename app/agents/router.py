@@ -0,0 +1,258 @@
+"""Routing across several LLM endpoints (LLM_ROUTES_JSON).
+
+`RoutingChatModel` spreads calls over the configured endpoints by weight,
+skips endpoints whose circuit breaker is open, caps in-flight calls per
+endpoint and fails over to the next endpoint on rate limits, server errors,
+timeouts and connection errors. Breaker and concurrency state is kept per
+endpoint name for the whole process, so it survives agents being rebuilt
+for every worker batch.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import ConfigDict
+
+from app.agents.cassette import _child_callbacks
+from app.core.config import settings
+from app.core.metrics import LLM_CIRCUIT_OPENS, LLM_FAILOVERS
+
+
+logger = logging.getLogger(__name__)
+
+# Error types (see classify_llm_error) worth retrying on another endpoint
+FAILOVER_ERROR_TYPES = frozenset({"rate_limit", "server_error", "timeout", "connection"})
+
+
+@dataclass(frozen=True)
+class RouteConfig:
+    name: str
+    provider: str
+    model: str
+    weight: float = 1.0
+    max_concurrency: int = 0  # 0 = unlimited
+    base_url: str | None = None
+    api_key: str | None = None
+    rpm: int | None = None  # None = LLM_RATE_LIMIT_RPM
+    tpm: int | None = None  # None = LLM_RATE_LIMIT_TPM
+
+
+def parse_routes(raw: str) -> list[RouteConfig]:
+    """LLM_ROUTES_JSON -> route configs; names default to provider:model."""
+
+    routes = []
+    for entry in json.loads(raw):
+        provider = entry["provider"]
+        model = entry.get("model") or settings.llm_model
+        routes.append(
+            RouteConfig(
+                name=entry.get("name") or f"{provider}:{model}",
+                provider=provider,
+                model=model,
+                weight=float(entry.get("weight", 1.0)),
+                max_concurrency=int(entry.get("max_concurrency", 0)),
+                base_url=entry.get("base_url"),
+                api_key=entry.get("api_key"),
+                rpm=int(entry["rpm"]) if entry.get("rpm") is not None else None,
+                tpm=int(entry["tpm"]) if entry.get("tpm") is not None else None,
+            )
+        )
+    if len({route.name for route in routes}) != len(routes):
+        raise ValueError("LLM_ROUTES_JSON endpoint names must be unique")
+    return routes
+
+
+class CircuitBreaker:
+    """closed -> open after `failure_threshold` consecutive failures; after
+    `reset_seconds` one probe call is let through (half-open), whose result
+    closes or re-opens the circuit."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> str | None:
+        """"call" (closed), "probe" (the half-open trial call) or None (open)."""
+
+        with self._lock:
+            if self.opened_at is None:
+                return "call"
+            if time.monotonic() - self.opened_at < self.reset_seconds or self._probe_in_flight:
+                return None
+            self._probe_in_flight = True
+            return "probe"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; True when this opened (or re-opened) the circuit."""
+
+        with self._lock:
+            self.failures += 1
+            probing = self._probe_in_flight
+            self._probe_in_flight = False
+            if probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """Give back a probe that ended without a verdict (or was never used)."""
+
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class EndpointState:
+    def __init__(self, route: RouteConfig):
+        self.breaker = CircuitBreaker(settings.llm_circuit_failure_threshold, settings.llm_circuit_reset_seconds)
+        self.slots = threading.BoundedSemaphore(route.max_concurrency) if route.max_concurrency > 0 else None
+
+
+_endpoint_states: dict[str, EndpointState] = {}
+_endpoint_states_lock = threading.Lock()
+
+
+def get_endpoint_state(route: RouteConfig) -> EndpointState:
+    with _endpoint_states_lock:
+        if route.name not in _endpoint_states:
+            _endpoint_states[route.name] = EndpointState(route)
+        return _endpoint_states[route.name]
+
+
+def endpoint_health() -> dict[str, str]:
+    """Endpoint name -> circuit state, for diagnostics."""
+
+    with _endpoint_states_lock:
+        return {name: state.breaker.state for name, state in _endpoint_states.items()}
+
+
+def _weighted_order(routes: list[RouteConfig]) -> list[RouteConfig]:
+    """Routes in a random order where heavier routes tend to come first.
+
+    Weight-0 routes are standbys, only tried after all weighted ones.
+    """
+
+    keyed = [(random.random() ** (1.0 / route.weight), route) for route in routes if route.weight > 0]
+    weighted = [route for _, route in sorted(keyed, key=lambda item: item[0], reverse=True)]
+    return weighted + [route for route in routes if route.weight <= 0]
+
+
+class RoutingChatModel(BaseChatModel):
+    """Chat model that delegates each call to one of several endpoint models."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    routes: list[RouteConfig]
+    models: dict[str, Any]  # route name -> chat model / LLM
+    acquire_timeout: float = 60.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "router"
+
+    def _candidates(self) -> list[tuple[RouteConfig, EndpointState, bool]]:
+        """(route, state, holds half-open probe) in try order."""
+
+        ordered = [(route, get_endpoint_state(route)) for route in _weighted_order(self.routes)]
+        available = []
+        for route, state in ordered:
+            permit = state.breaker.allow()
+            if permit is not None:
+                available.append((route, state, permit == "probe"))
+        if available:
+            return available
+        # Every circuit is open: try them anyway rather than fail the call outright
+        return [(route, state, False) for route, state in ordered]
+
+    def _take_slot(self, state: EndpointState, blocking: bool) -> bool:
+        if state.slots is None:
+            return True
+        if blocking:
+            return state.slots.acquire(timeout=self.acquire_timeout)
+        return state.slots.acquire(blocking=False)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        from app.agents.llm import classify_llm_error
+
+        order = self._candidates()
+        # Start at the first endpoint with a free slot; wait only when all are busy
+        first = next((i for i, (_, state, _) in enumerate(order) if self._take_slot(state, blocking=False)), None)
+        if first is None:
+            if not self._take_slot(order[0][1], blocking=True):
+                for _, state, probe in order:
+                    if probe:
+                        state.breaker.release_probe()
+                raise TimeoutError("No LLM endpoint slot became free")
+            first = 0
+        order = order[first:] + order[:first]
+
+        last_error: BaseException | None = None
+        try:
+            for index, (route, state, _) in enumerate(order):
+                if index > 0 and not self._take_slot(state, blocking=True):
+                    continue
+                try:
+                    response = self.models[route.name].invoke(
+                        messages, stop=stop, config={"callbacks": _child_callbacks(run_manager)}
+                    )
+                except Exception as exc:
+                    error_type = classify_llm_error(exc)
+                    if error_type not in FAILOVER_ERROR_TYPES:
+                        raise
+                    if state.breaker.record_failure():
+                        LLM_CIRCUIT_OPENS.labels(endpoint=route.name).inc()
+                        logger.warning("LLM endpoint %s circuit opened after %s", route.name, error_type)
+                    LLM_FAILOVERS.labels(endpoint=route.name, error_type=error_type).inc()
+                    logger.warning("LLM endpoint %s failed (%s), failing over: %s", route.name, error_type, exc)
+                    last_error = exc
+                    continue
+                finally:
+                    if state.slots is not None:
+                        state.slots.release()
+
+                state.breaker.record_success()
+                message = response if isinstance(response, AIMessage) else AIMessage(content=str(response))
+                message.response_metadata = {**(message.response_metadata or {}), "llm_endpoint": route.name}
+                return ChatResult(generations=[ChatGeneration(message=message)])
+        finally:
+            # Half-open probes granted to endpoints that were not (conclusively) tried
+            for _, state, probe in order:
+                if probe:
+                    state.breaker.release_probe()
+
+        if last_error is not None:
+            raise last_error
+        raise TimeoutError("No LLM endpoint slot became free")
@@ -0,0 +1,314 @@
+"""Parsing and validation of the resume analysis JSON returned by the LLM.
+
+Providers with a JSON mode (OpenAI `response_format`, Ollama `format=json`)
+return bare JSON; others, and models that ignore the instruction, wrap it in
+code fences or add a sentence around it. `load_json_object` recovers the
+object from such output before it is validated against
+`ResumeAnalysisOutput`; what still fails validation is sent back to the model
+with the errors (see `build_repair_messages`) instead of being stored.
+Replies in the compact output schema (short keys, see
+COMPACT_OUTPUT_SECTION) are expanded to the full schema first.
+"""
+
+import json
+import re
+from typing import Any
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+from app.prompts.resume_analysis_prompt import (
+    COMPACT_CONTACT_KEYS,
+    COMPACT_DIMENSION_KEYS,
+    RESUME_ANALYSIS_REPAIR_SYSTEM_PROMPT,
+)
+
+
+DIMENSION_KEYS = (
+    "tech_stack_match",
+    "relevant_experience",
+    "responsibilities_impact",
+    "seniority_fit",
+    "domain_fit",
+    "red_flags_gaps",
+    "communication_clarity",
+    "soft_skills_professionalism",
+    "project_complexity",
+    "consistency_trajectory",
+)
+
+# Weights of the dimensions in a match_score computed from dimension scores
+# (parallel per-dimension analysis); the critical dimensions of the prompt's
+# scoring rules count most, red flags pull the score down through theirs
+DIMENSION_WEIGHTS = {
+    "tech_stack_match": 3.0,
+    "relevant_experience": 3.0,
+    "responsibilities_impact": 2.0,
+    "seniority_fit": 2.0,
+    "red_flags_gaps": 2.0,
+    "domain_fit": 1.0,
+    "project_complexity": 1.0,
+    "consistency_trajectory": 1.0,
+    "communication_clarity": 0.5,
+    "soft_skills_professionalism": 0.5,
+}
+
+# Invalid output quoted back to the model in a repair request
+MAX_REPAIR_INPUT_CHARS = 12_000
+
+_FENCE_RE = re.compile(r"```[a-zA-Z]*\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"'})
+
+
+class DimensionAssessment(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    score: float | None = Field(default=None, ge=0, le=10)
+    note: str | None = None
+
+
+class ResumeAnalysisOutput(BaseModel):
+    """Schema of the analysis object requested by the resume analysis prompt."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    candidate_name: str | None = None
+    candidate_email: str | None = None
+    candidate_phone: str | None = None
+    match_score: float = Field(ge=0, le=100)
+    summary: str
+    skills: list[str] = Field(default_factory=list)
+    issues: list[str] = Field(default_factory=list)
+    dimensions: dict[str, DimensionAssessment]
+
+    @field_validator("dimensions")
+    @classmethod
+    def _known_dimensions(cls, value: dict[str, DimensionAssessment]) -> dict[str, DimensionAssessment]:
+        missing = [key for key in DIMENSION_KEYS if key not in value]
+        if missing:
+            raise ValueError(f"missing dimensions: {', '.join(missing)}")
+        return {key: value[key] for key in DIMENSION_KEYS}
+
+
+class ResumeScreenOutput(BaseModel):
+    """Schema of the object requested by RESUME_SCREEN_SYSTEM_PROMPT."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    estimated_score: float = Field(ge=0, le=100)
+    reason: str = ""
+
+
+class AnalysisOutputError(ValueError):
+    """LLM output that is not a valid resume analysis; `errors` are short, model-readable."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def _outermost_object(text: str) -> str | None:
+    """Text from the first "{" to its matching "}" (string-aware), if balanced."""
+
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : index + 1]
+    return None
+
+
+def load_json_object(raw: str) -> dict[str, Any]:
+    """Decode the JSON object in an LLM reply.
+
+    Tries, in order: the reply as is, the contents of a ``` fence, the
+    outermost balanced {...}, and that object with trailing commas and curly
+    quotes repaired. Raises AnalysisOutputError when nothing decodes to an
+    object (e.g. the reply was cut off).
+    """
+
+    text = (raw or "").strip()
+    try:
+        # Well-formed replies (and stored analysis_json) decode as they are
+        value = json.loads(text)
+    except ValueError:
+        pass
+    else:
+        if isinstance(value, dict):
+            return value
+        raise AnalysisOutputError([f"expected a JSON object, got {type(value).__name__}"])
+
+    candidates = [text]
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        candidates.append(fenced.group(1).strip())
+    for candidate in list(candidates):
+        outer = _outermost_object(candidate)
+        if outer and outer != candidate:
+            candidates.append(outer)
+    candidates.extend(_TRAILING_COMMA_RE.sub(r"\1", c).translate(_SMART_QUOTES) for c in list(candidates))
+
+    for candidate in candidates:
+        try:
+            value = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value
+        raise AnalysisOutputError([f"expected a JSON object, got {type(value).__name__}"])
+
+    if "{" in text and _outermost_object(text) is None:
+        raise AnalysisOutputError(["output is not valid JSON: the object is not closed (truncated?)"])
+    raise AnalysisOutputError(["output is not valid JSON"])
+
+
+_COMPACT_TOP_LEVEL_KEYS = {"ms": "match_score", "su": "summary", "sk": "skills", "is": "issues"}
+
+
+def is_compact_analysis(value: dict[str, Any]) -> bool:
+    return "match_score" not in value and "dimensions" not in value and ("ms" in value or "d" in value)
+
+
+def _expand_dimension(value: Any) -> Any:
+    """[score] / [score, note] -> {"score", "note"}; other shapes are left to validation."""
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {"score": value}
+    if isinstance(value, list) and 1 <= len(value) <= 2:
+        expanded = {"score": value[0]}
+        if len(value) == 2:
+            expanded["note"] = value[1]
+        return expanded
+    if isinstance(value, dict) and ("s" in value or "n" in value):
+        return {"score": value.get("s"), **({"note": value["n"]} if "n" in value else {})}
+    return value
+
+
+def expand_compact_analysis(value: dict[str, Any]) -> dict[str, Any]:
+    """Compact-schema analysis -> full-schema dict (unknown keys are dropped)."""
+
+    expanded: dict[str, Any] = {}
+    for key, short in COMPACT_CONTACT_KEYS.items():
+        if short in value:
+            expanded[key] = value[short]
+    for short, key in _COMPACT_TOP_LEVEL_KEYS.items():
+        if short in value:
+            expanded[key] = value[short]
+    dimensions = value.get("d")
+    if isinstance(dimensions, dict):
+        expanded["dimensions"] = {
+            key: _expand_dimension(dimensions[short])
+            for key, short in COMPACT_DIMENSION_KEYS.items()
+            if short in dimensions
+        }
+    elif dimensions is not None:
+        expanded["dimensions"] = dimensions
+    return expanded
+
+
+def compact_analysis(value: dict[str, Any]) -> dict[str, Any]:
+    """Full-schema analysis dict -> compact schema (inverse of expand_compact_analysis)."""
+
+    compact: dict[str, Any] = {}
+    for key, short in COMPACT_CONTACT_KEYS.items():
+        if key in value:
+            compact[short] = value[key]
+    for short, key in _COMPACT_TOP_LEVEL_KEYS.items():
+        if key in value:
+            compact[short] = value[key]
+    dimensions = value.get("dimensions") or {}
+    compact["d"] = {}
+    for key, short in COMPACT_DIMENSION_KEYS.items():
+        dimension = dimensions.get(key) or {}
+        entry = [dimension.get("score")]
+        if dimension.get("note"):
+            entry.append(dimension["note"])
+        compact["d"][short] = entry
+    return compact
+
+
+def parse_resume_analysis(raw: str) -> ResumeAnalysisOutput:
+    """Decode and validate an analysis reply (full or compact schema); raises AnalysisOutputError."""
+
+    value = load_json_object(raw)
+    if is_compact_analysis(value):
+        value = expand_compact_analysis(value)
+    try:
+        return ResumeAnalysisOutput.model_validate(value)
+    except ValidationError as exc:
+        errors = []
+        for error in exc.errors():
+            location = ".".join(str(part) for part in error["loc"]) or "(root)"
+            errors.append(f"{location}: {error['msg']}")
+        raise AnalysisOutputError(errors) from exc
+
+
+def weighted_match_score(dimensions: dict[str, Any]) -> float | None:
+    """match_score (0-100) as the DIMENSION_WEIGHTS mean of the scored dimensions.
+
+    `dimensions` maps keys to {"score": 0-10, ...}; dimensions without a
+    numeric score are left out. None when no dimension is scored.
+    """
+
+    total = weight_sum = 0.0
+    for key, weight in DIMENSION_WEIGHTS.items():
+        value = dimensions.get(key)
+        score = value.get("score") if isinstance(value, dict) else None
+        if isinstance(score, (int, float)) and not isinstance(score, bool):
+            total += weight * min(max(float(score), 0.0), 10.0)
+            weight_sum += weight
+    if not weight_sum:
+        return None
+    return round(total / weight_sum * 10, 1)
+
+
+def parse_resume_screen(raw: str) -> ResumeScreenOutput:
+    """Decode and validate a quick-screen reply; raises AnalysisOutputError."""
+
+    try:
+        return ResumeScreenOutput.model_validate(load_json_object(raw))
+    except ValidationError as exc:
+        raise AnalysisOutputError(
+            [f"{'.'.join(map(str, e['loc'])) or '(root)'}: {e['msg']}" for e in exc.errors()]
+        ) from exc
+
+
+def build_repair_messages(raw: str, errors: list[str]) -> list[BaseMessage]:
+    """Messages for a repair call: the invalid output and its errors, no JD/resume.
+
+    Compact-schema output is quoted expanded, so its keys match the errors
+    and the full schema the repair prompt asks for.
+    """
+
+    try:
+        value = load_json_object(raw)
+        if is_compact_analysis(value):
+            raw = json.dumps(expand_compact_analysis(value), ensure_ascii=False)
+    except AnalysisOutputError:
+        pass
+    error_lines = "\n".join(f"- {error}" for error in errors)
+    return [
+        SystemMessage(content=RESUME_ANALYSIS_REPAIR_SYSTEM_PROMPT),
+        HumanMessage(
+            content=f"VALIDATION ERRORS:\n{error_lines}\n\nINVALID OUTPUT:\n{(raw or '')[:MAX_REPAIR_INPUT_CHARS]}"
+        ),
+    ]
@@ -5,6 +5,7 @@ import json
 import logging
 
 from app.agents.agent import build_agent
+from app.agents.llm import LLMUsageRecorder
 from app.models.user import User
 from app.models.job_description import JobDescription
 from app.prompts.review_job_description_prompt import (
@@ -18,6 +19,8 @@ from app.models.api import (
     JobAnalyzeResponse,
     JobDeleteResponse,
     JDListResponse,
+    JDSettingsUpdateRequest,
+    JDSettingsResponse,
     DashboardSummaryResponse,
 )
 from app.services.jd_service import (
@@ -27,12 +30,14 @@ from app.services.jd_service import (
     list_job_descriptions as list_jds_svc,
     delete_job_description as delete_jd_svc,
     get_dashboard_summary as get_dashboard_summary_svc,
+    update_jd_settings as update_jd_settings_svc,
 )
 from app.services.auth_service import get_db, get_current_user
 from app.services.file_service import save_upload_file
 from app.core.config import settings
 from app.validations.jd_validations import validate_jd_upload
 from app.services.file_readers import read_file_to_text
+from app.services.usage_service import record_llm_usage
 
 
 logger = logging.getLogger(__name__)
@@ -43,6 +48,7 @@ agent = build_agent()
 @router.post("/jd/builder", response_model=JobReviewResponse1)
 async def review_job_description(
     raw_jd_content: str = Body(..., media_type="text/plain"),
+    db=Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     """Review a job description from raw text body."""
@@ -52,9 +58,13 @@ async def review_job_description(
         HumanMessage(content=raw_jd_content),
     ]
 
-    result = agent.invoke({"messages": messages})
+    recorder = LLMUsageRecorder()
+    result = agent.invoke({"messages": messages}, config={"callbacks": [recorder]})
     last_message = result["messages"][-1]
 
+    record_llm_usage(db, recorder, call_type="jd_builder", user_name=user.user_name)
+    db.commit()
+
     try:
         parsed = json.loads(last_message.content)
     except json.JSONDecodeError:
@@ -148,10 +158,14 @@ async def analyze_job_description_endpoint(
         HumanMessage(content=raw_jd_content),
     ]
 
-    result = agent.invoke({"messages": messages})
+    recorder = LLMUsageRecorder()
+    result = agent.invoke({"messages": messages}, config={"callbacks": [recorder]})
     last_message = result["messages"][-1]
     raw_content = last_message.content
 
+    record_llm_usage(db, recorder, call_type="jd_analyze", jd_id=jd_id, user_name=user.user_name)
+    db.commit()
+
     def _try_parse_json(text: str):
         try:
             return json.loads(text)
@@ -230,6 +244,31 @@ async def get_job_description_details(
     return jd_details
 
 
+@router.patch("/jd/{jd_id}/settings", response_model=JDSettingsResponse)
+async def update_jd_settings(
+    jd_id: int,
+    payload: JDSettingsUpdateRequest,
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Per-JD processing overrides, e.g. force full LLM analysis (no lexical screening)."""
+
+    logger.info(
+        "JD settings update requested by user='%s' jd_id=%s: %s",
+        user.user_name,
+        jd_id,
+        payload.model_dump(exclude_unset=True),
+    )
+
+    result = update_jd_settings_svc(db, jd_id=jd_id, updates=payload.model_dump(exclude_unset=True))
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job description not found",
+        )
+    return result
+
+
 @router.delete("/jd/{jd_id}", response_model=JobDeleteResponse)
 async def delete_job_description(
     jd_id: int,
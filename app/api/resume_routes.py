@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import List, Literal
+import asyncio
 import json as _json
 import logging
 
 from app.core.config import settings
+from app.core.tracing import get_correlation_id
 from app.models.user import User
 from app.models.api import (
     ResumeUploadResponse,
@@ -18,6 +20,8 @@ from app.models.api import (
     ResumeDeleteResponse,
     ResumeMoveRequest,
     ResumeMoveResponse,
+    ResumePromoteResponse,
+    PoolMatchResponse,
 )
 from app.services.auth_service import get_db, get_current_user
 from app.services.file_service import save_upload_file
@@ -29,9 +33,19 @@ from app.services.resume_service import (
     delete_resume,
     update_resume_business_status,
     move_resume_to_jd,
+    promote_resume,
+    find_pool_matches,
 )
+from app.services.resume_enrichment import enrich_uploaded_resume
+from app.services.skill_extraction import parse_skill_list
 from app.validations.jd_validations import validate_jd_upload
-from app.services.resume_processing_service import run_once as run_resume_process_once
+from app.services.resume_processing_service import analyze_resume_now, run_once as run_resume_process_once
+from app.services.progress_events import (
+    progress_broadcaster,
+    publish_resume_event,
+    get_jd_status_counts,
+    format_sse,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -108,9 +122,20 @@ async def upload_resume(
             file_name=file.filename or "uploaded_resume",
             file_location=saved_path,
             uploaded_by=effective_uploaded_by,
+            correlation_id=get_correlation_id(),
         )
         responses.append(resp)
 
+        enrich_uploaded_resume(db, resume_id=resp.resume_id, jd_id=jd_id, file_location=saved_path)
+
+        publish_resume_event(
+            db,
+            jd_id=jd_id,
+            resume_id=resp.resume_id,
+            state="queued",
+            status=resp.status,
+        )
+
     logger.info(
         "Resume upload completed for jd_id=%s: %d resume(s) stored",
         jd_id,
@@ -123,11 +148,12 @@ async def upload_resume(
 @router.get("/resumes", response_model=ResumeListResponse)
 async def list_resumes_by_jd(
     jd_id: int | None = None,
+    skill: List[str] | None = Query(None),
     db=Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    """Return resumes; filter by jd_id when provided."""
-    return list_resumes_svc(db, jd_id)
+    """Return resumes; filter by jd_id and by skills (repeat `skill`, all must match) when provided."""
+    return list_resumes_svc(db, jd_id, skills=skill)
 
 
 @router.get("/resumes/{resume_id}/download")
@@ -207,6 +233,8 @@ async def list_resume_analysis_for_jd(
                 jd_id=resume.jd_id,
                 file_name=resume.file_name,
                 match_score=(analysis.match_score if analysis else resume.match_score),
+                lexical_score=resume.lexical_score,
+                screen_score=resume.screen_score,
                 status=resume.status,
                 failure_reason=resume.failure_reason,
             )
@@ -215,6 +243,82 @@ async def list_resume_analysis_for_jd(
     return ResumeAnalysisListResponse(items=items)
 
 
+@router.get("/jd/{jd_id}/pool-matches", response_model=PoolMatchResponse)
+async def list_pool_matches_for_jd(
+    jd_id: int,
+    top_k: int = Query(20, ge=1, le=200),
+    include_same_jd: bool = False,
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Return the resumes in the whole pool most similar to this JD (embedding search, no LLM)."""
+
+    from app.models.job_description import JobDescription as JDModel
+
+    jd = db.query(JDModel).filter(JDModel.jd_id == jd_id).first()
+    if not jd:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job description not found",
+        )
+
+    return find_pool_matches(db, jd=jd, top_k=top_k, include_same_jd=include_same_jd)
+
+
+@router.get("/jd/{jd_id}/events")
+async def stream_jd_events(
+    jd_id: int,
+    request: Request,
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Server-Sent Events stream of resume state transitions and running counts for a JD.
+
+    The first frame is a `snapshot` of current counts; subsequent frames are named
+    after the resume state (queued, in_progress, processed, error, screened_out).
+    Events are read from resume_progress_event by the process's reader for the
+    JD (progress_broadcaster), so those of any process arrive.
+    """
+
+    from app.models.job_description import JobDescription as JDModel
+
+    jd = db.query(JDModel).filter(JDModel.jd_id == jd_id).first()
+    if not jd:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job description not found",
+        )
+
+    snapshot = {"jd_id": jd_id, "counts": get_jd_status_counts(db, jd_id)}
+    queue = progress_broadcaster.subscribe(jd_id)
+
+    logger.info("Progress events stream opened for jd_id=%s by user='%s'", jd_id, user.user_name)
+
+    async def event_stream():
+        try:
+            yield format_sse("snapshot", snapshot)
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=settings.progress_events_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event["state"], event)
+        finally:
+            progress_broadcaster.unsubscribe(jd_id, queue)
+            logger.info("Progress events stream closed for jd_id=%s", jd_id)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/resumes/{resume_id}/analysis", response_model=ResumeAnalysisDetail)
 @router.get("/resume/{resume_id}/analysis", response_model=ResumeAnalysisDetail)
 async def get_resume_analysis(
@@ -242,6 +346,7 @@ async def get_resume_analysis(
             candidate_name=resume.candidate_name,
             candidate_email=resume.candidate_email,
             candidate_phone=resume.candidate_phone,
+            skills=parse_skill_list(resume.parsed_skills),
             match_score=resume.match_score,
             summary=None,
             issues=None,
@@ -272,6 +377,8 @@ async def get_resume_analysis(
             processed_by=None,
             status=resume.status,
             failure_reason=resume.failure_reason,
+            screen_score=resume.screen_score,
+            screen_reason=resume.screen_reason,
         )
 
     try:
@@ -341,6 +448,7 @@ async def get_resume_analysis(
         candidate_name=resume.candidate_name,
         candidate_email=resume.candidate_email,
         candidate_phone=resume.candidate_phone,
+        skills=parse_skill_list(resume.parsed_skills),
         match_score=analysis.match_score,
         summary=summary,
         issues=issues_list,
@@ -369,8 +477,20 @@ async def get_resume_analysis(
         consistency_trajectory_note=analysis.consistency_trajectory_note,
         processed_at=processed_at_str,
         processed_by=getattr(analysis, "processed_by", None),
+        llm_provider=analysis.llm_provider,
+        llm_model=analysis.llm_model,
+        llm_endpoint=analysis.llm_endpoint,
+        input_tokens=analysis.input_tokens,
+        output_tokens=analysis.output_tokens,
+        cached_input_tokens=analysis.cached_input_tokens,
+        llm_latency_ms=analysis.llm_latency_ms,
+        estimated_cost_usd=analysis.estimated_cost_usd,
+        prompt_tokens_saved=analysis.prompt_tokens_saved,
+        analysis_mode=analysis.analysis_mode,
         status=resume.status,
         failure_reason=resume.failure_reason,
+        screen_score=resume.screen_score,
+        screen_reason=resume.screen_reason,
     )
 
 
@@ -420,6 +540,66 @@ async def update_resume_status(
     )
 
 
+@router.post("/resume/{resume_id}/analyze", response_model=ResumeAnalysisDetail)
+async def analyze_resume(
+    resume_id: int,
+    mode: Literal["single", "fanout"] = Query("fanout"),
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Analyze one resume now and return its analysis, skipping the screens.
+
+    mode=fanout scores groups of dimensions in parallel LLM calls for a faster
+    reply; mode=single is the batch worker's one-call analysis.
+    """
+
+    row = get_resume_analysis_detail(db, resume_id)
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found",
+        )
+    if row[1] is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Resume already has a full analysis",
+        )
+
+    await analyze_resume_now(resume_id, mode=mode, processed_by=user.user_name)
+    logger.info("Resume %s analyzed now (mode=%s) by user='%s'", resume_id, mode, user.user_name)
+
+    # The worker committed in its own session
+    db.expire_all()
+    return await get_resume_analysis(resume_id, db=db, user=user)
+
+
+@router.post("/resume/{resume_id}/promote", response_model=ResumePromoteResponse)
+async def promote_resume_to_full_analysis(
+    resume_id: int,
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Queue a screened-out resume for full analysis, bypassing the screens."""
+
+    resume = promote_resume(db, resume_id=resume_id)
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found",
+        )
+
+    logger.info("Resume %s promoted to full analysis by user='%s'", resume_id, user.user_name)
+    publish_resume_event(db, jd_id=resume.jd_id, resume_id=resume.resume_id, state="queued", status=resume.status)
+
+    return ResumePromoteResponse(
+        resume_id=resume.resume_id,
+        jd_id=resume.jd_id,
+        status=resume.status,
+        screen_score=resume.screen_score,
+        screen_reason=resume.screen_reason,
+    )
+
+
 @router.put("/resume/{resume_id}/jd", response_model=ResumeMoveResponse)
 async def update_resume_jd(
     resume_id: int,
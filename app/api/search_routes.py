@@ -0,0 +1,36 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.models.api import SearchResponse
+from app.models.user import User
+from app.services.auth_service import get_db, get_current_user
+from app.services.search_index import search_resumes
+
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=500),
+    jd_id: List[int] | None = Query(None),
+    resume_status: str | None = Query(None, alias="status"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Keyword search over resume text, analysis summaries/issues and candidate fields.
+
+    All terms must match; "quoted text" is a phrase and `term*` a prefix.
+    Repeat `jd_id` to search several JDs.
+    """
+
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must not be blank",
+        )
+
+    return search_resumes(db, query=q, jd_ids=jd_id, status=resume_status, limit=limit, offset=offset)
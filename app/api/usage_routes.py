@@ -0,0 +1,91 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends
+
+from app.models.api import CascadeStatsResponse, PromptCacheStatsResponse, UsageAggregateResponse
+from app.models.user import User
+from app.services.auth_service import get_db, get_current_user
+from app.services.usage_service import (
+    cascade_stats_by_jd,
+    prompt_cache_stats,
+    usage_by_day,
+    usage_by_jd,
+    usage_by_user,
+)
+
+
+router = APIRouter()
+
+
+@router.get("/usage/by-jd", response_model=UsageAggregateResponse)
+async def get_usage_by_jd(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    user_name: str | None = None,
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """LLM calls, tokens and estimated cost per JD (from the daily rollup)."""
+
+    items = usage_by_jd(db, start_date=start_date, end_date=end_date, user_name=user_name)
+    return UsageAggregateResponse(items=items)
+
+
+@router.get("/usage/by-user", response_model=UsageAggregateResponse)
+async def get_usage_by_user(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    jd_id: int | None = None,
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """LLM calls, tokens and estimated cost per user (from the daily rollup)."""
+
+    items = usage_by_user(db, start_date=start_date, end_date=end_date, jd_id=jd_id)
+    return UsageAggregateResponse(items=items)
+
+
+@router.get("/usage/by-day", response_model=UsageAggregateResponse)
+async def get_usage_by_day(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    jd_id: int | None = None,
+    user_name: str | None = None,
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """LLM calls, tokens and estimated cost per day, optionally for one JD or user."""
+
+    items = usage_by_day(
+        db, start_date=start_date, end_date=end_date, jd_id=jd_id, user_name=user_name
+    )
+    return UsageAggregateResponse(items=items)
+
+
+@router.get("/usage/cascade", response_model=CascadeStatsResponse)
+async def get_cascade_stats(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    jd_id: int | None = None,
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Model cascade escalation rate and estimated savings per JD."""
+
+    items = cascade_stats_by_jd(db, start_date=start_date, end_date=end_date, jd_id=jd_id)
+    return CascadeStatsResponse(items=items)
+
+
+@router.get("/usage/prompt-cache", response_model=PromptCacheStatsResponse)
+async def get_prompt_cache_stats(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    jd_id: int | None = None,
+    call_type: str | None = None,
+    db=Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Provider prompt-cache hit rate, latency and estimated savings per call type and model."""
+
+    items = prompt_cache_stats(db, start_date=start_date, end_date=end_date, jd_id=jd_id, call_type=call_type)
+    return PromptCacheStatsResponse(items=items)
@@ -7,14 +7,23 @@ load_dotenv()
 
 
 class Settings(BaseSettings):
-    # Which backend: "openai", "deepseek", or "mistral"
+    # Which backend: "openai", "deepseek", "mistral", or "fake" (offline, for load tests)
     llm_provider: str = os.getenv("LLM_PROVIDER", "openai")
 
     # Common model name
     llm_model: str = os.getenv("LLM_MODEL", "gpt-4o-mini")
 
+    # Optional per-model pricing override (USD per 1M tokens), JSON:
+    # '{"gpt-4o-mini": [0.15, 0.6]}'; an optional third price is charged
+    # for input tokens served from the provider's prompt cache
+    llm_pricing_json: str = os.getenv("LLM_PRICING_JSON", "")
+
     # OpenAI
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
+    # Sent as prompt_cache_key so calls sharing a prompt prefix are routed to
+    # the same cache; empty (default) = not sent, as OpenAI-compatible
+    # endpoints may reject the field
+    openai_prompt_cache_key: str = os.getenv("OPENAI_PROMPT_CACHE_KEY", "")
 
     # DeepSeek / custom (OpenAI-compatible)
     deepseek_base_url: str = os.getenv("DEEPSEEK_BASE_URL", "")
@@ -24,6 +33,102 @@ class Settings(BaseSettings):
     mistral_base_url: str = os.getenv("MISTRAL_BASE_URL", "")
     mistral_api_key: str = os.getenv("MISTRAL_API_KEY", "")
 
+    # How long Ollama keeps a model (and the KV cache of its last prompt
+    # prefix) loaded after a call, e.g. "30m"; empty (default) = not sent,
+    # Ollama's default applies
+    ollama_keep_alive: str = os.getenv("OLLAMA_KEEP_ALIVE", "")
+
+    # Fake provider (LLM_PROVIDER=fake): deterministic offline responses.
+    # Latency distribution: "fixed", "uniform", "normal" or "lognormal";
+    # FAKE_LLM_LATENCY_MS is the fixed value / mean / median and
+    # FAKE_LLM_LATENCY_SPREAD the uniform half-width / stddev (ms) / log sigma.
+    fake_llm_latency_distribution: str = os.getenv("FAKE_LLM_LATENCY_DISTRIBUTION", "fixed")
+    fake_llm_latency_ms: float = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+    fake_llm_latency_spread: float = float(os.getenv("FAKE_LLM_LATENCY_SPREAD", "0"))
+    # Added per generated output token (decode time), so output size shows in latency
+    fake_llm_ms_per_output_token: float = float(os.getenv("FAKE_LLM_MS_PER_OUTPUT_TOKEN", "0"))
+    # Fault injection rates (0..1, per call)
+    fake_llm_error_rate: float = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+    fake_llm_timeout_rate: float = float(os.getenv("FAKE_LLM_TIMEOUT_RATE", "0"))
+    fake_llm_timeout_seconds: float = float(os.getenv("FAKE_LLM_TIMEOUT_SECONDS", "5"))
+    fake_llm_malformed_json_rate: float = float(os.getenv("FAKE_LLM_MALFORMED_JSON_RATE", "0"))
+    fake_llm_rate_limit_rate: float = float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0"))
+    fake_llm_seed: int = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+    # Multi-endpoint routing: JSON list of endpoints, e.g.
+    # '[{"name": "openai", "provider": "openai", "model": "gpt-4o-mini", "weight": 3, "max_concurrency": 8},
+    #   {"name": "deepseek-a", "provider": "deepseek", "model": "deepseek-r1", "base_url": "http://gpu-a:11434"}]'
+    # Calls are spread by weight (0 = standby) and fail over on 429/5xx/timeouts.
+    # Empty: LLM_PROVIDER / LLM_MODEL only.
+    llm_routes_json: str = os.getenv("LLM_ROUTES_JSON", "")
+    # Circuit breaker: open after this many consecutive failures, probe again after the reset time
+    llm_circuit_failure_threshold: int = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "3"))
+    llm_circuit_reset_seconds: float = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30"))
+    # Max wait for a free slot on an endpoint at its max_concurrency
+    llm_route_acquire_timeout_seconds: float = float(
+        os.getenv("LLM_ROUTE_ACQUIRE_TIMEOUT_SECONDS", "60")
+    )
+
+    # Shared LLM rate limits per model (per endpoint with "rpm"/"tpm" in
+    # LLM_ROUTES_JSON): requests and tokens per minute, 0 = unlimited. Budgets
+    # are kept in the database for all worker processes and nodes, or with
+    # LLM_RATE_LIMIT_BACKEND=file in LLM_RATE_LIMIT_FILE (one node only).
+    llm_rate_limit_rpm: int = int(os.getenv("LLM_RATE_LIMIT_RPM", "0"))
+    llm_rate_limit_tpm: int = int(os.getenv("LLM_RATE_LIMIT_TPM", "0"))
+    llm_rate_limit_backend: str = os.getenv("LLM_RATE_LIMIT_BACKEND", "database")
+    llm_rate_limit_file: str = os.getenv("LLM_RATE_LIMIT_FILE", "llm_rate_limit.json")
+    # Output tokens reserved per call until actual usage has been observed
+    llm_rate_limit_output_estimate: int = int(os.getenv("LLM_RATE_LIMIT_OUTPUT_ESTIMATE", "1000"))
+    # A call that cannot get budget within this time fails as a timeout
+    llm_rate_limit_max_wait_seconds: float = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT_SECONDS", "120"))
+
+    # LLM record/replay: "off", "record" (store every response) or "replay"
+    # (serve stored responses, no provider calls). Store is a SQLite file.
+    llm_cassette_mode: str = os.getenv("LLM_CASSETTE_MODE", "off")
+    llm_cassette_path: str = os.getenv("LLM_CASSETTE_PATH", "llm_cassette.db")
+    # Replay delay = recorded latency * scale (0 = respond immediately)
+    llm_cassette_latency_scale: float = float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "1.0"))
+
+    # Resume analysis output: ask providers with a JSON mode for bare JSON
+    # (OpenAI response_format, Ollama format=json) and allow this many cheap
+    # repair calls when the reply does not validate against the schema
+    llm_json_mode: bool = os.getenv("LLM_JSON_MODE", "true").lower() in ("1", "true", "yes")
+    resume_analysis_repair_attempts: int = int(
+        os.getenv("RESUME_ANALYSIS_REPAIR_ATTEMPTS", "1")
+    )
+
+    # Analysis prompt budgets (tokens of LLM_MODEL's tokenizer): JD and resume
+    # text is normalized, stripped of page headers/footers and boilerplate
+    # sections, then cut by section priority to fit. 0 = no limit.
+    prompt_jd_token_budget: int = int(os.getenv("PROMPT_JD_TOKEN_BUDGET", "2000"))
+    prompt_resume_token_budget: int = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", "6000"))
+
+    # "raw": resume prompts carry the JD text; "profile": the JD's requirement
+    # profile instead (distilled once per JD text by an extra LLM call)
+    resume_prompt_jd_mode: str = os.getenv("RESUME_PROMPT_JD_MODE", "raw")
+
+    # "prefix_cache": the analysis prompt is the static system prompt, then
+    # the JD block, then the resume (with the per-resume contact-key note
+    # last), so every resume of a JD shares a byte-identical prefix that
+    # providers can serve from their prompt cache; "combined": system prompt
+    # tailored to the requested contact keys, JD and resume in one message
+    resume_prompt_layout: str = os.getenv("RESUME_PROMPT_LAYOUT", "prefix_cache")
+
+    # Output schema asked of the resume analysis: "full" (descriptive keys, a
+    # note per dimension) or "compact" (short keys, bounded text, notes
+    # optional for mid-range scores; expanded back before storing). A JD's
+    # output_schema setting overrides it.
+    resume_output_schema: str = os.getenv("RESUME_OUTPUT_SCHEMA", "full")
+
+    # Model cascade: CASCADE_MODEL (on CASCADE_PROVIDER, default LLM_PROVIDER)
+    # analyzes every resume first; only results with a match_score inside
+    # [CASCADE_BAND_LOW, CASCADE_BAND_HIGH] or invalid output are re-analyzed
+    # by LLM_MODEL. Empty CASCADE_MODEL disables the cascade.
+    cascade_model: str = os.getenv("CASCADE_MODEL", "")
+    cascade_provider: str = os.getenv("CASCADE_PROVIDER", "")
+    cascade_band_low: float = float(os.getenv("CASCADE_BAND_LOW", "40"))
+    cascade_band_high: float = float(os.getenv("CASCADE_BAND_HIGH", "75"))
+
     # File upload configuration
     # Default: JDs go to uploaded_jds/, resumes to uploaded_resumes/
     upload_dir_jd: str = os.getenv("UPLOAD_DIR_JD", "uploaded_jds")
@@ -38,6 +143,14 @@ class Settings(BaseSettings):
         os.getenv("MAX_JD_FILE_SIZE_BYTES", str(10 * 1024 * 1024))
     )
 
+    # In-memory cache of extracted file text (entries); 0 disables it
+    file_text_cache_size: int = int(os.getenv("FILE_TEXT_CACHE_SIZE", "64"))
+
+    # Tracing: "none", "console" or "file" (JSON lines at TRACING_FILE_PATH)
+    tracing_exporter: str = os.getenv("TRACING_EXPORTER", "none")
+    tracing_file_path: str = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+    tracing_service_name: str = os.getenv("TRACING_SERVICE_NAME", "hiresence-backend")
+
     # JWT Configuration
     JWT_SECRET_KEY: str = "change-me-in-production"
     JWT_ALGORITHM: str = "HS256"
@@ -50,9 +163,83 @@ class Settings(BaseSettings):
     resume_process_batch_size: int = int(
         os.getenv("RESUME_PROCESS_BATCH_SIZE", "10")
     )
+    # Resumes analyzed concurrently adapt (AIMD) between these bounds: +1 per
+    # round of healthy calls, times RESUME_PROCESS_BACKOFF_FACTOR on 429s,
+    # timeouts, latency above RESUME_PROCESS_LATENCY_SPIKE_FACTOR x baseline
+    # or an error rate above RESUME_PROCESS_ERROR_RATE_THRESHOLD
+    resume_process_min_parallel: int = int(
+        os.getenv("RESUME_PROCESS_MIN_PARALLEL", "1")
+    )
     resume_process_max_parallel: int = int(
         os.getenv("RESUME_PROCESS_MAX_PARALLEL", "3")
     )
+    resume_process_backoff_factor: float = float(
+        os.getenv("RESUME_PROCESS_BACKOFF_FACTOR", "0.5")
+    )
+    resume_process_latency_spike_factor: float = float(
+        os.getenv("RESUME_PROCESS_LATENCY_SPIKE_FACTOR", "2.0")
+    )
+    resume_process_error_rate_threshold: float = float(
+        os.getenv("RESUME_PROCESS_ERROR_RATE_THRESHOLD", "0.2")
+    )
+
+    # Lexical (BM25) pre-screening: pending resumes scoring below this
+    # normalized score (0..1) against their JD are marked `screened_out`
+    # without an LLM call. 0 disables screening; JDs can override it.
+    lexical_screen_threshold: float = float(
+        os.getenv("LEXICAL_SCREEN_THRESHOLD", "0")
+    )
+    # Resume length (in tokens, after stopword removal) that BM25 length
+    # normalization treats as average. Fixed, so a resume scores the same
+    # whatever else is pending with it.
+    lexical_screen_reference_length: int = int(
+        os.getenv("LEXICAL_SCREEN_REFERENCE_LENGTH", "400")
+    )
+    # LLM quick screen: a short prompt estimates the match score first, and
+    # the full analysis runs only if the estimate reaches this cutoff (0..100);
+    # below it the resume is `screened_out`. 0 disables it; JDs can override it.
+    # The screen runs on RESUME_SCREEN_MODEL (on RESUME_SCREEN_PROVIDER), else
+    # on the cascade model, else on LLM_MODEL.
+    resume_screen_cutoff: float = float(os.getenv("RESUME_SCREEN_CUTOFF", "0"))
+    resume_screen_model: str = os.getenv("RESUME_SCREEN_MODEL", "")
+    resume_screen_provider: str = os.getenv("RESUME_SCREEN_PROVIDER", "")
+
+    # Store each analysis reply (with its usage) before parsing it, so a resume
+    # interrupted after the LLM call resumes from the reply instead of paying
+    # for a new one (resume_analysis_checkpoint)
+    resume_analysis_checkpoint: bool = os.getenv("RESUME_ANALYSIS_CHECKPOINT", "true").lower() in ("1", "true", "yes")
+
+    # Country calling code for resume phone numbers written without one
+    # (upload-time contact extraction stores phones in E.164)
+    contact_default_country_code: str = os.getenv("CONTACT_DEFAULT_COUNTRY_CODE", "1")
+
+    # Resume embeddings (hashed word/char n-grams, CPU only) for pool search.
+    # Vectors live in memory-mapped files under VECTOR_INDEX_DIR; changing
+    # EMBEDDING_DIM resets the index (re-run backfill_resume_index.py).
+    vector_index_dir: str = os.getenv("VECTOR_INDEX_DIR", "vector_index")
+    embedding_dim: int = int(os.getenv("EMBEDDING_DIM", "512"))
+    # Above this many vectors, search an IVF index instead of brute force (0 = never)
+    vector_index_ivf_min_size: int = int(
+        os.getenv("VECTOR_INDEX_IVF_MIN_SIZE", "100000")
+    )
+    vector_index_ivf_nprobe: int = int(os.getenv("VECTOR_INDEX_IVF_NPROBE", "16"))
+
+    # Live progress events (SSE) configuration
+    progress_events_keepalive_seconds: int = int(
+        os.getenv("PROGRESS_EVENTS_KEEPALIVE_SECONDS", "15")
+    )
+    progress_events_queue_size: int = int(
+        os.getenv("PROGRESS_EVENTS_QUEUE_SIZE", "100")
+    )
+    # Events go through the resume_progress_event table, so every API
+    # process sees those of every worker; one reader per JD and process
+    # polls it this often
+    progress_events_poll_seconds: float = float(
+        os.getenv("PROGRESS_EVENTS_POLL_SECONDS", "1")
+    )
+    progress_events_retention_seconds: int = int(
+        os.getenv("PROGRESS_EVENTS_RETENTION_SECONDS", "3600")
+    )
 
     class Config:
         env_file = ".env"
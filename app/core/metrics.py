@@ -0,0 +1,248 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+
+# Multi-process uvicorn/gunicorn: set PROMETHEUS_MULTIPROC_DIR to a writable,
+# per-deployment directory (wiped on start) so every worker writes its samples
+# there and /metrics aggregates them.
+MULTIPROCESS_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir")
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_LLM_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 90, 120, 180)
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "hiresence_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status_code"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+WORKER_BATCH_DURATION = Histogram(
+    "hiresence_resume_worker_batch_duration_seconds",
+    "Wall time of one resume worker batch (run_once)",
+    buckets=_LLM_BUCKETS + (300, 600),
+)
+
+WORKER_CONCURRENCY_LIMIT = Gauge(
+    "hiresence_resume_worker_concurrency_limit",
+    "Current adaptive (AIMD) limit on the resume worker's concurrent LLM calls",
+    multiprocess_mode="liveall",
+)
+
+WORKER_CONCURRENCY_DECISIONS = Counter(
+    "hiresence_resume_worker_concurrency_decisions_total",
+    "Changes of the resume worker's concurrency limit (increase, decrease)",
+    ["decision"],
+)
+
+RESUMES_PROCESSED = Counter(
+    "hiresence_resumes_processed_total",
+    "Resumes handled by the worker, by outcome",
+    ["outcome"],
+)
+
+RESUME_STAGE_DURATION = Histogram(
+    "hiresence_resume_stage_duration_seconds",
+    "Per-stage latency of resume analysis (extract, cascade, llm, repair, parse, persist)",
+    ["stage"],
+    buckets=_LLM_BUCKETS,
+)
+
+FILE_EXTRACT_DURATION = Histogram(
+    "hiresence_file_extract_duration_seconds",
+    "Text extraction latency by file extension",
+    ["extension"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+LLM_REQUEST_DURATION = Histogram(
+    "hiresence_llm_request_duration_seconds",
+    "LLM call latency",
+    ["provider", "model"],
+    buckets=_LLM_BUCKETS,
+)
+
+LLM_ERRORS = Counter(
+    "hiresence_llm_errors_total",
+    "LLM call failures by error type",
+    ["provider", "model", "error_type"],
+)
+
+LLM_TOKENS = Counter(
+    "hiresence_llm_tokens_total",
+    "LLM tokens consumed, by direction (input/output; cached_input: input served from the prompt cache)",
+    ["provider", "model", "direction"],
+)
+
+RESUME_ANALYSIS_OUTPUTS = Counter(
+    "hiresence_resume_analysis_outputs_total",
+    "Resume analysis replies by validation result (valid, repaired, invalid)",
+    ["result"],
+)
+
+PROMPT_TOKENS_SAVED = Counter(
+    "hiresence_prompt_tokens_saved_total",
+    "Tokens removed from analysis prompts by JD/resume compaction",
+    ["document"],
+)
+
+CASCADE_DECISIONS = Counter(
+    "hiresence_cascade_decisions_total",
+    "Model cascade outcomes: accepted (cheap result kept), uncertain_score / invalid_output (escalated)",
+    ["decision"],
+)
+
+SCREEN_DECISIONS = Counter(
+    "hiresence_screen_decisions_total",
+    "LLM quick-screen outcomes: passed (full analysis follows), screened_out, invalid_output (let through)",
+    ["decision"],
+)
+
+ANALYSIS_CHECKPOINTS_RESUMED = Counter(
+    "hiresence_analysis_checkpoints_resumed_total",
+    "Resume analyses continued from a stored reply after an interrupted run, instead of a new LLM call",
+)
+
+LLM_FAILOVERS = Counter(
+    "hiresence_llm_failovers_total",
+    "Routed LLM calls that failed on an endpoint and moved to the next one",
+    ["endpoint", "error_type"],
+)
+
+LLM_CIRCUIT_OPENS = Counter(
+    "hiresence_llm_circuit_opens_total",
+    "Times an LLM endpoint's circuit breaker opened",
+    ["endpoint"],
+)
+
+LLM_RATE_LIMIT_WAIT = Histogram(
+    "hiresence_llm_rate_limit_wait_seconds",
+    "Time LLM calls waited for shared rate-limit budget (calls that waited)",
+    ["bucket"],
+    buckets=(0.1, 0.5, 1, 2, 5, 10, 30, 60, 120),
+)
+
+CACHE_REQUESTS = Counter(
+    "hiresence_cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss); hit ratio = hit / (hit + miss)",
+    ["cache", "result"],
+)
+
+
+# In-process consumers of raw stage durations (e.g. the benchmark harness,
+# which needs exact percentiles rather than histogram buckets)
+_stage_listeners: list[Callable[[str, float], None]] = []
+
+
+def add_stage_listener(listener: Callable[[str, float], None]) -> None:
+    _stage_listeners.append(listener)
+
+
+def remove_stage_listener(listener: Callable[[str, float], None]) -> None:
+    if listener in _stage_listeners:
+        _stage_listeners.remove(listener)
+
+
+@contextmanager
+def track_stage(stage: str):
+    """Observe the duration of one resume pipeline stage."""
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        RESUME_STAGE_DURATION.labels(stage=stage).observe(elapsed)
+        for listener in _stage_listeners:
+            listener(stage, elapsed)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+class _DatabaseCollector:
+    """Scrape-time gauges: resume queue depth by status/JD and DB pool stats."""
+
+    def collect(self):
+        from sqlalchemy import func
+
+        from app.models.db import SessionLocal, engine
+        from app.models.resume import Resume
+
+        queue_depth = GaugeMetricFamily(
+            "hiresence_resume_queue_depth",
+            "Resumes per processing status and JD",
+            labels=["status", "jd_id"],
+        )
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Resume.status, Resume.jd_id, func.count(Resume.resume_id))
+                .group_by(Resume.status, Resume.jd_id)
+                .all()
+            )
+            for status_value, jd_id, count in rows:
+                queue_depth.add_metric([str(status_value), str(jd_id)], int(count))
+        except Exception:
+            # Schema not ready yet (e.g. first scrape before startup init); skip
+            pass
+        finally:
+            db.close()
+        yield queue_depth
+
+        pool = engine.pool
+        pool_stats = GaugeMetricFamily(
+            "hiresence_db_pool_connections",
+            "SQLAlchemy connection pool state",
+            labels=["state"],
+        )
+        for state, attr in (
+            ("size", "size"),
+            ("checked_in", "checkedin"),
+            ("checked_out", "checkedout"),
+            ("overflow", "overflow"),
+        ):
+            getter = getattr(pool, attr, None)
+            if callable(getter):
+                try:
+                    pool_stats.add_metric([state], float(getter()))
+                except Exception:
+                    continue
+        yield pool_stats
+
+
+_db_collector = _DatabaseCollector()
+
+if not MULTIPROCESS_DIR:
+    REGISTRY.register(_db_collector)
+
+
+def render_metrics() -> bytes:
+    """Return the Prometheus exposition payload for /metrics."""
+
+    if MULTIPROCESS_DIR:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_db_collector)
+        return generate_latest(registry)
+
+    return generate_latest(REGISTRY)
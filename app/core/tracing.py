@@ -0,0 +1,149 @@
+import contextvars
+import json
+import logging
+import threading
+import uuid
+from typing import Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+CORRELATION_ID_HEADER = "X-Correlation-ID"
+CORRELATION_ID_ATTRIBUTE = "hiresence.correlation_id"
+
+correlation_id_var: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "correlation_id", default=None
+)
+
+tracer = trace.get_tracer("hiresence")
+
+_configured = False
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex
+
+
+def get_correlation_id() -> str | None:
+    return correlation_id_var.get()
+
+
+class JsonLinesFileSpanExporter(SpanExporter):
+    """Append finished spans as one JSON object per line, for offline inspection."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        try:
+            lines = [json.dumps(json.loads(span.to_json())) for span in spans]
+            with self._lock, open(self._path, "a", encoding="utf-8") as f:
+                for line in lines:
+                    f.write(line + "\n")
+        except Exception as exc:
+            logger.warning("Tracing: failed to write spans to '%s': %s", self._path, exc)
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        return None
+
+
+class CorrelationIdSpanProcessor(SpanProcessor):
+    """Stamp the current correlation ID on every span when it starts."""
+
+    def on_start(self, span, parent_context=None) -> None:
+        correlation_id = correlation_id_var.get()
+        if correlation_id:
+            span.set_attribute(CORRELATION_ID_ATTRIBUTE, correlation_id)
+
+
+def instrument_sqlalchemy(engine) -> None:
+    """Emit one client span per SQL statement executed through the engine."""
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        operation = (statement.lstrip().split(" ", 1)[0] or "SQL").upper()
+        span = tracer.start_span(
+            f"db.{operation.lower()}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": engine.dialect.name,
+                "db.operation": operation,
+                "db.statement": statement[:2000],
+            },
+        )
+        context._otel_span = span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_otel_span", None)
+        if span is not None:
+            span.end()
+            context._otel_span = None
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_otel_span", None) if context is not None else None
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
+            context._otel_span = None
+
+
+def configure_tracing() -> None:
+    """Install the tracer provider selected by TRACING_EXPORTER.
+
+    - none: spans are no-ops (default)
+    - console: print finished spans to stdout
+    - file: append finished spans as JSON lines to TRACING_FILE_PATH
+    """
+
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    exporter_name = settings.tracing_exporter.lower()
+    if exporter_name in ("", "none"):
+        return
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name})
+    )
+    provider.add_span_processor(CorrelationIdSpanProcessor())
+
+    if exporter_name == "console":
+        provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+    elif exporter_name == "file":
+        provider.add_span_processor(
+            BatchSpanProcessor(JsonLinesFileSpanExporter(settings.tracing_file_path))
+        )
+    else:
+        raise ValueError(f"Unsupported TRACING_EXPORTER: {settings.tracing_exporter}")
+
+    trace.set_tracer_provider(provider)
+
+    from app.models.db import engine
+
+    instrument_sqlalchemy(engine)
+    logger.info("Tracing enabled with '%s' exporter", exporter_name)
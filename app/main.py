@@ -1,10 +1,20 @@
-from fastapi import FastAPI
-from app.models.db import engine
+from fastapi import FastAPI, Request, Response
+from app.models.db import engine, sync_schema_columns
 import asyncio
 import logging
+import time
 
 from app.services.resume_processing_service import run_once
+from app.services.search_index import ensure_search_schema
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, HTTP_REQUEST_DURATION, render_metrics
+from app.core.tracing import (
+    CORRELATION_ID_HEADER,
+    configure_tracing,
+    correlation_id_var,
+    new_correlation_id,
+    tracer,
+)
 from app.api import (
     auth_routes,
     chat_routes,
@@ -12,8 +22,11 @@ from app.api import (
     resume_routes,
     feedback_routes,
     profile_routes,
+    usage_routes,
+    search_routes,
 )
 from fastapi.middleware.cors import CORSMiddleware
+from opentelemetry.trace import SpanKind
 
 
 logging.basicConfig(
@@ -22,6 +35,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+configure_tracing()
+
 app = FastAPI(title="HireSence AI Agent")
 
 app.add_middleware(
@@ -33,6 +48,49 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def _record_request_latency(request: Request, call_next):
+    """Observe request latency per route template (not per raw path, to bound cardinality)."""
+
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        HTTP_REQUEST_DURATION.labels(
+            method=request.method,
+            route=route_path,
+            status_code=str(status_code),
+        ).observe(time.perf_counter() - start)
+
+
+@app.middleware("http")
+async def _trace_request(request: Request, call_next):
+    """Assign a correlation ID (client-supplied X-Correlation-ID or new) and open a server span."""
+
+    correlation_id = (request.headers.get(CORRELATION_ID_HEADER) or "")[:64] or new_correlation_id()
+    token = correlation_id_var.set(correlation_id)
+    try:
+        with tracer.start_as_current_span(
+            f"{request.method} {request.url.path}", kind=SpanKind.SERVER
+        ) as span:
+            span.set_attribute("http.method", request.method)
+            response = await call_next(request)
+            route = request.scope.get("route")
+            if route is not None and getattr(route, "path", None):
+                span.update_name(f"{request.method} {route.path}")
+                span.set_attribute("http.route", route.path)
+            span.set_attribute("http.status_code", response.status_code)
+        response.headers[CORRELATION_ID_HEADER] = correlation_id
+        return response
+    finally:
+        correlation_id_var.reset(token)
+
+
 async def _resume_worker_background():
     """Background task: periodically process pending resumes while app runs."""
 
@@ -61,6 +119,16 @@ async def on_startup():
     finally:
         raw_conn.close()
 
+    try:
+        sync_schema_columns()
+    except Exception as exc:
+        logger.exception("Error during schema column sync: %s", exc)
+
+    try:
+        ensure_search_schema(engine)
+    except Exception as exc:
+        logger.exception("Error creating full-text search schema: %s", exc)
+
     # Start background resume processing worker
     asyncio.create_task(_resume_worker_background())
     logger.info("Background resume worker started")
@@ -72,8 +140,17 @@ app.include_router(jd_routes.router, prefix="/api")
 app.include_router(resume_routes.router, prefix="/api")
 app.include_router(feedback_routes.router, prefix="/api")
 app.include_router(profile_routes.router, prefix="/api")
+app.include_router(usage_routes.router, prefix="/api")
+app.include_router(search_routes.router, prefix="/api")
 
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint (API latency, resume pipeline, LLM and DB pool metrics)."""
+
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
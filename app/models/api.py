@@ -1,6 +1,6 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ChatRequest(BaseModel):
@@ -114,6 +114,14 @@ class JobDetailsResponse(BaseModel):
     # resume counters
     resumes_uploaded_count: Optional[int] = None
     processed_resumes_count: Optional[int] = None
+    # screening overrides
+    force_full_analysis: Optional[bool] = None
+    lexical_screen_threshold: Optional[float] = None
+    screen_cutoff: Optional[float] = None
+    output_schema: Optional[str] = None
+    # requirement profile used in resume prompts (RESUME_PROMPT_JD_MODE=profile)
+    requirement_profile: Optional[dict] = None
+    requirement_profile_built_at: Optional[str] = None
     download: str
 
 
@@ -125,6 +133,30 @@ class JobAnalyzeResponse(BaseModel):
     last_reviewed_by: Optional[str] = None
 
 
+class JDSettingsUpdateRequest(BaseModel):
+    """Per-JD processing overrides; omitted fields are left unchanged.
+
+    Setting `lexical_screen_threshold`, `screen_cutoff` or `output_schema` to
+    null falls back to the global LEXICAL_SCREEN_THRESHOLD /
+    RESUME_SCREEN_CUTOFF / RESUME_OUTPUT_SCHEMA.
+    """
+
+    force_full_analysis: Optional[bool] = None
+    lexical_screen_threshold: Optional[float] = Field(default=None, ge=0, le=1)
+    screen_cutoff: Optional[float] = Field(default=None, ge=0, le=100)
+    output_schema: Optional[Literal["full", "compact"]] = None
+
+
+class JDSettingsResponse(BaseModel):
+    jd_id: int
+    force_full_analysis: bool
+    lexical_screen_threshold: Optional[float] = None
+    screen_cutoff: Optional[float] = None
+    output_schema: Optional[str] = None
+    # screened_out resumes moved back to the queue by this update
+    requeued_resumes: int = 0
+
+
 class JobDeleteResponse(BaseModel):
     jd_id: int
     file_deleted: bool
@@ -179,6 +211,8 @@ class ResumeSummary(BaseModel):
     candidate_name: Optional[str] = None
     candidate_email: Optional[str] = None
     candidate_phone: Optional[str] = None
+    lexical_score: Optional[float] = None
+    skills: Optional[List[str]] = None  # parsed_skills: taxonomy matches, then LLM extras
 
 
 class ResumeListResponse(BaseModel):
@@ -213,6 +247,8 @@ class ResumeAnalysisSummary(BaseModel):
     jd_id: int
     file_name: Optional[str] = None
     match_score: Optional[float] = None
+    lexical_score: Optional[float] = None
+    screen_score: Optional[float] = None
     status: Optional[str] = None
     failure_reason: Optional[str] = None
 
@@ -230,6 +266,7 @@ class ResumeAnalysisDetail(BaseModel):
     candidate_name: Optional[str] = None
     candidate_email: Optional[str] = None
     candidate_phone: Optional[str] = None
+    skills: Optional[List[str]] = None
     # top-level analysis fields
     match_score: Optional[float] = None
     summary: Optional[str] = None
@@ -263,15 +300,66 @@ class ResumeAnalysisDetail(BaseModel):
     consistency_trajectory_note: Optional[str] = None
     processed_at: Optional[str] = None
     processed_by: Optional[str] = None
+    # LLM usage & cost
+    llm_provider: Optional[str] = None
+    llm_model: Optional[str] = None
+    llm_endpoint: Optional[str] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cached_input_tokens: Optional[int] = None
+    llm_latency_ms: Optional[int] = None
+    estimated_cost_usd: Optional[float] = None
+    prompt_tokens_saved: Optional[int] = None
+    analysis_mode: Optional[str] = None
     # resume status fields
     status: Optional[str] = None
     failure_reason: Optional[str] = None
+    # LLM quick-screen result (RESUME_SCREEN_CUTOFF / per-JD screen_cutoff)
+    screen_score: Optional[float] = None
+    screen_reason: Optional[str] = None
 
 
 class ResumeAnalysisListResponse(BaseModel):
     items: List[ResumeAnalysisSummary]
 
 
+class PoolMatchItem(BaseModel):
+    resume_id: int
+    jd_id: int  # JD the resume was uploaded against
+    file_name: Optional[str] = None
+    candidate_name: Optional[str] = None
+    similarity: float  # cosine similarity of hashed n-gram embeddings
+    match_score: Optional[float] = None
+    status: Optional[str] = None
+
+
+class PoolMatchResponse(BaseModel):
+    jd_id: int
+    top_k: int
+    index_size: int
+    search_method: str  # brute_force or ivf
+    items: List[PoolMatchItem]
+
+
+class SearchResultItem(BaseModel):
+    resume_id: int
+    jd_id: int
+    file_name: Optional[str] = None
+    candidate_name: Optional[str] = None
+    status: Optional[str] = None
+    match_score: Optional[float] = None
+    rank: float  # higher is better; comparable within one query only
+    snippet: Optional[str] = None  # matching resume text, hits wrapped in [ ]
+
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    items: List[SearchResultItem]
+
+
 class ResumeStatusUpdateRequest(BaseModel):
     business_status: str  # e.g., interview_scheduled, rejected, on_hold
 
@@ -284,6 +372,14 @@ class ResumeStatusUpdateResponse(BaseModel):
     failure_reason: Optional[str] = None
 
 
+class ResumePromoteResponse(BaseModel):
+    resume_id: int
+    jd_id: int
+    status: Optional[str] = None
+    screen_score: Optional[float] = None
+    screen_reason: Optional[str] = None
+
+
 class ResumeDeleteResponse(BaseModel):
     resume_id: int
     file_deleted: bool
@@ -301,3 +397,58 @@ class ResumeMoveResponse(BaseModel):
     file_location: str
     status: Optional[str] = None
     message: str
+
+
+class UsageAggregateItem(BaseModel):
+    # exactly one grouping key is set, depending on the endpoint
+    jd_id: Optional[int] = None
+    user_name: Optional[str] = None
+    usage_date: Optional[str] = None
+    calls: int
+    input_tokens: int
+    output_tokens: int
+    estimated_cost_usd: float
+
+
+class UsageAggregateResponse(BaseModel):
+    items: List[UsageAggregateItem]
+
+
+class CascadeStatsItem(BaseModel):
+    jd_id: int
+    analyses: int  # analyses that went through the cascade
+    accepted_cheap: int
+    escalated: int
+    escalated_uncertain: int
+    escalated_invalid: int
+    escalation_rate: float
+    actual_cost_usd: float
+    # what the same analyses would have cost on the primary model alone
+    primary_only_cost_usd: float
+    estimated_savings_usd: float
+
+
+class CascadeStatsResponse(BaseModel):
+    items: List[CascadeStatsItem]
+
+
+class PromptCacheStatsItem(BaseModel):
+    call_type: str
+    llm_provider: Optional[str] = None
+    llm_model: Optional[str] = None
+    calls: int
+    calls_with_cache_hit: int
+    input_tokens: int
+    cached_input_tokens: int
+    cached_input_ratio: float  # cached_input_tokens / input_tokens
+    # mean latency of operations with / without cached input tokens
+    avg_latency_ms_cache_hit: Optional[int] = None
+    avg_latency_ms_no_cache_hit: Optional[int] = None
+    actual_cost_usd: float
+    # what the same calls would have cost without the prompt cache
+    uncached_cost_usd: float
+    estimated_savings_usd: float
+
+
+class PromptCacheStatsResponse(BaseModel):
+    items: List[PromptCacheStatsItem]
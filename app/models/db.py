@@ -1,17 +1,26 @@
-from sqlalchemy import create_engine
+from sqlalchemy import Boolean, create_engine, false, inspect, text, true
 from sqlalchemy.orm import sessionmaker, declarative_base
+import logging
 import os
 
 from app.core.config import settings
 
 
+logger = logging.getLogger(__name__)
+
+
 def _build_database_url() -> str:
     """Build SQLAlchemy database URL based on settings.
 
+    - If DATABASE_URL is set, use it as-is (e.g. benchmarks pointing at a scratch DB).
     - If DB_TYPE is 'postgres', use Postgres URL from env (host, port, name, user, password).
     - Otherwise, fall back to SQLite dev.db in the project root.
     """
 
+    explicit_url = os.getenv("DATABASE_URL")
+    if explicit_url:
+        return explicit_url
+
     db_type = os.getenv("DB_TYPE", "sqlite").lower()
 
     if db_type == "postgres":
@@ -36,3 +45,70 @@ engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
+
+
+def _default_sql(column, server_default) -> str:
+    """SQL of a column's server default for this database's dialect."""
+
+    if isinstance(server_default, str):
+        if isinstance(column.type, Boolean):
+            # "0"/"1" are integers to Postgres, which rejects them for a BOOLEAN
+            server_default = true() if server_default.lower() in ("1", "true") else false()
+        elif server_default.lstrip("-").isdigit():
+            return server_default
+        else:
+            return "'" + server_default.replace("'", "''") + "'"
+    if hasattr(server_default, "text"):
+        return server_default.text
+    return str(server_default.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def sync_schema_columns() -> list[str]:
+    """Add nullable/defaulted model columns missing from existing tables.
+
+    `sql/init.sql` only runs CREATE TABLE IF NOT EXISTS, so databases created
+    before a column was introduced would otherwise never receive it. Each
+    column is added in its own transaction: one that fails is logged and
+    the others are still added. Returns the list of "table.column" entries
+    that were added.
+    """
+
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added: list[str] = []
+    failed: list[str] = []
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            server_default = getattr(column.server_default, "arg", None)
+            if not column.nullable and server_default is None:
+                logger.warning(
+                    "Schema sync: cannot add NOT NULL column %s.%s without a default",
+                    table.name,
+                    column.name,
+                )
+                continue
+
+            column_type = column.type.compile(dialect=engine.dialect)
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+            if server_default is not None:
+                ddl += f" DEFAULT {_default_sql(column, server_default)}"
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(ddl))
+            except Exception as exc:
+                logger.error("Schema sync: failed to add column %s.%s: %s", table.name, column.name, exc)
+                failed.append(f"{table.name}.{column.name}")
+                continue
+            added.append(f"{table.name}.{column.name}")
+
+    if added:
+        logger.info("Schema sync: added columns %s", ", ".join(added))
+    if failed:
+        logger.error("Schema sync: columns not added %s", ", ".join(failed))
+    return added
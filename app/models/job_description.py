@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, func
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, false, func
 
 from .db import Base
 
@@ -18,10 +18,26 @@ class JobDescription(Base):
     last_reviewed_at = Column(DateTime, nullable=True)
     last_reviewed_by = Column(String, nullable=True)
 
+    # Requirement profile distilled once from the JD text and sent to resume
+    # analysis instead of the JD; hash = jd_content_hash of the text it was
+    # built from, so a changed JD file rebuilds it
+    requirement_profile_json = Column(Text, nullable=True)
+    requirement_profile_hash = Column(String, nullable=True)
+    requirement_profile_built_at = Column(DateTime, nullable=True)
+
     # resume counters
     resumes_uploaded_count = Column(Integer, nullable=False, default=0, server_default="0")
     processed_resumes_count = Column(Integer, nullable=False, default=0, server_default="0")
 
+    # screening overrides: force every resume through full LLM analysis, or
+    # use a JD-specific lexical threshold / LLM quick-screen cutoff instead of
+    # LEXICAL_SCREEN_THRESHOLD / RESUME_SCREEN_CUTOFF
+    force_full_analysis = Column(Boolean, nullable=False, default=False, server_default=false())
+    lexical_screen_threshold = Column(Float, nullable=True)
+    screen_cutoff = Column(Float, nullable=True)
+    # resume analysis output schema ("full" / "compact"); NULL = RESUME_OUTPUT_SCHEMA
+    output_schema = Column(String, nullable=True)
+
     # status & audit
     status = Column(String, nullable=False, default="active")
     uploaded_by = Column(String, nullable=True)
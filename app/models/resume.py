@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Float, func
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Float, Index, false, func
 
 from .db import Base
 
@@ -20,12 +20,18 @@ class Resume(Base):
     parsed_summary = Column(String, nullable=True)
     parsed_skills = Column(String, nullable=True)
     match_score = Column(Float, nullable=True)
+    lexical_score = Column(Float, nullable=True)  # BM25 pre-screen score (0..1)
+    screen_score = Column(Float, nullable=True)  # LLM quick-screen estimated match score (0..100)
+    screen_reason = Column(String, nullable=True)
+    # promoted: analyze fully, skipping the lexical and LLM screens
+    force_full_analysis = Column(Boolean, nullable=False, default=False, server_default=false())
 
     # status & audit
-    status = Column(String, nullable=False, default="new")
+    status = Column(String, nullable=False, default="new")  # new, processed, error, screened_out
     failure_reason = Column(String, nullable=True)
     uploaded_by = Column(String, nullable=True)
     business_status = Column(String, nullable=True)  # interview_scheduled, rejected, etc.
+    correlation_id = Column(String, nullable=True)  # request ID of the upload that created it
     is_active = Column(Boolean, nullable=False, default=True, server_default="1")
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=True)
@@ -77,6 +83,84 @@ class ResumeAnalysis(Base):
     consistency_trajectory_score = Column(Float, nullable=True)
     consistency_trajectory_note = Column(String, nullable=True)
 
+    # LLM usage & cost for this analysis
+    llm_provider = Column(String, nullable=True)
+    llm_model = Column(String, nullable=True)
+    llm_endpoint = Column(String, nullable=True)  # endpoint that served the (last) call
+    input_tokens = Column(Integer, nullable=True)
+    output_tokens = Column(Integer, nullable=True)
+    cached_input_tokens = Column(Integer, nullable=True)  # part of input_tokens served from the prompt cache
+    llm_latency_ms = Column(Integer, nullable=True)
+    estimated_cost_usd = Column(Float, nullable=True)
+    # output schema the analysis was requested in (full / compact)
+    output_schema = Column(String, nullable=True)
+    # single (one call, batch worker) / fanout (parallel per-dimension calls, analyze now)
+    analysis_mode = Column(String, nullable=True)
+    # contact keys the prompt asked the LLM for (0-3); the rest came from upload-time extraction
+    contact_keys_requested = Column(Integer, nullable=True)
+    # JD + resume tokens in the prompt after compaction, and tokens compaction removed
+    prompt_document_tokens = Column(Integer, nullable=True)
+    prompt_tokens_saved = Column(Integer, nullable=True)
+
+    # Model cascade (CASCADE_MODEL): which tier produced this analysis
+    # ("cheap" or "primary"; None without cascade), why it was escalated, and
+    # the cheap model's own result. The usage columns above cover both tiers.
+    cascade_tier = Column(String, nullable=True)
+    cascade_escalation_reason = Column(String, nullable=True)  # uncertain_score / invalid_output
+    cascade_model = Column(String, nullable=True)
+    cascade_match_score = Column(Float, nullable=True)
+    cascade_analysis_json = Column(String, nullable=True)
+    cascade_input_tokens = Column(Integer, nullable=True)
+    cascade_output_tokens = Column(Integer, nullable=True)
+    cascade_cost_usd = Column(Float, nullable=True)
+
     # audit
     processed_at = Column(DateTime, nullable=False, server_default=func.now())
     processed_by = Column(String, nullable=True)
+    correlation_id = Column(String, nullable=True)  # carried over from resume_details
+
+
+class ResumeSkill(Base):
+    __tablename__ = "resume_skill"
+    __table_args__ = (Index("ix_resume_skill_skill_resume_id", "skill", "resume_id"),)
+
+    resume_skill_id = Column(Integer, primary_key=True, autoincrement=True)
+    resume_id = Column(Integer, ForeignKey("resume_details.resume_id"), nullable=False, index=True)
+    skill = Column(String, nullable=False)  # lower-cased canonical name, the filter key
+    display_name = Column(String, nullable=False)
+    category = Column(String, nullable=True)  # taxonomy category; None for unknown LLM skills
+    source = Column(String, nullable=False)  # taxonomy (upload-time extractor) or llm
+    mentions = Column(Integer, nullable=True)  # occurrences in the resume text (taxonomy only)
+
+
+class ResumeAnalysisCheckpoint(Base):
+    """Analysis reply of a resume that is not stored as an analysis yet.
+
+    Written right after the LLM call and removed with the commit of the
+    analysis row; see app/services/analysis_checkpoint.py.
+    """
+
+    __tablename__ = "resume_analysis_checkpoint"
+
+    resume_id = Column(Integer, ForeignKey("resume_details.resume_id"), primary_key=True)
+    jd_id = Column(Integer, ForeignKey("job_description_details.jd_id"), nullable=False)
+    prompt_hash = Column(String, nullable=False)  # analysis prompt (and mode) the reply answers
+    stage = Column(String, nullable=False)  # last completed step: invoked / invalid
+    raw_response = Column(String, nullable=False)
+    pending_usage_json = Column(String, nullable=True)  # LLM calls not yet in llm_usage_log
+    cascade_json = Column(String, nullable=True)  # cascade columns and usage for the analysis row
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class ResumeProgressEvent(Base):
+    """Resume state transition for the SSE stream; see app/services/progress_events.py."""
+
+    __tablename__ = "resume_progress_event"
+    __table_args__ = (Index("ix_resume_progress_event_jd_id_event_id", "jd_id", "event_id"),)
+
+    event_id = Column(Integer, primary_key=True, autoincrement=True)
+    jd_id = Column(Integer, nullable=False)
+    resume_id = Column(Integer, nullable=False)
+    payload_json = Column(String, nullable=False)  # the SSE frame's data, without counts
+    created_at = Column(DateTime, nullable=False, server_default=func.now(), index=True)
@@ -0,0 +1,70 @@
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String, UniqueConstraint, func
+
+from .db import Base
+
+
+class LLMUsageLog(Base):
+    """One row per LLM-backed operation (resume analysis, JD builder, JD analyze)."""
+
+    __tablename__ = "llm_usage_log"
+
+    usage_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    call_type = Column(String, nullable=False)  # resume_analysis, jd_builder, jd_analyze, jd_profile, ...
+    jd_id = Column(Integer, nullable=True, index=True)
+    resume_id = Column(Integer, nullable=True)
+    user_name = Column(String, nullable=True)
+
+    llm_provider = Column(String, nullable=True)
+    llm_model = Column(String, nullable=True)
+    llm_endpoint = Column(String, nullable=True)  # LLM_ROUTES_JSON endpoint name (else the provider)
+    input_tokens = Column(Integer, nullable=True)
+    output_tokens = Column(Integer, nullable=True)
+    cached_input_tokens = Column(Integer, nullable=True)  # part of input_tokens served from the prompt cache
+    llm_latency_ms = Column(Integer, nullable=True)
+    estimated_cost_usd = Column(Float, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class LLMRateLimitBucket(Base):
+    """Shared token-bucket state of the LLM rate limiter (app/agents/rate_limit.py).
+
+    bucket_key is "<model or endpoint>:requests" or "<model or endpoint>:tokens";
+    updated_at is epoch seconds of the last refill.
+    """
+
+    __tablename__ = "llm_rate_limit_bucket"
+
+    bucket_key = Column(String, primary_key=True)
+    available = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False)
+
+
+class LLMUsageDailyRollup(Base):
+    """Pre-aggregated usage per day / JD / user / call type / model.
+
+    jd_id = 0 and user_name = '' stand for "not attributable" so the unique key
+    never contains NULLs (which would defeat the upsert).
+    """
+
+    __tablename__ = "llm_usage_daily_rollup"
+    __table_args__ = (
+        UniqueConstraint(
+            "usage_date", "jd_id", "user_name", "call_type", "llm_provider", "llm_model",
+            name="uq_llm_usage_daily_rollup",
+        ),
+    )
+
+    rollup_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    usage_date = Column(Date, nullable=False, index=True)
+    jd_id = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+    user_name = Column(String, nullable=False, default="", server_default="")
+    call_type = Column(String, nullable=False)
+    llm_provider = Column(String, nullable=False, default="", server_default="")
+    llm_model = Column(String, nullable=False, default="", server_default="")
+
+    call_count = Column(Integer, nullable=False, default=0, server_default="0")
+    input_tokens = Column(Integer, nullable=False, default=0, server_default="0")
+    output_tokens = Column(Integer, nullable=False, default=0, server_default="0")
+    llm_latency_ms = Column(Integer, nullable=False, default=0, server_default="0")
+    estimated_cost_usd = Column(Float, nullable=False, default=0.0, server_default="0")
@@ -1,3 +1,7 @@
+import re
+from functools import lru_cache
+
+
 RESUME_ANALYSIS_SYSTEM_PROMPT = """
 ### Role
     You are a **Senior Technical Recruiter and Hiring Manager** specializing in software engineering roles.
@@ -201,3 +205,333 @@ RESUME_ANALYSIS_SYSTEM_PROMPT = """
     - Example shape (do not add formatting or newlines in real output, this is illustrative only):
     {"candidate_name": "Jane Doe", "candidate_email": "jane.doe@example.com", "candidate_phone": "+1-234-567-8901", "match_score": 78, "summary": "Senior Java backend engineer with strong overlap on core stack and responsibilities, moderate fit on domain and some concerns about depth of cloud experience.", "skills": ["Java", "Spring Boot", "Microservices", "REST APIs", "AWS Certified Developer"], "issues": ["Only partial evidence of AWS experience", "No clear ownership of system-wide architecture", "Limited exposure to the specific fintech domain in the JD"], "dimensions": {"tech_stack_match": {"score": 9, "note": "JD requires Java, Spring Boot, microservices, REST; all are clearly present. AWS is required and candidate lists both hands-on use and a relevant certification."}, "relevant_experience": {"score": 8, "note": "JD asks for 5+ years; resume shows about 4–6 years in similar backend roles."}, "responsibilities_impact": {"score": 7, "note": "Candidate has owned key services and features, but impact metrics are described only at a high level."}, "seniority_fit": {"score": 8, "note": "Experience and responsibilities align with a solid senior engineer; some mentoring and design involvement are mentioned."}, "domain_fit": {"score": 5, "note": "JD is fintech; candidate has general SaaS and e-commerce experience but no direct fintech projects."}, "red_flags_gaps": {"score": 4, "note": "Main gaps are limited deep cloud architecture ownership and lack of explicit fintech exposure; otherwise resume is consistent."}, "communication_clarity": {"score": 8, "note": "Resume is well-structured with clear bullet points, technologies, and responsibilities."}, "soft_skills_professionalism": {"score": 7, "note": "Mentions mentoring juniors and collaborating with PMs and designers; limited detail on conflict resolution or stakeholder management."}, "project_complexity": {"score": 8, "note": "Worked on distributed microservices and high-traffic APIs, indicating non-trivial system complexity."}, "consistency_trajectory": {"score": 7, "note": "Steady progression from mid-level to senior roles over several years with increasing ownership; CS degree and relevant certifications support the trajectory."}}}
 """
+
+
+RESUME_ANALYSIS_REPAIR_SYSTEM_PROMPT = """
+You repair the JSON output of a resume assessment so that it matches the required schema.
+You receive the validation errors and the invalid output. Output exactly one valid JSON object on a single line, with no markdown or commentary.
+
+Schema:
+{"candidate_name": string or null (optional), "candidate_email": string or null (optional), "candidate_phone": string or null (optional), "match_score": number 0-100, "summary": string, "skills": [string], "issues": [string], "dimensions": {"<key>": {"score": number 0-10 or null, "note": string or null}}}
+The dimensions object must contain exactly these keys: tech_stack_match, relevant_experience, responsibilities_impact, seniority_fit, domain_fit, red_flags_gaps, communication_clarity, soft_skills_professionalism, project_complexity, consistency_trajectory.
+
+Rules:
+- Keep every value from the invalid output that is already correct; only fix what the errors point at.
+- Do not invent assessments. If a dimension is missing or was cut off, set its score to null and its note to "not assessed". match_score and summary are required and never null: if match_score is missing, estimate it (0-100) from the dimension scores in the output; if summary is missing, write one sentence from the output's notes and issues.
+- Do not add keys that are not in the schema.
+"""
+
+CONTACT_KEYS = ("candidate_name", "candidate_email", "candidate_phone")
+
+_CONTACT_KEY_LABELS = {
+    "candidate_name": "full name",
+    "candidate_email": "email",
+    "candidate_phone": "phone number",
+}
+
+_CONTACT_EXAMPLE_VALUES = {
+    "candidate_name": '"candidate_name": "Jane Doe", ',
+    "candidate_email": '"candidate_email": "jane.doe@example.com", ',
+    "candidate_phone": '"candidate_phone": "+1-234-567-8901", ',
+}
+
+
+OUTPUT_SCHEMAS = ("full", "compact")
+
+# Compact output schema: short keys, [score] / [score, "note"] dimensions,
+# bounded text. structured_output.expand_compact_analysis maps it back.
+COMPACT_CONTACT_KEYS = {"candidate_name": "n", "candidate_email": "e", "candidate_phone": "p"}
+COMPACT_DIMENSION_KEYS = {
+    "tech_stack_match": "ts",
+    "relevant_experience": "re",
+    "responsibilities_impact": "ri",
+    "seniority_fit": "sf",
+    "domain_fit": "df",
+    "red_flags_gaps": "rf",
+    "communication_clarity": "cc",
+    "soft_skills_professionalism": "sp",
+    "project_complexity": "pc",
+    "consistency_trajectory": "ct",
+}
+COMPACT_SUMMARY_MAX_CHARS = 240
+COMPACT_NOTE_MAX_CHARS = 100
+COMPACT_MAX_SKILLS = 10
+COMPACT_MAX_ISSUES = 5
+
+_EXPECTED_OUTPUT_HEADING = "### Expected Output (JSON, single line, no newlines)"
+
+COMPACT_OUTPUT_SECTION = """### Expected Output (compact JSON, single line, no newlines)
+    - You MUST output exactly one valid JSON object on a **single line**, using the short keys below.
+    - Do not include any markdown, comments, or extra text.
+    - Top-level keys (and only these keys) are required:
+{contact_lines}        - "ms" (number, 0–100; the match_score)
+        - "su" (string of at most {summary_chars} characters; the summary of the candidate vs JD)
+        - "sk" (array of at most {max_skills} strings; key relevant skills for this JD)
+        - "is" (array of at most {max_issues} strings of at most {note_chars} characters each; main gaps, risks, or concerns vs JD)
+        - "d" (object; the per-dimension scores and notes)
+
+    - The `d` object must have exactly these keys, each an array `[score]` or `[score, "note"]` with a score from 0 to 10:
+{dimension_lines}
+    - A note is at most {note_chars} characters. It is required for scores 0–3 and 7–10; for mid-range scores (4–6) add one only when the score needs explaining.
+
+    - Example shape (do not add formatting or newlines in real output, this is illustrative only):
+    {{{contact_example}"ms": 78, "su": "Senior Java backend engineer; strong core stack and responsibilities, moderate domain fit, thin cloud depth.", "sk": ["Java", "Spring Boot", "Microservices", "REST APIs", "AWS Certified Developer"], "is": ["Only partial evidence of AWS experience", "No clear system-wide architecture ownership", "No fintech exposure"], "d": {{"ts": [9, "Java, Spring Boot, microservices, REST all present; AWS hands-on plus certification."], "re": [8, "About 4–6 years in similar backend roles vs 5+ required."], "ri": [7, "Owned key services; impact described only at a high level."], "sf": [8, "Senior-level ownership with some mentoring and design."], "df": [5], "rf": [4], "cc": [8, "Well-structured, specific bullets."], "sp": [7, "Mentors juniors; works with PMs and designers."], "pc": [8, "Distributed microservices and high-traffic APIs."], "ct": [7, "Steady mid-to-senior progression; CS degree."]}}}}
+"""
+
+_COMPACT_CONTACT_LINES = {
+    "candidate_name": '        - "n" (string or null; candidate_name: full name as written in the resume, or null if not clearly available)\n',
+    "candidate_email": '        - "e" (string or null; candidate_email: primary email from the resume, or null if not clearly available)\n',
+    "candidate_phone": '        - "p" (string or null; candidate_phone: primary phone number from the resume, or null if not clearly available)\n',
+}
+_COMPACT_CONTACT_EXAMPLES = {
+    "candidate_name": '"n": "Jane Doe", ',
+    "candidate_email": '"e": "jane.doe@example.com", ',
+    "candidate_phone": '"p": "+1-234-567-8901", ',
+}
+
+
+def _compact_output_section(requested: list[str]) -> str:
+    return COMPACT_OUTPUT_SECTION.format(
+        contact_lines="".join(_COMPACT_CONTACT_LINES[key] for key in requested),
+        contact_example="".join(_COMPACT_CONTACT_EXAMPLES[key] for key in requested),
+        dimension_lines="\n".join(
+            f'        - "{short}" ({key})' for key, short in COMPACT_DIMENSION_KEYS.items()
+        ),
+        summary_chars=COMPACT_SUMMARY_MAX_CHARS,
+        note_chars=COMPACT_NOTE_MAX_CHARS,
+        max_skills=COMPACT_MAX_SKILLS,
+        max_issues=COMPACT_MAX_ISSUES,
+    )
+
+
+def _replace_once(prompt: str, old: str, new: str) -> str:
+    if old not in prompt:
+        raise ValueError(f"Resume analysis prompt no longer contains: {old[:60]!r}")
+    return prompt.replace(old, new, 1)
+
+
+@lru_cache(maxsize=16)
+def build_resume_analysis_system_prompt(
+    contact_keys: tuple[str, ...] = CONTACT_KEYS, output_schema: str = "full"
+) -> str:
+    """RESUME_ANALYSIS_SYSTEM_PROMPT asking only for the given contact keys.
+
+    Contact fields already extracted from the resume at upload are dropped
+    from the instructions, the schema and the example, so the model does
+    not spend output tokens on them. output_schema="compact" swaps the
+    expected output for the short-key schema (see COMPACT_OUTPUT_SECTION).
+    """
+
+    requested = [key for key in CONTACT_KEYS if key in contact_keys]
+    prompt = _tailor_contact_keys(requested)
+    if output_schema == "compact":
+        start = prompt.index(_EXPECTED_OUTPUT_HEADING)
+        prompt = prompt[:start] + _compact_output_section(requested)
+    return prompt
+
+
+def _tailor_contact_keys(requested: list[str]) -> str:
+    if len(requested) == len(CONTACT_KEYS):
+        return RESUME_ANALYSIS_SYSTEM_PROMPT
+
+    prompt = RESUME_ANALYSIS_SYSTEM_PROMPT
+    role_line = (
+        "    - Extract **candidate contact details** when they are explicitly present in the resume: "
+        "full name, email, and phone number.\n"
+    )
+    handling_line = (
+        "        - You may extract **candidate_name**, **candidate_email**, and **candidate_phone** "
+        "into their **own top-level keys** in the JSON when they appear in the resume.\n"
+    )
+    anti_pattern_line = (
+        "    - Do not add keys outside the required JSON schema **except** the explicitly required "
+        "contact keys: `candidate_name`, `candidate_email`, `candidate_phone`.\n"
+    )
+
+    if requested:
+        labels = ", ".join(_CONTACT_KEY_LABELS[key] for key in requested)
+        keys_bold = ", ".join(f"**{key}**" for key in requested)
+        keys_code = ", ".join(f"`{key}`" for key in requested)
+        prompt = _replace_once(
+            prompt,
+            role_line,
+            "    - Extract the following **candidate contact details** when they are explicitly present "
+            f"in the resume: {labels}.\n",
+        )
+        prompt = _replace_once(
+            prompt,
+            handling_line,
+            f"        - You may extract {keys_bold} into their **own top-level keys** in the JSON when they "
+            "appear in the resume. Other contact details are already known; do not output them.\n",
+        )
+        prompt = _replace_once(
+            prompt,
+            anti_pattern_line,
+            "    - Do not add keys outside the required JSON schema **except** the explicitly required "
+            f"contact keys: {keys_code}.\n",
+        )
+    else:
+        prompt = _replace_once(prompt, role_line, "")
+        prompt = _replace_once(
+            prompt,
+            handling_line,
+            "        - Candidate contact details are already known; do **NOT** output `candidate_name`, "
+            "`candidate_email` or `candidate_phone`.\n",
+        )
+        prompt = _replace_once(
+            prompt,
+            anti_pattern_line,
+            "    - Do not add keys outside the required JSON schema.\n",
+        )
+        prompt = _replace_once(
+            prompt,
+            "        - If a contact field is missing or unclear in the resume, set the corresponding key to `null`.\n",
+            "",
+        )
+
+    for key in CONTACT_KEYS:
+        if key in requested:
+            continue
+        schema_line = next(
+            line for line in prompt.splitlines(keepends=True) if line.startswith(f'        - "{key}" (string or null')
+        )
+        prompt = _replace_once(prompt, schema_line, "")
+        prompt = _replace_once(prompt, _CONTACT_EXAMPLE_VALUES[key], "")
+
+    return prompt
+
+
+def build_contact_keys_note(
+    contact_keys: tuple[str, ...] = CONTACT_KEYS, output_schema: str = "full"
+) -> str | None:
+    """Per-resume contact-key instruction for the prefix-cache prompt layout.
+
+    That layout keeps the system prompt with all contact keys for every
+    resume (so it stays a cacheable prefix) and appends this note after the
+    resume instead; None when all contact keys are requested.
+    """
+
+    names = COMPACT_CONTACT_KEYS if output_schema == "compact" else {key: key for key in CONTACT_KEYS}
+    requested = [key for key in CONTACT_KEYS if key in contact_keys]
+    if len(requested) == len(CONTACT_KEYS):
+        return None
+    if not requested:
+        all_keys = [f"`{names[key]}`" for key in CONTACT_KEYS]
+        return (
+            "CONTACT KEYS: candidate contact details are already known; do NOT output "
+            f"{', '.join(all_keys[:-1])} or {all_keys[-1]}."
+        )
+    keys_code = ", ".join(f"`{names[key]}`" for key in requested)
+    return (
+        f"CONTACT KEYS: output only {keys_code} among the contact keys; "
+        "the other contact details are already known."
+    )
+
+
+# Parallel per-dimension analysis (agent.build_dimension_fanout_agent): each
+# group of dimensions is assessed by its own focused call, an overview call
+# writes the summary, skills, issues and contact keys, and match_score is
+# computed from the dimension scores.
+DIMENSION_GROUPS = {
+    "core_fit": ("tech_stack_match", "relevant_experience", "responsibilities_impact"),
+    "level_fit": ("seniority_fit", "domain_fit", "red_flags_gaps"),
+    "depth_trajectory": ("project_complexity", "consistency_trajectory"),
+    "communication": ("communication_clarity", "soft_skills_professionalism"),
+}
+
+_DIMENSION_HEADING_RE = re.compile(r"\n(?= {3,4}\d{1,2}\. \*\*)")
+
+
+def _prompt_section(prompt: str, heading: str) -> str:
+    """The `### heading` section of a prompt, up to the next section."""
+
+    start = prompt.index(f"### {heading}")
+    end = prompt.find("\n### ", start)
+    return prompt[start:end if end != -1 else None].rstrip() + "\n"
+
+
+def _dimension_definitions() -> dict[str, str]:
+    """Dimension key -> its numbered definition in RESUME_ANALYSIS_SYSTEM_PROMPT."""
+
+    section = _prompt_section(RESUME_ANALYSIS_SYSTEM_PROMPT, "Core Evaluation Dimensions")
+    blocks = _DIMENSION_HEADING_RE.split(section)[1:]
+    return dict(zip(COMPACT_DIMENSION_KEYS, (block.rstrip() for block in blocks)))
+
+
+DIMENSION_GROUP_PROMPT = """### Role
+    You are a **Senior Technical Recruiter and Hiring Manager** specializing in software engineering roles.
+    You evaluate a single candidate resume **strictly against a single Job Description (JD)** on the {count} evaluation dimensions below only.
+    The other dimensions, the summary and the overall score are assessed separately; do not output them.
+
+{hard_constraints}
+### Dimensions
+    For each dimension, assign a **0–10 score** and a short explanatory **note** based only on explicit evidence:
+
+{definitions}
+
+{scoring}
+### Expected Output (JSON, single line, no newlines)
+    - You MUST output exactly one valid JSON object on a **single line**, with no markdown, comments, or extra text.
+    - The object has exactly one key, "dimensions", whose object has exactly these keys, each with a `score` (0–10) and a `note` (string explaining why this score was given, based on evidence): {keys}
+    - Do not mention personal data (emails, phone, address) in any note.
+    - Example shape: {{"dimensions": {{{example}}}}}
+"""
+
+DIMENSION_OVERVIEW_PROMPT = """### Role
+    You are a **Senior Technical Recruiter and Hiring Manager** specializing in software engineering roles.
+    You review a single candidate resume **strictly against a single Job Description (JD)** and write the overview of the assessment: {parts}.
+    Per-dimension scores and the overall score are assessed separately; do not output them.
+
+{hard_constraints}
+{instructions}
+### Expected Output (JSON, single line, no newlines)
+    - You MUST output exactly one valid JSON object on a **single line**, with no markdown, comments, or extra text.
+    - Top-level keys (and only these keys) are required:
+{contact_lines}        - "summary" (string; short natural-language summary of the candidate vs JD)
+        - "skills" (array of strings; key relevant skills for this JD)
+        - "issues" (array of strings; main gaps, risks, or concerns vs JD)
+"""
+
+
+@lru_cache(maxsize=8)
+def build_dimension_group_prompt(group: str) -> str:
+    """System prompt assessing only the dimensions of DIMENSION_GROUPS[group]."""
+
+    keys = DIMENSION_GROUPS[group]
+    definitions = _dimension_definitions()
+    return DIMENSION_GROUP_PROMPT.format(
+        count=len(keys),
+        hard_constraints=_prompt_section(RESUME_ANALYSIS_SYSTEM_PROMPT, "Hard Constraints"),
+        definitions="\n\n".join(definitions[key] for key in keys),
+        scoring=_prompt_section(RESUME_ANALYSIS_SYSTEM_PROMPT, "Per-Dimension Scoring"),
+        keys=", ".join(f'"{key}"' for key in keys),
+        example=", ".join(f'"{key}": {{"score": 7, "note": "..."}}' for key in keys),
+    )
+
+
+@lru_cache(maxsize=16)
+def build_dimension_overview_prompt(contact_keys: tuple[str, ...] = CONTACT_KEYS) -> str:
+    """System prompt for the summary, skills, issues and the given contact keys."""
+
+    requested = [key for key in CONTACT_KEYS if key in contact_keys]
+    tailored = _tailor_contact_keys(requested)
+    instructions = _replace_once(
+        _prompt_section(tailored, "Instructions"),
+        "reflect this in both the `match_score` and the `issues`",
+        "reflect this in the `issues`",
+    )
+    contact_lines = "".join(
+        line
+        for line in tailored.splitlines(keepends=True)
+        if any(line.startswith(f'        - "{key}" (string or null') for key in requested)
+    )
+    return DIMENSION_OVERVIEW_PROMPT.format(
+        parts=(
+            "a summary, the relevant skills, the main issues and the candidate contact details"
+            if requested
+            else "a summary, the relevant skills and the main issues"
+        ),
+        hard_constraints=_prompt_section(RESUME_ANALYSIS_SYSTEM_PROMPT, "Hard Constraints"),
+        instructions=instructions,
+        contact_lines=contact_lines,
+    )
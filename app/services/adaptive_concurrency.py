@@ -0,0 +1,129 @@
+"""Adaptive (AIMD) limit on the resume worker's concurrent LLM calls.
+
+While calls succeed with latency near its baseline and the error rate stays
+low, the limit grows additively (about +1 after `limit` successful calls).
+Rate limits, timeouts, latency spikes and a high error rate cut it
+multiplicatively. The limit always stays within [min_limit, max_limit].
+
+A congestion episode cuts the limit only once: failures of calls that
+started before the last cut are ignored. The state lives for the process,
+so the limit carries over from one worker batch to the next.
+"""
+
+import logging
+import math
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import WORKER_CONCURRENCY_DECISIONS, WORKER_CONCURRENCY_LIMIT
+
+
+logger = logging.getLogger(__name__)
+
+# Error types (see classify_llm_error) that signal an overloaded provider
+CONGESTION_ERROR_TYPES = frozenset({"rate_limit", "timeout"})
+# Latency samples needed before spikes are detected
+MIN_LATENCY_SAMPLES = 5
+
+_LATENCY_ALPHA = 0.1
+_ERROR_RATE_ALPHA = 0.1
+
+
+class AdaptiveConcurrencyController:
+    def __init__(
+        self,
+        *,
+        min_limit: int,
+        max_limit: int,
+        backoff_factor: float = 0.5,
+        latency_spike_factor: float = 2.0,
+        error_rate_threshold: float = 0.2,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.backoff_factor = min(max(backoff_factor, 0.1), 0.9)
+        self.latency_spike_factor = latency_spike_factor
+        self.error_rate_threshold = error_rate_threshold
+        self._limit = float(self.min_limit)
+        self._latency: dict[str, tuple[float, int]] = {}  # kind -> (EWMA seconds, samples)
+        self._error_rate = 0.0
+        self._last_decrease_at = float("-inf")
+        self._lock = threading.Lock()
+        WORKER_CONCURRENCY_LIMIT.set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        """Current number of LLM calls allowed in flight."""
+
+        return int(math.floor(self._limit))
+
+    @property
+    def error_rate(self) -> float:
+        return self._error_rate
+
+    def record_success(self, latency: float, started_at: float, kind: str = "llm") -> None:
+        """Feed back a successful call; `started_at` is its time.monotonic() start."""
+
+        with self._lock:
+            self._error_rate *= 1 - _ERROR_RATE_ALPHA
+            baseline, samples = self._latency.get(kind, (latency, 0))
+            self._latency[kind] = (baseline + _LATENCY_ALPHA * (latency - baseline), samples + 1)
+
+            if samples >= MIN_LATENCY_SAMPLES and latency > self.latency_spike_factor * baseline:
+                self._decrease(
+                    f"latency_spike ({kind} {latency:.1f}s vs baseline {baseline:.1f}s)", started_at
+                )
+            elif self._error_rate <= self.error_rate_threshold:
+                self._increase()
+
+    def record_failure(self, error_type: str, started_at: float) -> None:
+        """Feed back a failed call, classified by classify_llm_error."""
+
+        with self._lock:
+            self._error_rate += _ERROR_RATE_ALPHA * (1 - self._error_rate)
+            if error_type in CONGESTION_ERROR_TYPES:
+                self._decrease(error_type, started_at)
+            elif self._error_rate > self.error_rate_threshold:
+                self._decrease(f"error_rate ({self._error_rate:.0%})", started_at)
+
+    def _increase(self) -> None:
+        if self._limit >= self.max_limit:
+            return
+        before = self.limit
+        self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+        if self.limit != before:
+            WORKER_CONCURRENCY_DECISIONS.labels(decision="increase").inc()
+            WORKER_CONCURRENCY_LIMIT.set(self.limit)
+            logger.info("Resume worker concurrency %d -> %d (healthy)", before, self.limit)
+
+    def _decrease(self, reason: str, started_at: float) -> None:
+        # Calls started before the last cut saw the old limit; do not cut again for them
+        if started_at < self._last_decrease_at or self._limit <= self.min_limit:
+            return
+        self._last_decrease_at = time.monotonic()
+        before = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_factor)
+        WORKER_CONCURRENCY_DECISIONS.labels(decision="decrease").inc()
+        WORKER_CONCURRENCY_LIMIT.set(self.limit)
+        logger.warning("Resume worker concurrency %d -> %d (%s)", before, self.limit, reason)
+
+
+_controller: AdaptiveConcurrencyController | None = None
+_controller_lock = threading.Lock()
+
+
+def get_concurrency_controller() -> AdaptiveConcurrencyController:
+    """Process-wide controller, built from settings on first use."""
+
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdaptiveConcurrencyController(
+                min_limit=settings.resume_process_min_parallel,
+                max_limit=settings.resume_process_max_parallel,
+                backoff_factor=settings.resume_process_backoff_factor,
+                latency_spike_factor=settings.resume_process_latency_spike_factor,
+                error_rate_threshold=settings.resume_process_error_rate_threshold,
+            )
+        return _controller
@@ -0,0 +1,112 @@
+"""Checkpoint of a resume analysis between the LLM call and the stored analysis.
+
+The analysis reply is the one costly step of processing a resume. As soon as
+it arrives it is committed to `resume_analysis_checkpoint`, together with the
+usage of the calls that produced it (not yet in llm_usage_log) and the
+cascade columns of the analysis row, before it is parsed. The checkpoint
+records the last completed step:
+
+- invoked: the reply is stored; validation, parsing and persisting follow.
+- invalid: the reply failed validation (and repair); the resume is in error.
+
+When a run of the resume is interrupted before its analysis row is
+committed, the next run continues from the stored reply instead of calling
+the LLM again, so a worker crash costs no new analysis call. The checkpoint
+is deleted in the transaction that stores the analysis row. An invalid reply
+is kept, for inspection or for reparse_analyses.py after a parser fix,
+until the next worker run of the resume makes a new call and overwrites it.
+
+A checkpoint applies only to the prompt it answered: its hash covers the
+analysis messages and mode, so a changed JD, resume or prompt setting starts
+over with a new call.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+
+from langchain_core.messages import BaseMessage
+from sqlalchemy.orm import Session
+
+from app.models.resume import ResumeAnalysisCheckpoint
+
+
+def analysis_prompt_hash(messages: list[BaseMessage], analysis_mode: str) -> str:
+    payload = json.dumps(
+        [analysis_mode, [[message.type, str(message.content)] for message in messages]], ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_analysis_checkpoint(
+    db: Session, *, resume_id: int, jd_id: int, prompt_hash: str
+) -> ResumeAnalysisCheckpoint | None:
+    """The resume's checkpoint to continue from: stage invoked, for this JD and prompt.
+
+    A checkpoint for another JD or prompt is deleted.
+    """
+
+    checkpoint = db.get(ResumeAnalysisCheckpoint, resume_id)
+    if checkpoint is None:
+        return None
+    if checkpoint.jd_id != jd_id or checkpoint.prompt_hash != prompt_hash:
+        db.delete(checkpoint)
+        return None
+    return checkpoint if checkpoint.stage == "invoked" else None
+
+
+def save_analysis_checkpoint(
+    db: Session,
+    *,
+    resume_id: int,
+    jd_id: int,
+    prompt_hash: str,
+    raw: str,
+    pending_calls: list[dict],
+    cascade_fields: dict,
+    cascade_usage: dict | None,
+) -> ResumeAnalysisCheckpoint:
+    """Store the reply at stage `invoked` (caller commits)."""
+
+    checkpoint = db.get(ResumeAnalysisCheckpoint, resume_id) or ResumeAnalysisCheckpoint(resume_id=resume_id)
+    checkpoint.jd_id = jd_id
+    checkpoint.prompt_hash = prompt_hash
+    checkpoint.stage = "invoked"
+    checkpoint.raw_response = raw
+    checkpoint.pending_usage_json = json.dumps(pending_calls) if pending_calls else None
+    checkpoint.cascade_json = (
+        json.dumps({"fields": cascade_fields, "usage": cascade_usage}) if cascade_fields else None
+    )
+    checkpoint.updated_at = datetime.utcnow()
+    db.add(checkpoint)
+    return checkpoint
+
+
+def checkpoint_pending_calls(checkpoint: ResumeAnalysisCheckpoint) -> list[dict]:
+    """Usage entries (LLMUsageRecorder.calls) of the stored reply not logged yet."""
+
+    return json.loads(checkpoint.pending_usage_json) if checkpoint.pending_usage_json else []
+
+
+def checkpoint_cascade(checkpoint: ResumeAnalysisCheckpoint) -> tuple[dict, dict | None]:
+    """(cascade columns, cascade tier usage) stored with the reply."""
+
+    if not checkpoint.cascade_json:
+        return {}, None
+    cascade = json.loads(checkpoint.cascade_json)
+    return cascade["fields"], cascade["usage"]
+
+
+def mark_checkpoint_invalid(db: Session, checkpoint: ResumeAnalysisCheckpoint) -> None:
+    """The reply failed validation and its usage is logged (caller commits)."""
+
+    checkpoint.stage = "invalid"
+    checkpoint.pending_usage_json = None
+    checkpoint.updated_at = datetime.utcnow()
+    db.add(checkpoint)
+
+
+def delete_analysis_checkpoint(db: Session, resume_id: int) -> None:
+    """Drop the resume's checkpoint, if any (caller commits)."""
+
+    db.query(ResumeAnalysisCheckpoint).filter(ResumeAnalysisCheckpoint.resume_id == resume_id).delete()
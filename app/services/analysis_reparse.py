@@ -0,0 +1,195 @@
+"""Re-derive stored analysis columns from `analysis_json`, without LLM calls.
+
+match_score, summary, issues and the per-dimension columns of
+`resume_analysis_details` are extracted from the validated analysis JSON
+when a resume is processed. After a parser change (schema coercion,
+`analysis_columns`), `reparse_analyses` runs the current parser over the
+stored JSON and updates the rows whose columns come out different:
+
+- rows are read in chunks of `chunk_size` by analysis_id (keyset
+  pagination), selecting only the id, the JSON and the derived columns;
+- changed rows are written with one bulk UPDATE per chunk, each chunk in
+  its own transaction;
+- resumes with a changed summary or issues get their search document
+  refreshed from their latest analysis.
+
+Rows stored before replies were validated hold an unparseable reply
+wrapped as `{"raw": "<reply>"}`; the wrapped reply is parsed instead and,
+when it validates, replaces the wrapper in `analysis_json`.
+
+Replies kept as `invalid` in `resume_analysis_checkpoint` that the current
+parser accepts are set back to `invoked`, so the worker's next run of the
+resume stores them instead of making a new call.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.agents.structured_output import DIMENSION_KEYS, AnalysisOutputError, parse_resume_analysis
+from app.models.resume import Resume, ResumeAnalysis, ResumeAnalysisCheckpoint
+from app.services.resume_processing_service import analysis_columns
+from app.services.search_index import index_resume_analysis
+
+
+logger = logging.getLogger(__name__)
+
+DERIVED_COLUMNS = (
+    "match_score",
+    "summary",
+    "issues",
+    *(f"{key}_{suffix}" for key in DIMENSION_KEYS for suffix in ("score", "note")),
+)
+
+
+@dataclass
+class ReparseReport:
+    scanned: int = 0
+    changed: int = 0
+    invalid: int = 0  # stored JSON the current parser rejects; left unchanged
+    checkpoints_recovered: int = 0
+    changed_columns: dict[str, int] = field(default_factory=dict)
+    changed_ids: list[int] = field(default_factory=list)  # first `sample` changed analysis_ids
+
+
+def _stored_reply(analysis_json: str | None) -> tuple[str, bool]:
+    """(reply text, whether it was unwrapped from a legacy {"raw": ...} row)."""
+
+    text = analysis_json or ""
+    if text.lstrip().startswith('{"raw"'):
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return text, False
+        if isinstance(value, dict) and set(value) == {"raw"} and isinstance(value["raw"], str):
+            return value["raw"], True
+    return text, False
+
+
+def _reparse_row(analysis_json: str | None) -> tuple[dict, str | None] | None:
+    """Derived columns of a stored analysis, and its new analysis_json for a legacy row.
+
+    None when the current parser rejects the stored reply.
+    """
+
+    reply, unwrapped = _stored_reply(analysis_json)
+    try:
+        output = parse_resume_analysis(reply)
+    except AnalysisOutputError:
+        return None
+    parsed = output.model_dump(exclude_unset=True)
+    return analysis_columns(parsed), json.dumps(parsed) if unwrapped else None
+
+
+def _reindex_resumes(db: Session, resume_ids: set[int]) -> None:
+    """Refresh the search document of resumes from their latest analysis."""
+
+    for resume_id in sorted(resume_ids):
+        resume = db.get(Resume, resume_id)
+        if resume is None:
+            continue
+        analysis = (
+            db.query(ResumeAnalysis)
+            .filter(ResumeAnalysis.resume_id == resume_id)
+            .order_by(ResumeAnalysis.analysis_id.desc())
+            .first()
+        )
+        index_resume_analysis(db, resume=resume, analysis=analysis)
+
+
+def reparse_analyses(
+    db: Session,
+    *,
+    chunk_size: int = 1000,
+    jd_id: int | None = None,
+    dry_run: bool = False,
+    sample: int = 20,
+) -> ReparseReport:
+    """Re-derive the analysis columns of every stored analysis (of one JD, if given).
+
+    With dry_run nothing is written; the report counts what would change.
+    """
+
+    report = ReparseReport()
+    columns = [getattr(ResumeAnalysis, name) for name in DERIVED_COLUMNS]
+    last_id = 0
+    while True:
+        query = select(ResumeAnalysis.analysis_id, ResumeAnalysis.resume_id, ResumeAnalysis.analysis_json, *columns)
+        if jd_id is not None:
+            query = query.where(ResumeAnalysis.jd_id == jd_id)
+        rows = db.execute(
+            query.where(ResumeAnalysis.analysis_id > last_id).order_by(ResumeAnalysis.analysis_id).limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].analysis_id
+
+        updates = []
+        unwrapped_updates = []
+        reindex: set[int] = set()
+        for row in rows:
+            report.scanned += 1
+            result = _reparse_row(row.analysis_json)
+            if result is None:
+                report.invalid += 1
+                continue
+            derived, analysis_json = result
+            changed = [name for name in DERIVED_COLUMNS if derived[name] != getattr(row, name)]
+            if analysis_json is not None:
+                changed.append("analysis_json")
+            if not changed:
+                continue
+            report.changed += 1
+            if len(report.changed_ids) < sample:
+                report.changed_ids.append(row.analysis_id)
+            for name in changed:
+                report.changed_columns[name] = report.changed_columns.get(name, 0) + 1
+            if "summary" in changed or "issues" in changed:
+                reindex.add(row.resume_id)
+            if analysis_json is None:
+                updates.append({"analysis_id": row.analysis_id, **derived})
+            else:
+                unwrapped_updates.append({"analysis_id": row.analysis_id, **derived, "analysis_json": analysis_json})
+
+        if (updates or unwrapped_updates) and not dry_run:
+            # ORM bulk UPDATE by primary key: one executemany per chunk (and per column set)
+            for batch in (updates, unwrapped_updates):
+                if batch:
+                    db.execute(update(ResumeAnalysis), batch)
+            _reindex_resumes(db, reindex)
+            db.commit()
+        else:
+            # End the read transaction, so the worker is not held up between chunks
+            db.rollback()
+        logger.info("Reparsed analyses up to analysis_id=%s: %d changed so far", last_id, report.changed)
+
+    report.checkpoints_recovered = _recover_invalid_checkpoints(db, jd_id=jd_id, dry_run=dry_run)
+    return report
+
+
+def _recover_invalid_checkpoints(db: Session, *, jd_id: int | None, dry_run: bool) -> int:
+    """Set invalid checkpoints the current parser accepts back to `invoked`."""
+
+    query = db.query(ResumeAnalysisCheckpoint).filter(ResumeAnalysisCheckpoint.stage == "invalid")
+    if jd_id is not None:
+        query = query.filter(ResumeAnalysisCheckpoint.jd_id == jd_id)
+
+    recovered = 0
+    for checkpoint in query.all():
+        try:
+            parse_resume_analysis(checkpoint.raw_response)
+        except AnalysisOutputError:
+            continue
+        recovered += 1
+        if not dry_run:
+            checkpoint.stage = "invoked"
+            checkpoint.updated_at = datetime.utcnow()
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return recovered
@@ -0,0 +1,156 @@
+"""Deterministic candidate contact extraction (name, email, E.164 phone).
+
+Runs at upload so the contact columns are filled without an LLM; the
+analysis prompt then only asks the model for the fields this could not find.
+"""
+
+import re
+
+from app.core.config import settings
+from app.services.skill_taxonomy import SKILL_TAXONOMY
+
+
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9\-]+(?:\.[A-Za-z0-9\-]+)*\.[A-Za-z]{2,}")
+# Separators within a number stay on one line: a phone never spans a line break
+_PHONE_CANDIDATE_RE = re.compile(r"(?<![\w+])(?:\+|00)?\d[\d \t().\-/]{6,}\d(?!\w)")
+_YEAR_RANGE_RE = re.compile(r"(?:19|20)\d{2}\s*[-–/]\s*(?:19|20)\d{2}")
+_NAME_LABEL_RE = re.compile(r"^\s*(?:full\s+)?name\s*[:\-]\s*(.+)$", re.IGNORECASE)
+_LINE_SEPARATORS_RE = re.compile(r"\s*(?:\||•|·|,|–|—|\t)\s*")
+
+# Header lines that look like names but are not
+_NON_NAME_WORDS = frozenset(
+    """
+    resume curriculum vitae cv profile summary objective contact details information
+    experience education skills projects certifications references personal professional
+    engineer developer manager senior junior lead principal staff architect analyst
+    consultant intern software data backend frontend full stack devops cloud scientist
+    designer administrator specialist director head officer associate technical
+    """.split()
+)
+# Words of company and school names ("Acme Corp", "Stanford University")
+_ORGANIZATION_WORDS = frozenset(
+    """
+    corp corporation inc incorporated ltd limited llc llp plc gmbh co company group holdings
+    technologies technology solutions systems services labs consulting partners ventures
+    bank university college institute school academy foundation
+    """.split()
+)
+# One-word skill names and aliases ("Python Java Go" is a skills line, not a name)
+_SKILL_WORDS = frozenset(
+    term.lower()
+    for skills in SKILL_TAXONOMY.values()
+    for canonical, aliases in skills.items()
+    for term in (canonical, *aliases)
+    if " " not in term
+)
+
+
+def extract_email(text: str) -> str | None:
+    match = _EMAIL_RE.search(text or "")
+    return match.group(0).lower() if match else None
+
+
+def normalize_phone(raw: str, default_country_code: str | None = None) -> str | None:
+    """E.164 form (+<country><number>) of a phone number, or None if implausible.
+
+    Numbers without an international prefix get the default country code
+    ("415-555-2671" -> +14155552671 with country code 1). A number written
+    with a national trunk 0 ("020 7946 0958") and no country code is None:
+    its country cannot be told, and the default code would make it wrong.
+    """
+
+    if default_country_code is None:
+        default_country_code = settings.contact_default_country_code
+    country_code = default_country_code.lstrip("+")
+    stripped = raw.strip()
+    digits = re.sub(r"\D", "", stripped)
+
+    if stripped.startswith("+"):
+        number = digits
+    elif stripped.startswith("00"):
+        number = digits[2:]
+    elif country_code and len(digits) == 10 + len(country_code) and digits.startswith(country_code):
+        number = digits
+    elif digits.startswith("0"):
+        return None
+    elif country_code and len(digits) == 10:
+        number = country_code + digits
+    else:
+        return None
+
+    if not 8 <= len(number) <= 15 or number.startswith("0"):
+        return None
+    return f"+{number}"
+
+
+def extract_phone(text: str) -> str | None:
+    for match in _PHONE_CANDIDATE_RE.finditer(text or ""):
+        # A date range run into the number ("415.555.2671 2018-2020") is cut off
+        for part in _YEAR_RANGE_RE.split(match.group(0)):
+            phone = normalize_phone(part)
+            if phone:
+                return phone
+    return None
+
+
+def _is_name_token(token: str) -> bool:
+    """Capitalized word, letters only apart from ' - and a trailing initial dot."""
+
+    letters = re.sub(r"['’\-]", "", token.removesuffix("."))
+    return bool(letters) and letters.isalpha() and token[0].isupper()
+
+
+def _name_from_segment(segment: str) -> str | None:
+    tokens = segment.split()
+    if not 2 <= len(tokens) <= 4:
+        return None
+    words = [token.lower().strip(".") for token in tokens]
+    if any(word in _NON_NAME_WORDS or word in _ORGANIZATION_WORDS for word in words):
+        return None
+    if sum(word in _SKILL_WORDS for word in words) > 1:
+        return None
+    if not all(_is_name_token(token) for token in tokens):
+        return None
+    if all(token.isupper() for token in tokens):
+        tokens = [token.title() for token in tokens]
+    return " ".join(tokens)
+
+
+def extract_name(text: str, max_lines: int = 8) -> str | None:
+    """Candidate name from the resume header.
+
+    Takes an explicit "Name: ..." line, else the first of the top non-empty
+    lines whose leading segment (before |, comma, bullet...) is 2-4
+    capitalized words without digits, emails, URLs, heading/job-title words,
+    company words or several skill names. When no line qualifies the name
+    is left to the LLM.
+    """
+
+    lines = [line.strip() for line in (text or "").splitlines() if line.strip()][:max_lines]
+    for line in lines:
+        labelled = _NAME_LABEL_RE.match(line)
+        if labelled:
+            name = _name_from_segment(_LINE_SEPARATORS_RE.split(labelled.group(1))[0])
+            if name:
+                return name
+
+    for line in lines:
+        segment = _LINE_SEPARATORS_RE.split(line)[0]
+        if "@" in segment or "http" in segment.lower() or "www." in segment.lower():
+            continue
+        if any(char.isdigit() for char in segment):
+            continue
+        name = _name_from_segment(segment)
+        if name:
+            return name
+    return None
+
+
+def extract_contact(text: str) -> dict[str, str | None]:
+    """{"candidate_name", "candidate_email", "candidate_phone"}; None where not found."""
+
+    return {
+        "candidate_name": extract_name(text),
+        "candidate_email": extract_email(text),
+        "candidate_phone": extract_phone(text),
+    }
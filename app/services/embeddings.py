@@ -0,0 +1,48 @@
+import hashlib
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.lexical_screening import tokenize
+
+
+def _features(text: str) -> list[str]:
+    """Word unigrams and bigrams plus character trigrams of each word.
+
+    Trigrams make spelling variants ("postgres" / "postgresql", "k8s" aside)
+    land near each other; bigrams keep some phrase information.
+    """
+
+    tokens = tokenize(text)
+    features = list(tokens)
+    features.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    for token in tokens:
+        padded = f"<{token}>"
+        features.extend(f"#{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return features
+
+
+def embed_text(text: str, dim: int | None = None) -> np.ndarray:
+    """L2-normalized float32 hashed n-gram embedding (signed hashing trick).
+
+    Deterministic across processes (blake2b, not Python's salted hash) so
+    vectors written by one process can be queried from another.
+    """
+
+    dim = dim or settings.embedding_dim
+    counts: dict[tuple[int, float], float] = {}
+    for feature in _features(text):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        key = (value % dim, 1.0 if (value >> 63) & 1 else -1.0)
+        counts[key] = counts.get(key, 0.0) + 1.0
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for (index, sign), count in counts.items():
+        # sublinear tf so long resumes are not dominated by repeated words
+        vector[index] += sign * (1.0 + np.log(count))
+
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector
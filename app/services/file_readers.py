@@ -1,6 +1,19 @@
 import os
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 
+from app.core.config import settings
+from app.core.metrics import FILE_EXTRACT_DURATION, record_cache_lookup
+from app.core.tracing import tracer
+
+
+# Extracted text keyed by (absolute path, mtime, size). The JD file is read once
+# per resume in a batch; caching avoids re-parsing the same PDF/DOCX each time.
+_TEXT_CACHE: "OrderedDict[tuple[str, int, int], str]" = OrderedDict()
+_TEXT_CACHE_LOCK = threading.Lock()
+
 
 def _read_txt(path: str) -> str:
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
@@ -19,7 +32,8 @@ def _read_pdf(path: str) -> str:
         for page in reader.pages:
             page_text = page.extract_text() or ""
             text_parts.append(page_text)
-    return "\n".join(text_parts)
+    # Form feed between pages, so page headers/footers can be told apart (prompt_compaction)
+    return "\f".join(text_parts)
 
 
 def _read_docx(path: str) -> str:
@@ -50,15 +64,7 @@ def _read_doc(path: str) -> str:
         return content.decode(errors="ignore")
 
 
-def read_file_to_text(path: str) -> str:
-    """Read a JD or resume file (txt, pdf, doc, docx) into plain text.
-
-    Raises RuntimeError for unsupported extensions or missing parser libs.
-    """
-
-    _, ext = os.path.splitext(path)
-    ext = (ext or "").lower().lstrip(".")
-
+def _extract_text(path: str, ext: str) -> str:
     if ext == "txt":
         return _read_txt(path)
     if ext == "pdf":
@@ -69,3 +75,44 @@ def read_file_to_text(path: str) -> str:
         return _read_doc(path)
 
     raise RuntimeError(f"Unsupported file extension for text extraction: .{ext}")
+
+
+def read_file_to_text(path: str) -> str:
+    """Read a JD or resume file (txt, pdf, doc, docx) into plain text.
+
+    Results are cached per (path, mtime, size), so a modified file is re-read.
+    Raises RuntimeError for unsupported extensions or missing parser libs.
+    """
+
+    _, ext = os.path.splitext(path)
+    ext = (ext or "").lower().lstrip(".")
+
+    with tracer.start_as_current_span("file.read_text") as span:
+        span.set_attribute("file.extension", ext)
+
+        stat = os.stat(path)
+        cache_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        max_entries = settings.file_text_cache_size
+
+        if max_entries > 0:
+            with _TEXT_CACHE_LOCK:
+                cached = _TEXT_CACHE.get(cache_key)
+                if cached is not None:
+                    _TEXT_CACHE.move_to_end(cache_key)
+            record_cache_lookup("file_text", cached is not None)
+            span.set_attribute("cache.hit", cached is not None)
+            if cached is not None:
+                return cached
+
+        start = time.perf_counter()
+        text = _extract_text(path, ext)
+        FILE_EXTRACT_DURATION.labels(extension=ext).observe(time.perf_counter() - start)
+        span.set_attribute("file.text_chars", len(text))
+
+        if max_entries > 0:
+            with _TEXT_CACHE_LOCK:
+                _TEXT_CACHE[cache_key] = text
+                while len(_TEXT_CACHE) > max_entries:
+                    _TEXT_CACHE.popitem(last=False)
+
+        return text
@@ -0,0 +1,122 @@
+"""Compact requirement profile of a JD, reused by every resume analysis of it.
+
+The profile (must-have and nice-to-have skills, seniority, domain,
+responsibilities) is distilled from the JD text by one LLM call and stored on
+`job_description_details` with a hash of that text. Resume prompts then carry
+the rendered profile instead of the JD (RESUME_PROMPT_JD_MODE=profile); when
+the JD file changes, the hash no longer matches and the profile is rebuilt.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from app.agents.structured_output import AnalysisOutputError, load_json_object
+from app.core.config import settings
+from app.models.job_description import JobDescription
+from app.prompts.jd_analyze_prompt import JD_PROFILE_SYSTEM_PROMPT
+from app.services.prompt_compaction import CompactedText, compact_jd, count_tokens
+
+
+class JDRequirementProfile(BaseModel):
+    """Schema of the object requested by JD_PROFILE_SYSTEM_PROMPT."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    title: str | None = None
+    summary: str | None = None
+    must_have_skills: list[str] = Field(default_factory=list)
+    nice_to_have_skills: list[str] = Field(default_factory=list)
+    seniority: str | None = None
+    min_years_experience: float | None = None
+    domain: str | None = None
+    responsibilities: list[str] = Field(default_factory=list)
+    other_requirements: list[str] = Field(default_factory=list)
+
+
+def jd_content_hash(jd_text: str) -> str:
+    """Hash of the JD text, insensitive to whitespace changes of re-extraction."""
+
+    return hashlib.sha256(" ".join((jd_text or "").split()).encode("utf-8")).hexdigest()
+
+
+def build_jd_profile_messages(jd_text: str) -> list[BaseMessage]:
+    return [SystemMessage(content=JD_PROFILE_SYSTEM_PROMPT), HumanMessage(content=jd_text)]
+
+
+def parse_jd_profile(raw: str) -> JDRequirementProfile:
+    """Decode and validate a profile reply; raises AnalysisOutputError."""
+
+    try:
+        profile = JDRequirementProfile.model_validate(load_json_object(raw))
+    except ValidationError as exc:
+        raise AnalysisOutputError([f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()]) from exc
+    if not profile.must_have_skills and not profile.responsibilities:
+        raise AnalysisOutputError(["profile lists neither must_have_skills nor responsibilities"])
+    return profile
+
+
+def stored_jd_profile(jd: JobDescription, jd_text: str) -> JDRequirementProfile | None:
+    """The JD's stored profile if it was built from this JD text."""
+
+    if not jd.requirement_profile_json or jd.requirement_profile_hash != jd_content_hash(jd_text):
+        return None
+    try:
+        return JDRequirementProfile.model_validate(json.loads(jd.requirement_profile_json))
+    except (ValueError, ValidationError):
+        return None
+
+
+def store_jd_profile(jd: JobDescription, jd_text: str, profile: JDRequirementProfile) -> None:
+    """Set the profile columns (caller commits); fills an empty title/summary too."""
+
+    now = datetime.utcnow()
+    jd.requirement_profile_json = profile.model_dump_json(exclude_none=True)
+    jd.requirement_profile_hash = jd_content_hash(jd_text)
+    jd.requirement_profile_built_at = now
+    if profile.title and not jd.title:
+        jd.title = profile.title
+    if profile.summary and not jd.parsed_summary:
+        jd.parsed_summary = profile.summary
+    jd.updated_at = now
+
+
+def render_jd_profile(profile: JDRequirementProfile) -> str:
+    """Plain-text block sent in place of the JD text."""
+
+    lines = []
+    if profile.title:
+        lines.append(f"Title: {profile.title}")
+    if profile.summary:
+        lines.append(f"Summary: {profile.summary}")
+    if profile.seniority:
+        lines.append(f"Seniority: {profile.seniority}")
+    if profile.min_years_experience is not None:
+        lines.append(f"Minimum experience: {profile.min_years_experience:g} years")
+    if profile.domain:
+        lines.append(f"Domain: {profile.domain}")
+    if profile.must_have_skills:
+        lines.append(f"Must-have skills: {', '.join(profile.must_have_skills)}")
+    if profile.nice_to_have_skills:
+        lines.append(f"Nice-to-have skills: {', '.join(profile.nice_to_have_skills)}")
+    for heading, items in (
+        ("Responsibilities", profile.responsibilities),
+        ("Other requirements", profile.other_requirements),
+    ):
+        if items:
+            lines.append(f"{heading}:")
+            lines.extend(f"- {item}" for item in items)
+    return "\n".join(lines)
+
+
+def jd_prompt_block(jd: JobDescription, jd_text: str) -> CompactedText:
+    """JD content for a resume prompt: the current profile, else the compacted JD text."""
+
+    profile = stored_jd_profile(jd, jd_text) if settings.resume_prompt_jd_mode == "profile" else None
+    if profile is None:
+        return compact_jd(jd_text)
+    text = render_jd_profile(profile)
+    return CompactedText(text=text, original_tokens=count_tokens(jd_text), tokens=count_tokens(text))
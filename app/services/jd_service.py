@@ -8,7 +8,12 @@ from fastapi import HTTPException, status
 
 from app.models.job_description import JobDescription
 from app.models.resume import Resume, ResumeAnalysis
-from app.models.api import JobUploadResponse, JobDetailsResponse, JobDeleteResponse
+from app.models.api import (
+    JobUploadResponse,
+    JobDetailsResponse,
+    JobDeleteResponse,
+    JDSettingsResponse,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -66,6 +71,56 @@ def analyze_job_description(
     db.commit()
 
 
+def update_jd_settings(
+    db: Session,
+    *,
+    jd_id: int,
+    updates: dict,
+) -> JDSettingsResponse | None:
+    """Apply per-JD processing overrides (force_full_analysis, lexical_screen_threshold,
+    screen_cutoff, output_schema).
+
+    Turning on force_full_analysis, or changing the threshold or screen cutoff,
+    puts the JD's screened_out resumes back in the queue so the next worker
+    batch re-evaluates them. Returns None if the JD does not exist.
+    """
+
+    jd = db.query(JobDescription).filter(JobDescription.jd_id == jd_id).first()
+    if not jd:
+        return None
+
+    if updates.get("force_full_analysis") is not None:
+        jd.force_full_analysis = updates["force_full_analysis"]
+    if "lexical_screen_threshold" in updates:
+        jd.lexical_screen_threshold = updates["lexical_screen_threshold"]
+    if "screen_cutoff" in updates:
+        jd.screen_cutoff = updates["screen_cutoff"]
+    if "output_schema" in updates:
+        jd.output_schema = updates["output_schema"]
+    jd.updated_at = datetime.utcnow()
+    db.add(jd)
+
+    requeued = 0
+    if jd.force_full_analysis or "lexical_screen_threshold" in updates or "screen_cutoff" in updates:
+        requeued = (
+            db.query(Resume)
+            .filter(Resume.jd_id == jd_id, Resume.status == "screened_out")
+            .update({Resume.status: "new"}, synchronize_session=False)
+        )
+
+    db.commit()
+    db.refresh(jd)
+
+    return JDSettingsResponse(
+        jd_id=jd.jd_id,
+        force_full_analysis=bool(jd.force_full_analysis),
+        lexical_screen_threshold=jd.lexical_screen_threshold,
+        screen_cutoff=jd.screen_cutoff,
+        output_schema=jd.output_schema,
+        requeued_resumes=requeued,
+    )
+
+
 def get_job_description_details(db: Session, jd_id: int) -> JobDetailsResponse | None:
     jd = db.query(JobDescription).filter(JobDescription.jd_id == jd_id).first()
     if not jd:
@@ -91,6 +146,14 @@ def get_job_description_details(db: Session, jd_id: int) -> JobDetailsResponse |
         last_reviewed_by=jd.last_reviewed_by,
         resumes_uploaded_count=jd.resumes_uploaded_count,
         processed_resumes_count=jd.processed_resumes_count,
+        force_full_analysis=jd.force_full_analysis,
+        lexical_screen_threshold=jd.lexical_screen_threshold,
+        screen_cutoff=jd.screen_cutoff,
+        output_schema=jd.output_schema,
+        requirement_profile=json.loads(jd.requirement_profile_json) if jd.requirement_profile_json else None,
+        requirement_profile_built_at=(
+            jd.requirement_profile_built_at.isoformat() if jd.requirement_profile_built_at else None
+        ),
         download=jd.file_saved_location,
     )
 
@@ -0,0 +1,177 @@
+import logging
+import re
+from collections import Counter
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import RESUMES_PROCESSED
+from app.models.job_description import JobDescription
+from app.models.resume import Resume
+from app.services.file_readers import read_file_to_text
+from app.services.progress_events import publish_resume_event
+
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Longer resumes are normalized as if this many times the reference length at
+# most, so one mention of a JD term still counts ~0.83 in a long CV
+BM25_MAX_LENGTH_RATIO = 1.5
+
+# Keeps tech tokens like "c++", "c#", "node.js" intact
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+_STOPWORDS = frozenset(
+    """
+    a about above after all also an and any are as at be been being both but by can could
+    do does did each either etc for from had has have having he her his how i if in into is
+    it its job may more most must no not of on or our out over per role she should so such
+    than that the their them then there these they this those through to under up us use
+    used using very via was we were what when where which while who will with within would
+    you your years year experience work working team strong ability skills plus preferred
+    required requirements responsibilities including candidate ideal looking join
+    """.split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token.rstrip(".")
+        for token in _TOKEN_RE.findall((text or "").lower())
+        if token not in _STOPWORDS and len(token.rstrip(".")) > 1
+    ]
+
+
+def bm25_scores(
+    jd_text: str, resume_texts: list[str], *, reference_length: float | None = None
+) -> np.ndarray:
+    """Normalized BM25 score in [0, 1] of each resume against the JD.
+
+    The JD's terms are the query, weighted by (1 + log tf) in the JD. Each
+    resume term frequency goes through BM25 saturation and length
+    normalization and is capped at the value of one occurrence in a resume
+    of `reference_length` tokens (LEXICAL_SCREEN_REFERENCE_LENGTH by
+    default), so the score reads as weighted JD-term coverage. The length
+    ratio is capped at BM25_MAX_LENGTH_RATIO: a senior multi-page CV loses at
+    most a bounded share of its coverage to its length, and is not screened
+    out below a thin resume with the same terms.
+
+    Nothing is taken from the batch: an IDF or an average length over the
+    resumes pending together would make a resume's score depend on which
+    other resumes happen to be pending with it, which breaks a fixed
+    threshold.
+    """
+
+    jd_counts = Counter(tokenize(jd_text))
+    if not jd_counts or not resume_texts:
+        return np.ones(len(resume_texts), dtype=np.float32)
+
+    vocab = {term: index for index, term in enumerate(jd_counts)}
+    tf = np.zeros((len(resume_texts), len(vocab)), dtype=np.float32)
+    lengths = np.zeros(len(resume_texts), dtype=np.float32)
+    for row, text in enumerate(resume_texts):
+        tokens = tokenize(text)
+        lengths[row] = len(tokens)
+        for token in tokens:
+            column = vocab.get(token)
+            if column is not None:
+                tf[row, column] += 1
+
+    weights = 1.0 + np.log(np.array([jd_counts[term] for term in vocab], dtype=np.float32))
+
+    if reference_length is None:
+        reference_length = settings.lexical_screen_reference_length
+    length_ratio = np.minimum(lengths / max(float(reference_length), 1.0), BM25_MAX_LENGTH_RATIO)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length_ratio)
+    saturated = tf * (BM25_K1 + 1) / (tf + norm[:, None])
+    coverage = np.minimum(saturated, 1.0)
+
+    return (coverage @ weights) / float(weights.sum())
+
+
+def effective_threshold(jd: JobDescription) -> float:
+    """Screening threshold for a JD; 0 means screening is off."""
+
+    if jd.force_full_analysis:
+        return 0.0
+    if jd.lexical_screen_threshold is not None:
+        return jd.lexical_screen_threshold
+    return settings.lexical_screen_threshold
+
+
+def screen_pending_resumes(
+    db_session: Session,
+    jd: JobDescription,
+    resumes: list[Resume],
+) -> list[Resume]:
+    """Score one JD's pending resumes in a single batch and mark the weak ones.
+
+    Resumes scoring below the JD's threshold get status `screened_out` with
+    their lexical score; the rest are returned for full analysis (their score
+    is stored too). Resumes whose text cannot be read are left to the normal
+    path, which reports the read error; promoted resumes are not screened.
+    """
+
+    threshold = effective_threshold(jd)
+    if threshold <= 0 or not resumes:
+        return resumes
+
+    try:
+        jd_text = read_file_to_text(jd.file_saved_location)
+    except Exception as exc:
+        logger.warning("Lexical screening skipped for jd_id=%s: %s", jd.jd_id, exc)
+        return resumes
+
+    scorable: list[Resume] = []
+    texts: list[str] = []
+    for resume in resumes:
+        if resume.force_full_analysis:
+            continue
+        try:
+            text = read_file_to_text(resume.file_location)
+        except Exception:
+            continue
+        if not text.strip():
+            continue
+        scorable.append(resume)
+        texts.append(text)
+
+    if not scorable:
+        return resumes
+
+    scores = bm25_scores(jd_text, texts)
+
+    screened_out: list[Resume] = []
+    for resume, score in zip(scorable, scores):
+        resume.lexical_score = round(float(score), 4)
+        if resume.lexical_score < threshold:
+            resume.status = "screened_out"
+            resume.failure_reason = None
+            screened_out.append(resume)
+        db_session.add(resume)
+    db_session.commit()
+
+    for resume in screened_out:
+        RESUMES_PROCESSED.labels(outcome="screened_out").inc()
+        publish_resume_event(
+            db_session,
+            jd_id=jd.jd_id,
+            resume_id=resume.resume_id,
+            state="screened_out",
+            status=resume.status,
+        )
+
+    if screened_out:
+        logger.info(
+            "Lexical screening for jd_id=%s: %d of %d resumes below threshold %.3f",
+            jd.jd_id,
+            len(screened_out),
+            len(scorable),
+            threshold,
+        )
+
+    return [resume for resume in resumes if resume not in screened_out]
@@ -0,0 +1,195 @@
+"""Resume progress events for the SSE stream (GET /jd/{jd_id}/events).
+
+Every resume state transition is written to `resume_progress_event`, in the
+database all processes share, so events reach SSE subscribers of any API
+process whether they come from the embedded worker, a separate
+resume_worker.py or another uvicorn worker. Within a process, one reader per
+JD tails the table and fans each batch (with one count snapshot) out to the
+JD's subscriber queues, so the DB load does not grow with the number of
+streams. The resume worker prunes rows older than
+PROGRESS_EVENTS_RETENTION_SECONDS.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.db import SessionLocal
+from app.models.resume import Resume, ResumeProgressEvent
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_jd_status_counts(db: Session, jd_id: int) -> dict[str, int]:
+    """Return resume counts per processing status for a JD, plus a total."""
+
+    rows = (
+        db.query(Resume.status, func.count(Resume.resume_id))
+        .filter(Resume.jd_id == jd_id)
+        .group_by(Resume.status)
+        .all()
+    )
+    counts = {str(status_value): int(count) for status_value, count in rows}
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def publish_resume_event(
+    db: Session,
+    *,
+    jd_id: int,
+    resume_id: int,
+    state: str,
+    status: str | None = None,
+    match_score: float | None = None,
+    failure_reason: str | None = None,
+) -> None:
+    """Record a resume state transition (queued, in_progress, processed, error, screened_out).
+
+    Commits the caller's session: call it once the transition is committed.
+    A failure is logged and never fails the caller.
+    """
+
+    payload = {
+        "jd_id": jd_id,
+        "resume_id": resume_id,
+        "state": state,
+        "status": status,
+        "match_score": match_score,
+        "failure_reason": failure_reason,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        db.add(ResumeProgressEvent(jd_id=jd_id, resume_id=resume_id, payload_json=json.dumps(payload)))
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.warning("Progress events: failed to record %s for resume_id=%s: %s", state, resume_id, exc)
+
+
+def last_progress_event_id(jd_id: int) -> int:
+    """Id of the JD's latest event (0 if none): a new stream starts after it."""
+
+    db = SessionLocal()
+    try:
+        last_id = (
+            db.query(func.max(ResumeProgressEvent.event_id)).filter(ResumeProgressEvent.jd_id == jd_id).scalar()
+        )
+        return int(last_id or 0)
+    finally:
+        db.close()
+
+
+def read_progress_events(jd_id: int, *, after_id: int, limit: int = 500) -> tuple[list[dict], int]:
+    """(events of the JD past `after_id`, id of the last one read).
+
+    Counts are computed once per batch and attached to each event read, so
+    publishers pay for no aggregate query when nobody is listening.
+    """
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ResumeProgressEvent.event_id, ResumeProgressEvent.payload_json)
+            .filter(ResumeProgressEvent.jd_id == jd_id, ResumeProgressEvent.event_id > after_id)
+            .order_by(ResumeProgressEvent.event_id)
+            .limit(limit)
+            .all()
+        )
+        if not rows:
+            return [], after_id
+        counts = get_jd_status_counts(db, jd_id)
+        events = [{**json.loads(payload_json), "counts": counts} for _, payload_json in rows]
+        return events, rows[-1].event_id
+    finally:
+        db.close()
+
+
+class ProgressBroadcaster:
+    """Per-JD fan-out of progress events to the SSE streams of this process.
+
+    The first subscriber of a JD starts its reader task; the reader polls
+    resume_progress_event every PROGRESS_EVENTS_POLL_SECONDS and stops once
+    the JD has no subscribers left. Subscribers only wait on their queue.
+    Slow subscribers drop their oldest queued event rather than holding up
+    the others.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self._max_queue_size = max_queue_size
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._readers: dict[int, asyncio.Task] = {}
+
+    def subscribe(self, jd_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._subscribers.setdefault(jd_id, set()).add(queue)
+        reader = self._readers.get(jd_id)
+        if reader is None or reader.done():
+            self._readers[jd_id] = asyncio.get_running_loop().create_task(self._read(jd_id))
+        return queue
+
+    def unsubscribe(self, jd_id: int, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(jd_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            self._subscribers.pop(jd_id, None)
+
+    def has_subscribers(self, jd_id: int) -> bool:
+        return bool(self._subscribers.get(jd_id))
+
+    async def _read(self, jd_id: int) -> None:
+        try:
+            after_id = await asyncio.to_thread(last_progress_event_id, jd_id)
+            while self.has_subscribers(jd_id):
+                try:
+                    events, after_id = await asyncio.to_thread(read_progress_events, jd_id, after_id=after_id)
+                except Exception as exc:
+                    logger.warning("Progress events: failed to read events for jd_id=%s: %s", jd_id, exc)
+                    events = []
+                for event in events:
+                    for queue in list(self._subscribers.get(jd_id, ())):
+                        self._deliver(queue, event)
+                await asyncio.sleep(settings.progress_events_poll_seconds)
+        finally:
+            if self._readers.get(jd_id) is asyncio.current_task():
+                self._readers.pop(jd_id, None)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, event: dict) -> None:
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(event)
+
+
+progress_broadcaster = ProgressBroadcaster(max_queue_size=settings.progress_events_queue_size)
+
+
+def prune_progress_events(db: Session) -> int:
+    """Delete events older than the retention window; returns how many."""
+
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.progress_events_retention_seconds)
+    try:
+        deleted = db.query(ResumeProgressEvent).filter(ResumeProgressEvent.created_at < cutoff).delete()
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.warning("Progress events: failed to prune old events: %s", exc)
+        return 0
+    return deleted
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Serialize one Server-Sent Events frame."""
+
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
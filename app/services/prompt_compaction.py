@@ -0,0 +1,371 @@
+"""Token-budgeted compaction of the JD and resume text sent to the LLM.
+
+Text extracted from PDFs often repeats page headers and footers on every
+page, breaks tables into runs of whitespace and carries sections that do not
+inform a match (references, declarations, hobbies, EEO statements). Before
+the analysis prompt is assembled, each document is:
+
+1. normalized (whitespace runs collapsed, at most one blank line),
+2. stripped of page numbers and of short lines repeated at the top or
+   bottom of many pages (pages split on form feeds and page numbers),
+3. split into sections by their headings, boilerplate sections dropped,
+4. cut to its token budget by section priority: the most useful sections
+   (experience, skills for a resume; responsibilities, requirements for a
+   JD) are kept whole first, the rest fill what is left, in document order.
+   A section that does not fit is cut, inside its first line if need be.
+
+Tokens are counted with the model's tiktoken encoding where one is available
+(OpenAI models, encodings cached locally) and estimated from characters
+otherwise.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Characters per token for models without a local tokenizer (Ollama-served models)
+_CHARS_PER_TOKEN = {"deepseek": 3.5, "mistral": 3.5}
+_DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# A line repeated this often (e.g. once per page) is a header/footer
+REPEATED_LINE_MIN_COUNT = 3
+_REPEATED_LINE_MAX_CHARS = 80
+# Headers/footers are looked for among the first and last lines of a page
+_PAGE_EDGE_LINES = 2
+# Headings are short lines; longer lines are never treated as one
+_HEADING_MAX_CHARS = 40
+# A section is cut only if at least this many tokens of it still fit
+_MIN_PARTIAL_TOKENS = 40
+TRUNCATION_MARKER = "[...]"
+
+_PAGE_NUMBER_RE = re.compile(r"^\s*(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?\s*$", re.IGNORECASE)
+_INLINE_SPACE_RE = re.compile(r"[ \t\u00a0\u200b]+")
+_BOILERPLATE_LINE_RE = re.compile(
+    r"^\s*(references (are )?available (up)?on request\.?|curriculum vitae|resume|r[ée]sum[ée])\s*$",
+    re.IGNORECASE,
+)
+
+# Section heading keyword -> (kind, priority); lower priority is kept first.
+# Priority None marks boilerplate that is always dropped.
+RESUME_SECTIONS: dict[str, tuple[str, int | None]] = {
+    "experience": ("experience", 1),
+    "work experience": ("experience", 1),
+    "professional experience": ("experience", 1),
+    "employment": ("experience", 1),
+    "employment history": ("experience", 1),
+    "work history": ("experience", 1),
+    "career history": ("experience", 1),
+    "skills": ("skills", 1),
+    "technical skills": ("skills", 1),
+    "core competencies": ("skills", 1),
+    "technologies": ("skills", 1),
+    "tech stack": ("skills", 1),
+    "summary": ("summary", 2),
+    "professional summary": ("summary", 2),
+    "profile": ("summary", 2),
+    "about me": ("summary", 2),
+    "objective": ("summary", 3),
+    "career objective": ("summary", 3),
+    "projects": ("projects", 2),
+    "key projects": ("projects", 2),
+    "education": ("education", 3),
+    "academic background": ("education", 3),
+    "certifications": ("certifications", 3),
+    "certificates": ("certifications", 3),
+    "licenses and certifications": ("certifications", 3),
+    "publications": ("publications", 4),
+    "awards": ("awards", 4),
+    "achievements": ("awards", 4),
+    "honors": ("awards", 4),
+    "languages": ("languages", 5),
+    "volunteer": ("volunteering", 5),
+    "volunteering": ("volunteering", 5),
+    "volunteer experience": ("volunteering", 5),
+    "interests": ("interests", 6),
+    "hobbies": ("interests", 6),
+    "hobbies and interests": ("interests", 6),
+    "personal details": ("personal", 6),
+    "personal information": ("personal", 6),
+    "references": ("references", None),
+    "declaration": ("declaration", None),
+}
+
+JD_SECTIONS: dict[str, tuple[str, int | None]] = {
+    "responsibilities": ("responsibilities", 1),
+    "key responsibilities": ("responsibilities", 1),
+    "what you will do": ("responsibilities", 1),
+    "what you'll do": ("responsibilities", 1),
+    "the role": ("responsibilities", 1),
+    "requirements": ("requirements", 1),
+    "qualifications": ("requirements", 1),
+    "required qualifications": ("requirements", 1),
+    "minimum qualifications": ("requirements", 1),
+    "must have": ("requirements", 1),
+    "what we're looking for": ("requirements", 1),
+    "what you bring": ("requirements", 1),
+    "skills": ("requirements", 1),
+    "tech stack": ("requirements", 1),
+    "preferred qualifications": ("nice_to_have", 2),
+    "nice to have": ("nice_to_have", 2),
+    "bonus points": ("nice_to_have", 2),
+    "about the team": ("team", 3),
+    "about us": ("company", 4),
+    "about the company": ("company", 4),
+    "who we are": ("company", 4),
+    "benefits": ("benefits", 5),
+    "perks": ("benefits", 5),
+    "what we offer": ("benefits", 5),
+    "compensation": ("benefits", 5),
+    "equal opportunity": ("eeo", None),
+    "equal employment opportunity": ("eeo", None),
+    "eeo statement": ("eeo", None),
+    "how to apply": ("apply", None),
+}
+
+# Text before the first heading (name and contact block, JD title/intro)
+_PREAMBLE_PRIORITY = 0
+
+
+@lru_cache(maxsize=32)
+def _tiktoken_encoding(model: str):
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as exc:  # not installed, or the encoding cannot be downloaded
+        logger.info("No tiktoken encoding for model=%s (%s); estimating tokens from characters", model, exc)
+        return None
+
+
+def count_tokens(text: str, *, provider: str | None = None, model: str | None = None) -> int:
+    """Token count of `text` for the provider/model (default: LLM_PROVIDER / LLM_MODEL)."""
+
+    provider = (provider or settings.llm_provider).lower()
+    model = model or settings.llm_model
+    if not text:
+        return 0
+    if provider == "openai":
+        encoding = _tiktoken_encoding(model)
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+    return int(len(text) / _CHARS_PER_TOKEN.get(provider, _DEFAULT_CHARS_PER_TOKEN)) + 1
+
+
+def normalize_whitespace(text: str) -> str:
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\f", "\n")
+    lines = [_INLINE_SPACE_RE.sub(" ", line).strip() for line in text.split("\n")]
+    out: list[str] = []
+    for line in lines:
+        if line or (out and out[-1]):
+            out.append(line)
+    return "\n".join(out).strip()
+
+
+def _split_pages(text: str) -> list[list[str]]:
+    """Normalized lines of each page: pages end at a form feed or a page number line."""
+
+    pages: list[list[str]] = []
+    for chunk in text.split("\f"):
+        page: list[str] = []
+        for line in normalize_whitespace(chunk).split("\n"):
+            if _PAGE_NUMBER_RE.match(line):
+                pages.append(page)
+                page = []
+            else:
+                page.append(line)
+        pages.append(page)
+    return [page for page in pages if any(page)]
+
+
+def _page_edges(page: list[str]) -> set[int]:
+    filled = [index for index, line in enumerate(page) if line]
+    return set(filled[:_PAGE_EDGE_LINES] + filled[-_PAGE_EDGE_LINES:])
+
+
+def strip_page_furniture(text: str) -> str:
+    """Drop page numbers and short lines repeated at the edges of many pages (headers/footers).
+
+    Only the first and last lines of a page are candidates, so a line that
+    repeats in the body (the same job title at two employers) is kept. The
+    first occurrence of a header is kept too: it usually carries the
+    candidate's name or the company.
+    """
+
+    pages = _split_pages(text)
+    counts: dict[str, int] = {}
+    for page in pages:
+        # "Responsibilities:"-style labels legitimately repeat once per job
+        keys = {
+            page[index].lower()
+            for index in _page_edges(page)
+            if len(page[index]) <= _REPEATED_LINE_MAX_CHARS and not page[index].endswith(":")
+        }
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+
+    seen: set[str] = set()
+    out = []
+    for page in pages:
+        edges = _page_edges(page)
+        for index, line in enumerate(page):
+            key = line.lower()
+            if _BOILERPLATE_LINE_RE.match(line):
+                continue
+            if index in edges and counts.get(key, 0) >= REPEATED_LINE_MIN_COUNT:
+                if key in seen:
+                    continue
+                seen.add(key)
+            out.append(line)
+    return normalize_whitespace("\n".join(out))
+
+
+@dataclass
+class _Section:
+    kind: str
+    priority: int | None
+    lines: list[str]
+
+
+def _heading(line: str, table: dict[str, tuple[str, int | None]]) -> tuple[str, int | None] | None:
+    if not line or len(line) > _HEADING_MAX_CHARS:
+        return None
+    key = re.sub(r"[^a-z' ]+", " ", line.lower().replace("&", " and ")).strip()
+    key = re.sub(r"\s+", " ", key)
+    return table.get(key)
+
+
+def split_sections(text: str, table: dict[str, tuple[str, int | None]]) -> list[_Section]:
+    sections = [_Section("preamble", _PREAMBLE_PRIORITY, [])]
+    for line in text.split("\n"):
+        heading = _heading(line, table)
+        if heading is not None:
+            sections.append(_Section(heading[0], heading[1], [line]))
+        else:
+            sections[-1].lines.append(line)
+    return [section for section in sections if any(line.strip() for line in section.lines)]
+
+
+@dataclass
+class CompactedText:
+    text: str
+    original_tokens: int
+    tokens: int
+    dropped_sections: list[str] = field(default_factory=list)
+    truncated_sections: list[str] = field(default_factory=list)
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+
+def _truncate_line(line: str, budget: int, count) -> str:
+    """Longest word-boundary prefix of `line` within `budget` tokens ('' if none)."""
+
+    low, high = 0, len(line)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count(line[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    prefix = line[:low]
+    if low < len(line) and " " in prefix:
+        prefix = prefix.rsplit(" ", 1)[0]
+    return prefix.rstrip()
+
+
+def _truncate_lines(lines: list[str], budget: int, count) -> list[str]:
+    kept: list[str] = []
+    used = count(TRUNCATION_MARKER)
+    for line in lines:
+        cost = count(line + "\n")
+        if used + cost > budget:
+            # Cut inside the line that does not fit, so a section (or a whole
+            # resume) extracted as one long line is not lost
+            partial = _truncate_line(line, budget - used - count("\n"), count)
+            if partial:
+                kept.append(partial)
+            break
+        kept.append(line)
+        used += cost
+    return kept + [TRUNCATION_MARKER] if kept else []
+
+
+def compact_text(
+    text: str,
+    *,
+    budget: int,
+    sections: dict[str, tuple[str, int | None]],
+    provider: str | None = None,
+    model: str | None = None,
+) -> CompactedText:
+    """Normalize `text` and cut it to `budget` tokens by section priority (0 = no budget)."""
+
+    def count(value: str) -> int:
+        return count_tokens(value, provider=provider, model=model)
+
+    original_tokens = count(text)
+    cleaned = strip_page_furniture(text)
+    parts = split_sections(cleaned, sections)
+    dropped = [part.kind for part in parts if part.priority is None]
+    parts = [part for part in parts if part.priority is not None]
+
+    for part in parts:
+        part.lines = "\n".join(part.lines).strip().split("\n")
+    costs = [count("\n".join(part.lines)) for part in parts]
+    truncated: list[str] = []
+    if budget > 0 and sum(costs) > budget:
+        remaining = budget
+        kept: dict[int, list[str]] = {}
+        for priority in sorted({part.priority for part in parts}):
+            group = [i for i in range(len(parts)) if parts[i].priority == priority]
+            if sum(costs[i] for i in group) <= remaining:
+                kept.update((i, parts[i].lines) for i in group)
+                remaining -= sum(costs[i] for i in group)
+                continue
+            # Share what is left between the group's sections, smallest first,
+            # so one long section cannot crowd out its equally important peers
+            group.sort(key=lambda i: costs[i])
+            for position, index in enumerate(group):
+                share = remaining // (len(group) - position)
+                if costs[index] <= share:
+                    kept[index] = parts[index].lines
+                    remaining -= costs[index]
+                elif share >= _MIN_PARTIAL_TOKENS:
+                    kept[index] = _truncate_lines(parts[index].lines, share, count)
+                    remaining -= share
+                    truncated.append(parts[index].kind)
+            break
+        dropped.extend(parts[i].kind for i in range(len(parts)) if not kept.get(i))
+        body = "\n\n".join("\n".join(kept[i]) for i in range(len(parts)) if kept.get(i))
+    else:
+        body = "\n\n".join("\n".join(part.lines) for part in parts)
+
+    return CompactedText(
+        text=body,
+        original_tokens=original_tokens,
+        tokens=count(body),
+        dropped_sections=dropped,
+        truncated_sections=truncated,
+    )
+
+
+def compact_resume(text: str, *, provider: str | None = None, model: str | None = None) -> CompactedText:
+    return compact_text(
+        text, budget=settings.prompt_resume_token_budget, sections=RESUME_SECTIONS, provider=provider, model=model
+    )
+
+
+def compact_jd(text: str, *, provider: str | None = None, model: str | None = None) -> CompactedText:
+    return compact_text(
+        text, budget=settings.prompt_jd_token_budget, sections=JD_SECTIONS, provider=provider, model=model
+    )
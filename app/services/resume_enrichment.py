@@ -0,0 +1,121 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.models.resume import Resume, ResumeAnalysis, ResumeSkill
+from app.services.contact_extraction import extract_contact
+from app.services.embeddings import embed_text
+from app.services.file_readers import read_file_to_text
+from app.services.skill_extraction import extract_skills, store_resume_skills
+from app.services.search_index import (
+    index_resume_analysis,
+    index_resume_text,
+    is_resume_indexed,
+    remove_resume_from_search,
+)
+from app.services.vector_index import get_resume_vector_index
+
+
+logger = logging.getLogger(__name__)
+
+
+def enrich_uploaded_resume(db: Session, *, resume_id: int, jd_id: int, file_location: str) -> None:
+    """Upload-time, LLM-free processing of a new resume.
+
+    Fills candidate contact fields, extracts taxonomy skills and indexes the
+    text for keyword search and the embedding for pool search. Best-effort:
+    a failure is logged and never fails the upload.
+    """
+
+    try:
+        text = read_file_to_text(file_location)
+    except Exception as exc:
+        logger.warning("Resume enrichment skipped for resume_id=%s: %s", resume_id, exc)
+        return
+
+    try:
+        resume = db.get(Resume, resume_id)
+        fill_missing_contact(resume, text)
+        store_resume_skills(db, resume=resume, taxonomy_skills=extract_skills(text))
+        index_resume_text(db, resume_id=resume_id, jd_id=jd_id, resume_text=text)
+        index_resume_analysis(db, resume=resume, analysis=None)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to store contact/skills/search text for resume_id=%s", resume_id)
+
+    try:
+        if text.strip():
+            get_resume_vector_index().add(resume_id, embed_text(text))
+    except Exception:
+        logger.exception("Failed to index embedding for resume_id=%s", resume_id)
+
+
+def fill_missing_contact(resume: Resume, text: str) -> None:
+    """Set empty candidate contact columns from heuristic extraction."""
+
+    for key, value in extract_contact(text).items():
+        if value and not getattr(resume, key):
+            setattr(resume, key, value)
+
+
+def remove_resume_enrichment(db: Session, resume_id: int) -> None:
+    """Drop upload-time artifacts of a deleted resume.
+
+    Skill and search rows are deleted in the caller's transaction; the
+    vector index lives outside the DB and is updated immediately.
+    """
+
+    db.query(ResumeSkill).filter(ResumeSkill.resume_id == resume_id).delete()
+    remove_resume_from_search(db, resume_id)
+    try:
+        get_resume_vector_index().remove(resume_id)
+    except Exception:
+        logger.exception("Failed to remove embedding for resume_id=%s", resume_id)
+
+
+def backfill_resume_enrichment(db: Session, *, only_missing: bool = True) -> int:
+    """Extract contacts/skills and index resumes uploaded before those features existed.
+
+    Returns the number of resumes (re)indexed.
+    """
+
+    index = get_resume_vector_index()
+    indexed = 0
+    resume_ids = [resume_id for (resume_id,) in db.query(Resume.resume_id).order_by(Resume.resume_id.asc()).all()]
+    for resume_id in resume_ids:
+        resume = db.get(Resume, resume_id)
+        needs_search = not only_missing or not is_resume_indexed(db, resume.resume_id)
+        needs_vector = not only_missing or not index.contains(resume.resume_id)
+        needs_skills = not only_missing or not (
+            db.query(ResumeSkill.resume_skill_id)
+            .filter(ResumeSkill.resume_id == resume.resume_id, ResumeSkill.source == "taxonomy")
+            .first()
+        )
+        if not (needs_search or needs_vector or needs_skills):
+            continue
+        try:
+            text = read_file_to_text(resume.file_location)
+        except Exception as exc:
+            logger.warning("Backfill: cannot read resume_id=%s: %s", resume.resume_id, exc)
+            continue
+
+        fill_missing_contact(resume, text)
+        if needs_skills:
+            store_resume_skills(db, resume=resume, taxonomy_skills=extract_skills(text))
+        if needs_search:
+            analysis = (
+                db.query(ResumeAnalysis)
+                .filter(ResumeAnalysis.resume_id == resume.resume_id)
+                .order_by(ResumeAnalysis.analysis_id.desc())
+                .first()
+            )
+            index_resume_text(db, resume_id=resume.resume_id, jd_id=resume.jd_id, resume_text=text)
+            index_resume_analysis(db, resume=resume, analysis=analysis)
+        if needs_vector and text.strip():
+            index.add(resume.resume_id, embed_text(text))
+        indexed += 1
+        if indexed % 500 == 0:
+            db.commit()
+    db.commit()
+    return indexed
@@ -1,16 +1,71 @@
+import asyncio
 import json
+import time
+from contextlib import contextmanager
 from typing import List
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.metrics import (
+    ANALYSIS_CHECKPOINTS_RESUMED,
+    CASCADE_DECISIONS,
+    PROMPT_TOKENS_SAVED,
+    RESUME_ANALYSIS_OUTPUTS,
+    RESUMES_PROCESSED,
+    SCREEN_DECISIONS,
+    WORKER_BATCH_DURATION,
+    track_stage,
+)
+from app.core.tracing import correlation_id_var, new_correlation_id, tracer
 from app.models.db import SessionLocal
 from app.models.job_description import JobDescription
 from app.models.resume import Resume, ResumeAnalysis
-from app.agents.agent import build_resume_processing_agent
+from app.agents.agent import (
+    build_dimension_fanout_agent,
+    build_resume_processing_agent,
+    build_screen_then_analyze_agent,
+)
+from app.agents.llm import LLMUsageRecorder, classify_llm_error
+from app.agents.structured_output import (
+    DIMENSION_KEYS,
+    AnalysisOutputError,
+    ResumeAnalysisOutput,
+    build_repair_messages,
+    parse_resume_analysis,
+)
 from langchain_core.messages import SystemMessage, HumanMessage
-from app.prompts.resume_analysis_prompt import RESUME_ANALYSIS_SYSTEM_PROMPT
+from app.prompts.resume_analysis_prompt import (
+    CONTACT_KEYS,
+    build_contact_keys_note,
+    build_resume_analysis_system_prompt,
+)
+from app.prompts.resume_screen_prompt import RESUME_SCREEN_SYSTEM_PROMPT
+from app.services.adaptive_concurrency import get_concurrency_controller
+from app.services.analysis_checkpoint import (
+    analysis_prompt_hash,
+    checkpoint_cascade,
+    checkpoint_pending_calls,
+    load_analysis_checkpoint,
+    mark_checkpoint_invalid,
+    save_analysis_checkpoint,
+)
+from app.services.contact_extraction import normalize_phone
 from app.services.file_readers import read_file_to_text
+from app.services.lexical_screening import screen_pending_resumes
+from app.services.progress_events import prune_progress_events, publish_resume_event
+from app.services.jd_profile import (
+    build_jd_profile_messages,
+    jd_prompt_block,
+    parse_jd_profile,
+    store_jd_profile,
+    stored_jd_profile,
+)
+from app.services.prompt_compaction import compact_resume
+from app.services.search_index import index_resume_analysis
+from app.services.skill_extraction import store_resume_skills
+from app.services.usage_service import record_llm_usage
 import logging
 
 
@@ -21,10 +76,10 @@ def _fetch_pending_batch(db_session: Session, jd_id: int | None = None) -> List[
     """Fetch a batch of resumes that are not yet processed.
 
     If jd_id is provided, only resumes for that JD are considered; otherwise
-    all pending resumes are eligible.
+    all pending resumes are eligible. Screened-out resumes are not pending.
     """
 
-    query = db_session.query(Resume).filter(Resume.status != "processed")
+    query = db_session.query(Resume).filter(Resume.status.notin_(["processed", "screened_out"]))
     if jd_id is not None:
         query = query.filter(Resume.jd_id == jd_id)
 
@@ -51,17 +106,28 @@ async def _mark_error(
     resume.failure_reason = reason[:500]  # avoid extremely long strings
     db_session.add(resume)
 
-    jd.processed_resumes_count = (jd.processed_resumes_count or 0) + 1
+    # In SQL, so concurrent resumes of the same JD do not lose increments
+    jd.processed_resumes_count = func.coalesce(JobDescription.processed_resumes_count, 0) + 1
     db_session.add(jd)
 
     db_session.commit()
+    RESUMES_PROCESSED.labels(outcome="error").inc()
+
+    publish_resume_event(
+        db_session,
+        jd_id=jd.jd_id,
+        resume_id=resume.resume_id,
+        state="error",
+        status=resume.status,
+        failure_reason=resume.failure_reason,
+    )
 
 
 def _extract_candidate_contact(parsed: dict) -> tuple[str | None, str | None, str | None]:
     """Best-effort extraction of candidate name/email/phone from analysis JSON.
 
-    The RESUME_ANALYSIS_SYSTEM_PROMPT does not strictly define these keys,
-    but if the LLM is extended to output them, this helper will map them.
+    The prompt only asks for the contact keys that upload-time extraction
+    could not fill, so any of these may be absent.
     """
 
     if not isinstance(parsed, dict):
@@ -107,44 +173,12 @@ def _extract_dimensions(parsed: dict) -> dict:
     return out
 
 
-async def _process_single_resume(
-    db_session: Session,
-    agent,
-    jd: JobDescription,
-    resume: Resume,
-    processed_by: str | None = "system",
-):
-    """Stateless per-resume processing: send JD + this resume only."""
-
-    try:
-        jd_text = read_file_to_text(jd.file_saved_location)
-    except Exception as exc:
-        await _mark_error(db_session, jd, resume, f"JD read error: {exc}", processed_by)
-        return
-
-    try:
-        resume_text = read_file_to_text(resume.file_location)
-    except Exception as exc:
-        await _mark_error(db_session, jd, resume, f"Resume read error: {exc}", processed_by)
-        return
-
-    messages = [
-        SystemMessage(content=RESUME_ANALYSIS_SYSTEM_PROMPT),
-        HumanMessage(content=f"JOB DESCRIPTION:\n{jd_text}\n\nRESUME:\n{resume_text}"),
-    ]
-
-    try:
-        result = agent.invoke({"messages": messages})
-        last_message = result["messages"][-1]
-        raw = getattr(last_message, "content", str(last_message))
-    except Exception as exc:
-        await _mark_error(db_session, jd, resume, f"LLM invoke error: {exc}", processed_by)
-        return
+def analysis_columns(parsed: dict) -> dict:
+    """match_score, summary, issues and per-dimension columns of an analysis row.
 
-    try:
-        parsed = json.loads(raw)
-    except json.JSONDecodeError:
-        parsed = {"raw": raw}
+    Derived from the validated analysis JSON; also used by the reparse job
+    (analysis_reparse) to refresh stored rows after a parser change.
+    """
 
     # Top-level match_score
     match_score = None
@@ -171,85 +205,697 @@ async def _process_single_resume(
             except Exception:
                 issues_serialized = str(issues)
 
-    # Per-dimension scores/notes
-    dims = _extract_dimensions(parsed)
+    columns = {"match_score": match_score, "summary": summary, "issues": issues_serialized}
 
-    def _dim(name: str) -> tuple[float | None, str | None]:
+    # Per-dimension scores/notes: <dimension>_score / <dimension>_note
+    dims = _extract_dimensions(parsed)
+    for name in DIMENSION_KEYS:
         d = dims.get(name) or {}
         score = d.get("score")
         note = d.get("note")
         try:
-            score_f = float(score) if score is not None else None
+            columns[f"{name}_score"] = float(score) if score is not None else None
         except Exception:
-            score_f = None
-        note_s = str(note) if note is not None else None
-        return score_f, note_s
-
-    tech_stack_match_score, tech_stack_match_note = _dim("tech_stack_match")
-    relevant_experience_score, relevant_experience_note = _dim("relevant_experience")
-    responsibilities_impact_score, responsibilities_impact_note = _dim("responsibilities_impact")
-    seniority_fit_score, seniority_fit_note = _dim("seniority_fit")
-    domain_fit_score, domain_fit_note = _dim("domain_fit")
-    red_flags_gaps_score, red_flags_gaps_note = _dim("red_flags_gaps")
-    communication_clarity_score, communication_clarity_note = _dim("communication_clarity")
-    soft_skills_professionalism_score, soft_skills_professionalism_note = _dim(
-        "soft_skills_professionalism"
+            columns[f"{name}_score"] = None
+        columns[f"{name}_note"] = str(note) if note is not None else None
+    return columns
+
+
+@contextmanager
+def _stage(name: str):
+    """Time a pipeline stage for metrics and trace it as a `resume.<name>` span."""
+
+    with tracer.start_as_current_span(f"resume.{name}"), track_stage(name):
+        yield
+
+
+def _invoke_agent(agent, messages: list, recorder: LLMUsageRecorder) -> str:
+    result = agent.invoke({"messages": messages}, config={"callbacks": [recorder]})
+    last_message = result["messages"][-1]
+    return getattr(last_message, "content", str(last_message))
+
+
+async def _call_llm(fn, *args, kind="llm"):
+    """Run a blocking LLM call in a thread; its outcome feeds the concurrency controller.
+
+    `kind` keys the controller's latency baseline; it may be a function of
+    the result, for calls whose latency depends on how far they got.
+    """
+
+    controller = get_concurrency_controller()
+    started = time.monotonic()
+    try:
+        result = await asyncio.to_thread(fn, *args)
+    except Exception as exc:
+        controller.record_failure(classify_llm_error(exc), started)
+        raise
+    controller.record_success(time.monotonic() - started, started, kind(result) if callable(kind) else kind)
+    return result
+
+
+def _invoke_screen_agent(
+    agent, screen_messages: list, messages: list, cutoff: float, recorder: LLMUsageRecorder
+) -> tuple[dict, str | None]:
+    """(screen result, full analysis reply or None when the resume was screened out)."""
+
+    result = agent.invoke(
+        {"messages": messages, "screen_messages": screen_messages, "screen_cutoff": cutoff},
+        config={"callbacks": [recorder]},
+    )
+    if not result["screen"]["passed"]:
+        return result["screen"], None
+    last_message = result["messages"][-1]
+    return result["screen"], getattr(last_message, "content", str(last_message))
+
+
+def _invoke_fanout_agent(
+    agent, jd_block: str, resume_block: str, contact_keys: tuple[str, ...], recorder: LLMUsageRecorder
+) -> str:
+    result = agent.invoke(
+        {"messages": [], "jd_block": jd_block, "resume_block": resume_block, "contact_keys": contact_keys},
+        config={"callbacks": [recorder]},
     )
-    project_complexity_score, project_complexity_note = _dim("project_complexity")
-    consistency_trajectory_score, consistency_trajectory_note = _dim("consistency_trajectory")
-
-    # Candidate info (optional, if present in JSON)
-    cand_name, cand_email, cand_phone = _extract_candidate_contact(parsed)
-    if cand_name:
-        resume.candidate_name = cand_name
-    if cand_email:
-        resume.candidate_email = cand_email
-    if cand_phone:
-        resume.candidate_phone = cand_phone
-
-    # Persist analysis row with all new columns
-    analysis = ResumeAnalysis(
+    return result["messages"][-1].content
+
+
+def _screen_cutoff(jd: JobDescription, resume: Resume) -> float:
+    """LLM quick-screen cutoff (0..100) for a resume; 0 means no screen."""
+
+    if jd.force_full_analysis or resume.force_full_analysis:
+        return 0.0
+    if jd.screen_cutoff is not None:
+        return jd.screen_cutoff
+    return settings.resume_screen_cutoff
+
+
+def _screen_model() -> tuple[str | None, str | None]:
+    """(provider, model) of the quick screen; None falls back to the analysis model's."""
+
+    if settings.resume_screen_model or settings.resume_screen_provider:
+        return settings.resume_screen_provider or None, settings.resume_screen_model or None
+    if settings.cascade_model:
+        return settings.cascade_provider or None, settings.cascade_model
+    return None, None
+
+
+async def _run_screen(
+    db_session: Session,
+    screen_agent,
+    messages: list,
+    screen_messages: list,
+    cutoff: float,
+    recorder: LLMUsageRecorder,
+    jd: JobDescription,
+    resume: Resume,
+    processed_by: str | None,
+) -> str | None:
+    """Screen a resume, and analyze it in the same graph run if it passes.
+
+    Returns the full analysis reply (its usage stays in `recorder`), or None
+    when the resume was screened out or the call failed, both already
+    recorded. The screen call is logged as `resume_screen`.
+    """
+
+    try:
+        with _stage("screen_llm"):
+            screen, raw = await _call_llm(
+                _invoke_screen_agent,
+                screen_agent,
+                screen_messages,
+                messages,
+                cutoff,
+                recorder,
+                kind=lambda result: "screen" if result[1] is None else "screen_primary",
+            )
+    except Exception as exc:
+        record_llm_usage(
+            db_session,
+            recorder.pop_node_calls("screen"),
+            call_type="resume_screen",
+            jd_id=jd.jd_id,
+            resume_id=resume.resume_id,
+            user_name=resume.uploaded_by,
+        )
+        await _mark_error(db_session, jd, resume, f"LLM invoke error: {exc}", processed_by)
+        return None
+
+    record_llm_usage(
+        db_session,
+        recorder.pop_node_calls("screen"),
+        call_type="resume_screen",
+        jd_id=jd.jd_id,
         resume_id=resume.resume_id,
+        user_name=resume.uploaded_by,
+    )
+    resume.screen_score = screen.get("estimated_score")
+    resume.screen_reason = (screen.get("reason") or "")[:500] or None
+    SCREEN_DECISIONS.labels(
+        decision="invalid_output" if screen.get("errors") else "passed" if screen["passed"] else "screened_out"
+    ).inc()
+
+    if screen["passed"]:
+        db_session.add(resume)
+        # Repairs may follow; do not hold the write lock across them
+        db_session.commit()
+        return raw
+
+    resume.status = "screened_out"
+    resume.failure_reason = None
+    db_session.add(resume)
+    db_session.commit()
+    RESUMES_PROCESSED.labels(outcome="screened_out").inc()
+    logger.info(
+        "Resume %s screened out for jd_id=%s: estimated score %s < cutoff %g (%s)",
+        resume.resume_id,
+        jd.jd_id,
+        resume.screen_score,
+        cutoff,
+        resume.screen_reason or "-",
+    )
+    publish_resume_event(
+        db_session,
         jd_id=jd.jd_id,
-        analysis_json=json.dumps(parsed),
+        resume_id=resume.resume_id,
+        state="screened_out",
+        status=resume.status,
+    )
+    return None
+
+
+async def _validate_with_repair(
+    agent,
+    raw: str,
+    recorder: LLMUsageRecorder,
+    resume_id: int,
+) -> tuple[ResumeAnalysisOutput | None, list[str]]:
+    """Validate an analysis reply, asking the model to repair it if needed.
+
+    Invalid output gets a targeted repair call (errors + the reply only),
+    never a full re-analysis; returns (None, errors) when it stays invalid.
+    """
+
+    try:
+        output = parse_resume_analysis(raw)
+        RESUME_ANALYSIS_OUTPUTS.labels(result="valid").inc()
+        return output, []
+    except AnalysisOutputError as exc:
+        errors = exc.errors
+
+    for attempt in range(1, settings.resume_analysis_repair_attempts + 1):
+        logger.warning(
+            "Invalid analysis output for resume_id=%s (repair %d): %s",
+            resume_id,
+            attempt,
+            "; ".join(errors),
+        )
+        try:
+            with _stage("repair"):
+                raw = await _call_llm(
+                    _invoke_agent, agent, build_repair_messages(raw, errors), recorder, kind="repair"
+                )
+        except Exception as exc:
+            errors = [f"repair call failed: {exc}"]
+            break
+        try:
+            output = parse_resume_analysis(raw)
+            RESUME_ANALYSIS_OUTPUTS.labels(result="repaired").inc()
+            return output, []
+        except AnalysisOutputError as exc:
+            errors = exc.errors
+
+    RESUME_ANALYSIS_OUTPUTS.labels(result="invalid").inc()
+    return None, errors
+
+
+async def _run_cascade_tier(
+    db_session: Session,
+    cheap_agent,
+    messages: list,
+    jd: JobDescription,
+    resume: Resume,
+) -> tuple[ResumeAnalysisOutput | None, dict, dict]:
+    """Analyze with the cascade's cheap model.
+
+    Returns (output if it can be kept, else None; provenance columns for the
+    analysis row; usage of the cheap call). The call is logged in the usage
+    tables as `resume_analysis_cascade`.
+    """
+
+    recorder = LLMUsageRecorder()
+    output = None
+    try:
+        with _stage("cascade"):
+            raw = await _call_llm(_invoke_agent, cheap_agent, messages, recorder, kind="cascade")
+        output = parse_resume_analysis(raw)
+    except AnalysisOutputError as exc:
+        logger.info("Cascade output invalid for resume_id=%s: %s", resume.resume_id, exc)
+    except Exception as exc:
+        logger.warning("Cascade model call failed for resume_id=%s: %s", resume.resume_id, exc)
+
+    usage = record_llm_usage(
+        db_session,
+        recorder,
+        call_type="resume_analysis_cascade",
+        jd_id=jd.jd_id,
+        resume_id=resume.resume_id,
+        user_name=resume.uploaded_by,
+    )
+    fields = {
+        "cascade_model": recorder.model or settings.cascade_model,
+        "cascade_input_tokens": usage["input_tokens"],
+        "cascade_output_tokens": usage["output_tokens"],
+        "cascade_cost_usd": usage["estimated_cost_usd"],
+    }
+    if output is not None:
+        fields["cascade_match_score"] = output.match_score
+        fields["cascade_analysis_json"] = json.dumps(output.model_dump(exclude_unset=True))
+
+    if output is None:
+        reason = "invalid_output"
+    elif settings.cascade_band_low <= output.match_score <= settings.cascade_band_high:
+        reason = "uncertain_score"
+    else:
+        CASCADE_DECISIONS.labels(decision="accepted").inc()
+        return output, {**fields, "cascade_tier": "cheap"}, usage
+
+    CASCADE_DECISIONS.labels(decision=reason).inc()
+    return None, {**fields, "cascade_tier": "primary", "cascade_escalation_reason": reason}, usage
+
+
+def _combine_usage(first: dict, second: dict) -> dict:
+    """Usage of two tiers of one analysis; provider/model of the later call."""
+
+    combined = {}
+    for key in ("input_tokens", "output_tokens", "cached_input_tokens", "llm_latency_ms", "estimated_cost_usd"):
+        values = [usage[key] for usage in (first, second) if usage[key] is not None]
+        combined[key] = sum(values) if values else None
+    for key in ("llm_provider", "llm_model", "llm_endpoint"):
+        combined[key] = second[key] or first[key]
+    return combined
+
+
+def _build_analysis_messages(
+    jd_block: str, resume_block: str, contact_keys: tuple[str, ...], output_schema: str = "full"
+) -> list:
+    """Analysis prompt in the RESUME_PROMPT_LAYOUT order.
+
+    prefix_cache: static system prompt, JD block, then the resume and the
+    per-resume contact-key note, so the system prompt and JD form a prefix
+    shared byte for byte by every resume of the JD. combined: system prompt
+    tailored to the contact keys, JD and resume in one message. output_schema
+    selects the full or compact expected output.
+    """
+
+    if settings.resume_prompt_layout == "combined":
+        return [
+            SystemMessage(content=build_resume_analysis_system_prompt(contact_keys, output_schema)),
+            HumanMessage(content=f"JOB DESCRIPTION:\n{jd_block}\n\nRESUME:\n{resume_block}"),
+        ]
+
+    resume_content = f"RESUME:\n{resume_block}"
+    note = build_contact_keys_note(contact_keys, output_schema)
+    if note:
+        resume_content += f"\n\n{note}"
+    return [
+        SystemMessage(content=build_resume_analysis_system_prompt(CONTACT_KEYS, output_schema)),
+        HumanMessage(content=f"JOB DESCRIPTION:\n{jd_block}"),
+        HumanMessage(content=resume_content),
+    ]
+
+
+def _build_screen_messages(jd_block: str, resume_block: str) -> list:
+    """Quick-screen prompt: the JD block as in the analysis prompt, then the resume."""
+
+    return [
+        SystemMessage(content=RESUME_SCREEN_SYSTEM_PROMPT),
+        HumanMessage(content=f"JOB DESCRIPTION:\n{jd_block}"),
+        HumanMessage(content=f"RESUME:\n{resume_block}"),
+    ]
+
+
+async def _process_single_resume(
+    db_session: Session,
+    agent,
+    jd: JobDescription,
+    resume: Resume,
+    processed_by: str | None = "system",
+    cheap_agent=None,
+    screen_agent=None,
+    fanout_agent=None,
+):
+    """Stateless per-resume processing: send JD + this resume only.
+
+    Runs under the resume's upload correlation ID and a `resume.process` span.
+    """
+
+    if not resume.correlation_id:
+        resume.correlation_id = new_correlation_id()
+
+    token = correlation_id_var.set(resume.correlation_id)
+    try:
+        with tracer.start_as_current_span(
+            "resume.process",
+            attributes={"resume.id": resume.resume_id, "jd.id": jd.jd_id},
+        ):
+            await _analyze_resume(
+                db_session, agent, jd, resume, processed_by, cheap_agent, screen_agent, fanout_agent
+            )
+    finally:
+        correlation_id_var.reset(token)
+
+
+async def _analyze_resume(
+    db_session: Session,
+    agent,
+    jd: JobDescription,
+    resume: Resume,
+    processed_by: str | None,
+    cheap_agent=None,
+    screen_agent=None,
+    fanout_agent=None,
+):
+    """Extract texts, call the agent, parse its JSON and persist the analysis row.
+
+    With a cheap_agent (model cascade) the cheap model answers first and the
+    primary agent only sees resumes it is unsure about. With a screen_agent
+    and a screen cutoff for the resume, the quick screen comes first instead
+    (on the cascade model, if any) and only resumes that pass it are analyzed.
+    A fanout_agent (analyze now) replaces all of that with parallel
+    per-dimension calls; the primary agent then only handles repairs.
+    The reply is checkpointed before it is parsed, so a run interrupted
+    after the LLM call continues from it (analysis_checkpoint).
+    """
+
+    publish_resume_event(
+        db_session,
+        jd_id=jd.jd_id,
+        resume_id=resume.resume_id,
+        state="in_progress",
+        status=resume.status,
+    )
+
+    with _stage("extract"):
+        try:
+            jd_text = read_file_to_text(jd.file_saved_location)
+        except Exception as exc:
+            await _mark_error(db_session, jd, resume, f"JD read error: {exc}", processed_by)
+            return
+
+        try:
+            resume_text = read_file_to_text(resume.file_location)
+        except Exception as exc:
+            await _mark_error(db_session, jd, resume, f"Resume read error: {exc}", processed_by)
+            return
+
+    # Fit JD and resume into their token budgets (headers/footers, boilerplate, low-priority sections)
+    with _stage("compact"):
+        jd_compacted = jd_prompt_block(jd, jd_text)
+        resume_compacted = compact_resume(resume_text)
+    PROMPT_TOKENS_SAVED.labels(document="jd").inc(jd_compacted.tokens_saved)
+    PROMPT_TOKENS_SAVED.labels(document="resume").inc(resume_compacted.tokens_saved)
+    if resume_compacted.dropped_sections or resume_compacted.truncated_sections:
+        logger.info(
+            "Resume %s compacted %d -> %d tokens (dropped: %s; truncated: %s)",
+            resume.resume_id,
+            resume_compacted.original_tokens,
+            resume_compacted.tokens,
+            ", ".join(resume_compacted.dropped_sections) or "-",
+            ", ".join(resume_compacted.truncated_sections) or "-",
+        )
+
+    # Ask the LLM only for contact fields the upload-time heuristics missed
+    contact_keys = tuple(key for key in CONTACT_KEYS if not getattr(resume, key))
+    # The per-dimension replies are small already and merged in the full schema
+    output_schema = "full" if fanout_agent is not None else jd.output_schema or settings.resume_output_schema
+    messages = _build_analysis_messages(jd_compacted.text, resume_compacted.text, contact_keys, output_schema)
+    analysis_mode = "fanout" if fanout_agent is not None else "single"
+
+    checkpoint = None
+    if settings.resume_analysis_checkpoint:
+        prompt_hash = analysis_prompt_hash(messages, analysis_mode)
+        checkpoint = load_analysis_checkpoint(
+            db_session, resume_id=resume.resume_id, jd_id=jd.jd_id, prompt_hash=prompt_hash
+        )
+
+    # Other resumes are written while this one waits on the LLM, so no
+    # transaction (and SQLite write lock) may stay open across the call
+    db_session.commit()
+
+    output = None
+    cascade_fields: dict = {}
+    cascade_usage = None
+    recorder = LLMUsageRecorder()
+    raw = None
+    screen_cutoff = _screen_cutoff(jd, resume) if screen_agent is not None else 0.0
+    if checkpoint is not None:
+        # An earlier run got this reply, then was interrupted before storing the analysis
+        raw = checkpoint.raw_response
+        recorder.calls = checkpoint_pending_calls(checkpoint)
+        cascade_fields, cascade_usage = checkpoint_cascade(checkpoint)
+        ANALYSIS_CHECKPOINTS_RESUMED.inc()
+        logger.info("Resume %s continues from its stored analysis reply", resume.resume_id)
+    elif fanout_agent is not None:
+        try:
+            with _stage("fanout"):
+                raw = await _call_llm(
+                    _invoke_fanout_agent,
+                    fanout_agent,
+                    jd_compacted.text,
+                    resume_compacted.text,
+                    contact_keys,
+                    recorder,
+                    kind="fanout",
+                )
+        except Exception as exc:
+            await _mark_error(db_session, jd, resume, f"LLM invoke error: {exc}", processed_by)
+            return
+    elif screen_cutoff > 0:
+        # Quick screen, then (same graph run) the full analysis if it passes
+        screen_messages = _build_screen_messages(jd_compacted.text, resume_compacted.text)
+        raw = await _run_screen(
+            db_session, screen_agent, messages, screen_messages, screen_cutoff, recorder, jd, resume, processed_by
+        )
+        if raw is None:
+            return
+    elif cheap_agent is not None:
+        # Cascade: the cheap model's result is kept unless it is uncertain or invalid
+        output, cascade_fields, cascade_usage = await _run_cascade_tier(
+            db_session, cheap_agent, messages, jd, resume
+        )
+        db_session.commit()
+
+    if output is None and raw is None:
+        try:
+            with _stage("llm"):
+                raw = await _call_llm(_invoke_agent, agent, messages, recorder, kind="primary")
+        except Exception as exc:
+            await _mark_error(db_session, jd, resume, f"LLM invoke error: {exc}", processed_by)
+            return
+
+    if settings.resume_analysis_checkpoint and checkpoint is None:
+        # The reply is paid for: commit it before parsing or persisting can fail
+        with _stage("checkpoint"):
+            checkpoint = save_analysis_checkpoint(
+                db_session,
+                resume_id=resume.resume_id,
+                jd_id=jd.jd_id,
+                prompt_hash=prompt_hash,
+                raw=raw if output is None else cascade_fields["cascade_analysis_json"],
+                pending_calls=recorder.calls,
+                cascade_fields=cascade_fields,
+                cascade_usage=cascade_usage,
+            )
+            db_session.commit()
+
+    if output is None:
+        output, errors = await _validate_with_repair(agent, raw, recorder, resume.resume_id)
+        if output is None:
+            record_llm_usage(
+                db_session,
+                recorder,
+                call_type="resume_analysis",
+                jd_id=jd.jd_id,
+                resume_id=resume.resume_id,
+                user_name=resume.uploaded_by,
+            )
+            if checkpoint is not None:
+                # Kept for reparse after a parser fix; its usage is logged now
+                mark_checkpoint_invalid(db_session, checkpoint)
+            await _mark_error(
+                db_session, jd, resume, f"Invalid analysis output: {'; '.join(errors)}", processed_by
+            )
+            return
+
+    with _stage("parse"):
+        parsed = output.model_dump(exclude_unset=True)
+        columns = analysis_columns(parsed)
+        match_score = columns["match_score"]
+
+        # Candidate info from the LLM only fills fields the heuristics missed
+        cand_name, cand_email, cand_phone = _extract_candidate_contact(parsed)
+        if cand_name and not resume.candidate_name:
+            resume.candidate_name = cand_name
+        if cand_email and not resume.candidate_email:
+            resume.candidate_email = cand_email
+        if cand_phone and not resume.candidate_phone:
+            resume.candidate_phone = normalize_phone(str(cand_phone)) or cand_phone
+
+    with _stage("persist"):
+        usage = record_llm_usage(
+            db_session,
+            recorder,
+            call_type="resume_analysis",
+            jd_id=jd.jd_id,
+            resume_id=resume.resume_id,
+            user_name=resume.uploaded_by,
+        )
+
+        if cascade_usage is not None:
+            usage = _combine_usage(cascade_usage, usage)
+
+        # Persist analysis row with all new columns
+        analysis = ResumeAnalysis(
+            resume_id=resume.resume_id,
+            jd_id=jd.jd_id,
+            analysis_json=json.dumps(parsed),
+            **columns,
+            processed_by=processed_by,
+            correlation_id=resume.correlation_id,
+            output_schema=output_schema,
+            analysis_mode=analysis_mode,
+            contact_keys_requested=len(contact_keys),
+            prompt_document_tokens=jd_compacted.tokens + resume_compacted.tokens,
+            prompt_tokens_saved=jd_compacted.tokens_saved + resume_compacted.tokens_saved,
+            **cascade_fields,
+            **usage,
+        )
+        db_session.add(analysis)
+
+        # Update resume status and JD counters
+        resume.status = "processed"
+        resume.failure_reason = None
+        db_session.add(resume)
+
+        jd.processed_resumes_count = func.coalesce(JobDescription.processed_resumes_count, 0) + 1
+        db_session.add(jd)
+
+        # Skills the LLM reported beyond the upload-time taxonomy matches
+        if isinstance(parsed, dict) and isinstance(parsed.get("skills"), list):
+            store_resume_skills(db_session, resume=resume, llm_skills=parsed["skills"])
+
+        index_resume_analysis(db_session, resume=resume, analysis=analysis)
+
+        if checkpoint is not None:
+            db_session.delete(checkpoint)
+
+        db_session.commit()
+
+    RESUMES_PROCESSED.labels(outcome="processed").inc()
+
+    publish_resume_event(
+        db_session,
+        jd_id=jd.jd_id,
+        resume_id=resume.resume_id,
+        state="processed",
+        status=resume.status,
         match_score=match_score,
-        summary=summary,
-        issues=issues_serialized,
-        tech_stack_match_score=tech_stack_match_score,
-        tech_stack_match_note=tech_stack_match_note,
-        relevant_experience_score=relevant_experience_score,
-        relevant_experience_note=relevant_experience_note,
-        responsibilities_impact_score=responsibilities_impact_score,
-        responsibilities_impact_note=responsibilities_impact_note,
-        seniority_fit_score=seniority_fit_score,
-        seniority_fit_note=seniority_fit_note,
-        domain_fit_score=domain_fit_score,
-        domain_fit_note=domain_fit_note,
-        red_flags_gaps_score=red_flags_gaps_score,
-        red_flags_gaps_note=red_flags_gaps_note,
-        communication_clarity_score=communication_clarity_score,
-        communication_clarity_note=communication_clarity_note,
-        soft_skills_professionalism_score=soft_skills_professionalism_score,
-        soft_skills_professionalism_note=soft_skills_professionalism_note,
-        project_complexity_score=project_complexity_score,
-        project_complexity_note=project_complexity_note,
-        consistency_trajectory_score=consistency_trajectory_score,
-        consistency_trajectory_note=consistency_trajectory_note,
-        processed_by=processed_by,
     )
-    db_session.add(analysis)
 
-    # Update resume status and JD counters
-    resume.status = "processed"
-    resume.failure_reason = None
-    db_session.add(resume)
 
-    jd.processed_resumes_count = (jd.processed_resumes_count or 0) + 1
-    db_session.add(jd)
+async def _prepare_jd_profile(db_session: Session, agent, jd: JobDescription) -> None:
+    """Distill the JD's requirement profile unless one for its current text is stored.
+
+    A failed distillation is logged and the JD's resumes get the JD text.
+    """
 
+    if settings.resume_prompt_jd_mode != "profile":
+        return
+    try:
+        jd_text = read_file_to_text(jd.file_saved_location)
+    except Exception:
+        return  # each resume reports the read error
+    if stored_jd_profile(jd, jd_text) is not None:
+        return
+
+    recorder = LLMUsageRecorder()
+    profile = None
+    try:
+        with _stage("jd_profile"):
+            raw = await _call_llm(
+                _invoke_agent, agent, build_jd_profile_messages(jd_text), recorder, kind="jd_profile"
+            )
+        profile = parse_jd_profile(raw)
+    except Exception as exc:
+        logger.warning("JD profile for jd_id=%s failed, resumes get the JD text: %s", jd.jd_id, exc)
+
+    record_llm_usage(db_session, recorder, call_type="jd_profile", jd_id=jd.jd_id, user_name=jd.uploaded_by)
+    if profile is not None:
+        store_jd_profile(jd, jd_text, profile)
+        db_session.add(jd)
+        logger.info("Built requirement profile for jd_id=%s", jd.jd_id)
     db_session.commit()
 
 
+async def _process_resume_in_session(
+    resume_id: int,
+    jd_id: int,
+    agent,
+    cheap_agent,
+    screen_agent,
+    processed_by: str | None,
+) -> None:
+    """Process one resume with its own session, so concurrent resumes do not share one."""
+
+    db_session = SessionLocal()
+    try:
+        resume = db_session.get(Resume, resume_id)
+        jd = db_session.get(JobDescription, jd_id)
+        await _process_single_resume(
+            db_session=db_session,
+            agent=agent,
+            jd=jd,
+            resume=resume,
+            processed_by=processed_by,
+            cheap_agent=cheap_agent,
+            screen_agent=screen_agent,
+        )
+    except Exception:
+        db_session.rollback()
+        logger.exception("Resume worker: unexpected error for resume_id=%s", resume_id)
+    finally:
+        db_session.close()
+
+
+async def analyze_resume_now(resume_id: int, *, mode: str = "fanout", processed_by: str | None = None) -> None:
+    """Analyze one resume right away (interactive "analyze now"), skipping the screens.
+
+    mode="fanout" scores groups of dimensions in parallel calls
+    (build_dimension_fanout_agent): the reply arrives sooner, for more input
+    tokens. mode="single" is the batch worker's one-call analysis.
+    """
+
+    agent = build_resume_processing_agent()
+    fanout_agent = build_dimension_fanout_agent() if mode == "fanout" else None
+
+    db_session = SessionLocal()
+    try:
+        resume = db_session.get(Resume, resume_id)
+        jd = db_session.get(JobDescription, resume.jd_id)
+        await _process_single_resume(
+            db_session=db_session,
+            agent=agent,
+            jd=jd,
+            resume=resume,
+            processed_by=processed_by,
+            fanout_agent=fanout_agent,
+        )
+    except Exception:
+        db_session.rollback()
+        logger.exception("Analyze now: unexpected error for resume_id=%s", resume_id)
+    finally:
+        db_session.close()
+
+
 async def run_once(processed_by: str | None = "system", jd_id: int | None = None) -> int:
     """Process a batch of pending resumes, independently per resume.
 
@@ -258,11 +904,13 @@ async def run_once(processed_by: str | None = "system", jd_id: int | None = None
 
     Each resume call is stateless from the model's perspective: it receives
     only the JD and that resume's content, so there is no cross-resume
-    contamination in the LLM evaluation.
+    contamination in the LLM evaluation. Resumes are analyzed concurrently,
+    up to the adaptive limit of app/services/adaptive_concurrency.py.
     """
 
     db = SessionLocal()
     try:
+        prune_progress_events(db)
         pending = _fetch_pending_batch(db, jd_id=jd_id)
         if not pending:
             logger.info("Resume worker: no pending resumes to process")
@@ -275,28 +923,79 @@ async def run_once(processed_by: str | None = "system", jd_id: int | None = None
             processed_by,
         )
 
-        agent = build_resume_processing_agent()
+        batch_started = time.perf_counter()
+
+        jds = {
+            jd_key: db.query(JobDescription).filter(JobDescription.jd_id == jd_key).first()
+            for jd_key in {resume.jd_id for resume in pending}
+        }
+
+        # One lexical scoring pass per JD; clearly off-target resumes skip the LLM
+        to_analyze: set[int] = set()
+        for jd_key, jd in jds.items():
+            group = [resume for resume in pending if resume.jd_id == jd_key]
+            if jd is not None:
+                with _stage("screen"):
+                    group = screen_pending_resumes(db, jd, group)
+            to_analyze.update(resume.resume_id for resume in group)
+
+        agent = build_resume_processing_agent() if to_analyze else None
+        cheap_agent = None
+        if to_analyze and settings.cascade_model:
+            cheap_agent = build_resume_processing_agent(
+                provider=settings.cascade_provider or None, model=settings.cascade_model
+            )
 
+        queue = []
         for resume in pending:
-            jd = db.query(JobDescription).filter(JobDescription.jd_id == resume.jd_id).first()
-            if not jd:
+            if resume.resume_id not in to_analyze:
+                continue
+            if not jds[resume.jd_id]:
                 logger.error(
                     "Resume worker: jd_id=%s not found for resume_id=%s",
                     resume.jd_id,
                     resume.resume_id,
                 )
                 continue
-
-            await _process_single_resume(
-                db_session=db,
-                agent=agent,
-                jd=jd,
-                resume=resume,
-                processed_by=processed_by,
+            queue.append((resume.resume_id, resume.jd_id))
+
+        # Two-phase (quick screen, then full analysis) agent for JDs with a screen cutoff
+        screen_agent = None
+        queued_ids = {resume_id for resume_id, _ in queue}
+        if any(
+            _screen_cutoff(jds[resume.jd_id], resume) > 0 for resume in pending if resume.resume_id in queued_ids
+        ):
+            screen_provider, screen_model = _screen_model()
+            screen_agent = build_screen_then_analyze_agent(
+                screen_provider=screen_provider, screen_model=screen_model
             )
 
+        # One profile distillation per JD, before its resumes fan out
+        for jd_key in sorted({jd_key for _, jd_key in queue}):
+            await _prepare_jd_profile(db, agent, jds[jd_key])
+
+        # Start resumes while the adaptive limit allows; it is re-read after every completion
+        controller = get_concurrency_controller()
+        running: set[asyncio.Task] = set()
+        while queue or running:
+            while queue and len(running) < controller.limit:
+                resume_id, resume_jd_id = queue.pop(0)
+                running.add(
+                    asyncio.create_task(
+                        _process_resume_in_session(
+                            resume_id, resume_jd_id, agent, cheap_agent, screen_agent, processed_by
+                        )
+                    )
+                )
+            _, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+
+        batch_elapsed = time.perf_counter() - batch_started
+        WORKER_BATCH_DURATION.observe(batch_elapsed)
+
         logger.info(
-            "Resume worker: finished batch, attempted %d resumes", len(pending)
+            "Resume worker: finished batch, attempted %d resumes in %.2fs",
+            len(pending),
+            batch_elapsed,
         )
         return len(pending)
     finally:
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 import os
 import shutil
@@ -6,7 +7,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models.resume import Resume, ResumeAnalysis
+from app.models.resume import Resume, ResumeAnalysis, ResumeSkill
 from app.models.job_description import JobDescription
 from app.models.api import (
     ResumeUploadResponse,
@@ -14,8 +15,17 @@ from app.models.api import (
     ResumeListResponse,
     ResumeDeleteResponse,
     ResumeMoveResponse,
+    PoolMatchItem,
+    PoolMatchResponse,
 )
 from app.models.feedback import ResumeFeedback
+from app.services.analysis_checkpoint import delete_analysis_checkpoint
+from app.services.embeddings import embed_text
+from app.services.file_readers import read_file_to_text
+from app.services.resume_enrichment import remove_resume_enrichment
+from app.services.search_index import index_resume_analysis
+from app.services.skill_extraction import canonical_skill, parse_skill_list
+from app.services.vector_index import get_resume_vector_index
 
 
 def create_resume(
@@ -25,12 +35,14 @@ def create_resume(
     file_name: str,
     file_location: str,
     uploaded_by: str | None,
+    correlation_id: str | None = None,
 ) -> ResumeUploadResponse:
     resume = Resume(
         jd_id=jd_id,
         file_name=file_name or "uploaded_resume",
         file_location=file_location,
         uploaded_by=uploaded_by,
+        correlation_id=correlation_id,
         is_active=True,
     )
     db.add(resume)
@@ -61,10 +73,23 @@ def create_resume(
     )
 
 
-def list_resumes_by_jd(db: Session, jd_id: int | None = None) -> ResumeListResponse:
+def list_resumes_by_jd(
+    db: Session,
+    jd_id: int | None = None,
+    skills: List[str] | None = None,
+) -> ResumeListResponse:
+    """List resumes, optionally for one JD and having every given skill (resume_skill lookup)."""
+
     query = db.query(Resume)
     if jd_id is not None:
         query = query.filter(Resume.jd_id == jd_id)
+    for skill in skills or []:
+        canonical, _ = canonical_skill(skill)
+        query = query.filter(
+            Resume.resume_id.in_(
+                db.query(ResumeSkill.resume_id).filter(ResumeSkill.skill == canonical.lower())
+            )
+        )
 
     resumes = query.all()
 
@@ -84,6 +109,8 @@ def list_resumes_by_jd(db: Session, jd_id: int | None = None) -> ResumeListRespo
                 candidate_name=r.candidate_name,
                 candidate_email=r.candidate_email,
                 candidate_phone=r.candidate_phone,
+                lexical_score=r.lexical_score,
+                skills=parse_skill_list(r.parsed_skills),
             )
         )
 
@@ -201,6 +228,9 @@ def delete_resume(db: Session, resume_id: int) -> ResumeDeleteResponse | None:
     # Delete related feedback records
     db.query(ResumeFeedback).filter(ResumeFeedback.resume_id == resume_id).delete()
 
+    # And an analysis reply the worker has not stored yet
+    delete_analysis_checkpoint(db, resume_id)
+
     # Delete the resume itself
     db.delete(resume)
 
@@ -215,6 +245,8 @@ def delete_resume(db: Session, resume_id: int) -> ResumeDeleteResponse | None:
         ):
             jd.processed_resumes_count -= 1
 
+    remove_resume_enrichment(db, resume_id)
+
     db.commit()
     return ResumeDeleteResponse(
         resume_id=resume_id,
@@ -242,6 +274,33 @@ def update_resume_business_status(
     return resume
 
 
+def promote_resume(db: Session, *, resume_id: int) -> Optional[Resume]:
+    """Queue a resume for full analysis, skipping the lexical and LLM screens.
+
+    Meant for screened_out resumes; the screen score and reason are kept for
+    reference. Raises 409 if the resume already has its full analysis.
+    """
+
+    resume = db.query(Resume).filter(Resume.resume_id == resume_id).first()
+    if not resume:
+        return None
+
+    if resume.status == "processed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Resume already has a full analysis",
+        )
+
+    resume.force_full_analysis = True
+    resume.status = "new"
+    resume.failure_reason = None
+    resume.updated_at = datetime.utcnow()
+    db.add(resume)
+    db.commit()
+    db.refresh(resume)
+    return resume
+
+
 def _move_resume_file_to_target_jd(current_file_location: str | None, target_jd_id: int) -> str | None:
     if not current_file_location:
         return current_file_location
@@ -324,12 +383,17 @@ def move_resume_to_jd(
     # Re-link resume to target JD
     resume.jd_id = target_jd_id
 
-    # Reset status so it can be evaluated against new JD context
+    # Reset status so it can be evaluated against new JD context; the quick
+    # screen and a promotion were against the old JD too
     resume.status = "new"
     resume.failure_reason = None
+    resume.screen_score = None
+    resume.screen_reason = None
+    resume.force_full_analysis = False
 
     # Remove old analysis records because they belong to old JD context
     db.query(ResumeAnalysis).filter(ResumeAnalysis.resume_id == resume.resume_id).delete()
+    delete_analysis_checkpoint(db, resume.resume_id)
 
     # Update JD counters
     if source_jd is not None:
@@ -340,6 +404,7 @@ def move_resume_to_jd(
     db.add(target_jd)
 
     db.add(resume)
+    index_resume_analysis(db, resume=resume, analysis=None)
     db.commit()
     db.refresh(resume)
 
@@ -351,3 +416,82 @@ def move_resume_to_jd(
         status=resume.status,
         message="Resume moved to target JD successfully",
     )
+
+
+def latest_match_scores(db: Session, resume_ids: list[int]) -> dict[int, float | None]:
+    """resume_id -> match_score of its most recent analysis (resumes without one are absent)."""
+
+    if not resume_ids:
+        return {}
+    rows = (
+        db.query(ResumeAnalysis.resume_id, ResumeAnalysis.match_score)
+        .filter(ResumeAnalysis.resume_id.in_(resume_ids))
+        .order_by(ResumeAnalysis.analysis_id.asc())
+        .all()
+    )
+    return {resume_id: match_score for resume_id, match_score in rows}
+
+
+def find_pool_matches(
+    db: Session,
+    *,
+    jd: JobDescription,
+    top_k: int,
+    include_same_jd: bool = False,
+) -> PoolMatchResponse:
+    """Nearest resumes across the whole pool to a JD by embedding similarity.
+
+    Resumes already uploaded against this JD are excluded unless
+    include_same_jd is set. No LLM call is made.
+    """
+
+    try:
+        jd_text = read_file_to_text(jd.file_saved_location)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Failed to read job description text: {exc}",
+        )
+
+    exclude: set[int] = set()
+    if not include_same_jd:
+        exclude = {
+            resume_id
+            for (resume_id,) in db.query(Resume.resume_id).filter(Resume.jd_id == jd.jd_id).all()
+        }
+
+    index = get_resume_vector_index()
+    hits, method = index.search(embed_text(jd_text), top_k, exclude=exclude)
+
+    hit_ids = [resume_id for resume_id, _ in hits]
+    resumes = {
+        resume.resume_id: resume
+        for resume in db.query(Resume).filter(Resume.resume_id.in_(hit_ids)).all()
+    } if hits else {}
+    match_scores = latest_match_scores(db, hit_ids)
+
+    items: list[PoolMatchItem] = []
+    for resume_id, similarity in hits:
+        resume = resumes.get(resume_id)
+        if resume is None:
+            # deleted from the DB but not (yet) from the index
+            continue
+        items.append(
+            PoolMatchItem(
+                resume_id=resume.resume_id,
+                jd_id=resume.jd_id,
+                file_name=resume.file_name,
+                candidate_name=resume.candidate_name,
+                similarity=round(similarity, 4),
+                match_score=match_scores.get(resume.resume_id),
+                status=resume.status,
+            )
+        )
+
+    return PoolMatchResponse(
+        jd_id=jd.jd_id,
+        top_k=top_k,
+        index_size=len(index),
+        search_method=method,
+        items=items,
+    )
@@ -0,0 +1,316 @@
+"""Full-text keyword search over resumes and their analyses.
+
+SQLite uses an FTS5 table (`resume_search_fts`, created by sql/init.sql,
+rowid = resume_id). Postgres uses `resume_search_document` with a weighted
+tsvector column behind a GIN index (created by `ensure_search_schema`).
+
+Each document has three weighted fields: candidate (name, email, phone,
+skills), analysis (summary and issues) and the extracted resume text. The
+text is indexed at upload, the other fields after analysis; rows are removed
+with the resume.
+"""
+
+import json
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.api import SearchResponse, SearchResultItem
+from app.models.resume import Resume, ResumeAnalysis
+
+
+logger = logging.getLogger(__name__)
+
+# Cap on indexed resume text (Postgres tsvectors are limited to 1 MB)
+MAX_INDEXED_TEXT_CHARS = 200_000
+
+# Field weights for FTS5 bm25(): candidate, analysis, resume_text
+_FTS5_WEIGHTS = "10.0, 4.0, 1.0"
+
+_PG_DOCUMENT_SQL = (
+    "setweight(to_tsvector('english', coalesce({candidate}, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({analysis}, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce({resume_text}, '')), 'D')"
+)
+
+_QUERY_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def ensure_search_schema(engine: Engine) -> None:
+    """Create the Postgres search table and GIN index (SQLite gets FTS5 from init.sql)."""
+
+    if engine.dialect.name != "postgresql":
+        return
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS resume_search_document (
+                    resume_id INTEGER PRIMARY KEY,
+                    jd_id INTEGER NOT NULL,
+                    candidate TEXT,
+                    analysis TEXT,
+                    resume_text TEXT,
+                    document TSVECTOR NOT NULL
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_resume_search_document_document "
+                "ON resume_search_document USING GIN (document)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_resume_search_document_jd_id "
+                "ON resume_search_document (jd_id)"
+            )
+        )
+
+
+def _candidate_text(resume: Resume) -> str:
+    parts = [resume.candidate_name, resume.candidate_email, resume.candidate_phone, resume.parsed_skills]
+    return " ".join(part for part in parts if part)
+
+
+def _analysis_text(analysis: ResumeAnalysis | None) -> str:
+    if analysis is None:
+        return ""
+    parts = [analysis.summary or ""]
+    if analysis.issues:
+        try:
+            issues = json.loads(analysis.issues)
+        except (TypeError, ValueError):
+            issues = analysis.issues
+        if isinstance(issues, list):
+            parts.extend(str(issue) for issue in issues)
+        else:
+            parts.append(str(issues))
+    return "\n".join(part for part in parts if part)
+
+
+def index_resume_text(db: Session, *, resume_id: int, jd_id: int, resume_text: str) -> None:
+    """Insert (or replace) the search document for a freshly uploaded resume.
+
+    The caller commits.
+    """
+
+    params = {
+        "resume_id": resume_id,
+        "jd_id": jd_id,
+        "resume_text": (resume_text or "")[:MAX_INDEXED_TEXT_CHARS],
+    }
+    if _is_postgres(db):
+        document = _PG_DOCUMENT_SQL.format(candidate="NULL", analysis="NULL", resume_text=":resume_text")
+        db.execute(
+            text(
+                f"""
+                INSERT INTO resume_search_document (resume_id, jd_id, candidate, analysis, resume_text, document)
+                VALUES (:resume_id, :jd_id, NULL, NULL, :resume_text, {document})
+                ON CONFLICT (resume_id) DO UPDATE SET
+                    jd_id = EXCLUDED.jd_id,
+                    resume_text = EXCLUDED.resume_text,
+                    document = {_PG_DOCUMENT_SQL.format(
+                        candidate="resume_search_document.candidate",
+                        analysis="resume_search_document.analysis",
+                        resume_text="EXCLUDED.resume_text",
+                    )}
+                """
+            ),
+            params,
+        )
+    else:
+        db.execute(
+            text(
+                "INSERT OR REPLACE INTO resume_search_fts (rowid, candidate, analysis, resume_text, jd_id) "
+                "VALUES (:resume_id, '', '', :resume_text, :jd_id)"
+            ),
+            params,
+        )
+
+
+def index_resume_analysis(db: Session, *, resume: Resume, analysis: ResumeAnalysis | None) -> None:
+    """Refresh the candidate/analysis fields and JD of an indexed resume.
+
+    Called when an analysis is persisted and when a resume moves to another
+    JD (analysis None). Resumes without a search document (uploaded before
+    the index existed) are left to the backfill. The caller commits.
+    """
+
+    params = {
+        "resume_id": resume.resume_id,
+        "jd_id": resume.jd_id,
+        "candidate": _candidate_text(resume),
+        "analysis": _analysis_text(analysis),
+    }
+    if _is_postgres(db):
+        document = _PG_DOCUMENT_SQL.format(candidate=":candidate", analysis=":analysis", resume_text="resume_text")
+        db.execute(
+            text(
+                f"""
+                UPDATE resume_search_document
+                SET jd_id = :jd_id, candidate = :candidate, analysis = :analysis, document = {document}
+                WHERE resume_id = :resume_id
+                """
+            ),
+            params,
+        )
+    else:
+        db.execute(
+            text(
+                "UPDATE resume_search_fts SET jd_id = :jd_id, candidate = :candidate, analysis = :analysis "
+                "WHERE rowid = :resume_id"
+            ),
+            params,
+        )
+
+
+def remove_resume_from_search(db: Session, resume_id: int) -> None:
+    """Delete a resume's search document. The caller commits."""
+
+    if _is_postgres(db):
+        db.execute(text("DELETE FROM resume_search_document WHERE resume_id = :resume_id"), {"resume_id": resume_id})
+    else:
+        db.execute(text("DELETE FROM resume_search_fts WHERE rowid = :resume_id"), {"resume_id": resume_id})
+
+
+def is_resume_indexed(db: Session, resume_id: int) -> bool:
+    if _is_postgres(db):
+        sql = "SELECT 1 FROM resume_search_document WHERE resume_id = :resume_id"
+    else:
+        sql = "SELECT 1 FROM resume_search_fts WHERE rowid = :resume_id"
+    return db.execute(text(sql), {"resume_id": resume_id}).first() is not None
+
+
+def _fts5_query(query: str) -> str:
+    """User query -> FTS5 MATCH expression.
+
+    Every term must match (AND); "double quoted" text is a phrase and a
+    trailing * makes a prefix term. Everything is quoted, so FTS5 operators
+    and column filters in user input are treated as plain text.
+    """
+
+    terms: list[str] = []
+    for phrase, word in _QUERY_TERM_RE.findall(query):
+        raw = phrase or word
+        prefix = bool(word) and raw.endswith("*")
+        raw = raw.rstrip("*") if prefix else raw
+        if not re.search(r"\w", raw):
+            continue
+        quoted = '"' + raw.replace('"', '""') + '"'
+        terms.append(quoted + ("*" if prefix else ""))
+    return " AND ".join(terms)
+
+
+def search_resumes(
+    db: Session,
+    *,
+    query: str,
+    jd_ids: list[int] | None = None,
+    status: str | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> SearchResponse:
+    """Ranked keyword search with optional JD/status filters and pagination."""
+
+    params: dict = {"limit": limit, "offset": offset}
+    filters: list[str] = []
+    if jd_ids:
+        placeholders = ", ".join(f":jd_{i}" for i in range(len(jd_ids)))
+        params.update({f"jd_{i}": jd_id for i, jd_id in enumerate(jd_ids)})
+        filters.append(f"r.jd_id IN ({placeholders})")
+    if status:
+        params["status"] = status
+        filters.append("r.status = :status")
+    extra_where = "".join(f" AND {clause}" for clause in filters)
+
+    if _is_postgres(db):
+        params["query"] = query
+        matches = f"""
+            FROM resume_search_document s
+            JOIN resume_details r ON r.resume_id = s.resume_id
+            WHERE s.document @@ websearch_to_tsquery('english', :query){extra_where}
+        """
+        total = db.execute(text(f"SELECT COUNT(*) {matches}"), params).scalar() or 0
+        rows = db.execute(
+            text(
+                f"""
+                SELECT page.resume_id, page.rank,
+                       ts_headline('english', s.resume_text, websearch_to_tsquery('english', :query),
+                                   'MaxFragments=1, MaxWords=24, MinWords=8, StartSel=[, StopSel=]')
+                FROM (
+                    SELECT s.resume_id,
+                           ts_rank_cd(s.document, websearch_to_tsquery('english', :query)) AS rank
+                    {matches}
+                    ORDER BY rank DESC, s.resume_id DESC
+                    LIMIT :limit OFFSET :offset
+                ) page
+                JOIN resume_search_document s ON s.resume_id = page.resume_id
+                ORDER BY page.rank DESC, page.resume_id DESC
+                """
+            ),
+            params,
+        ).all()
+    else:
+        match_query = _fts5_query(query)
+        if not match_query:
+            return SearchResponse(query=query, total=0, limit=limit, offset=offset, items=[])
+        params["query"] = match_query
+        matches = f"""
+            FROM resume_search_fts
+            JOIN resume_details r ON r.resume_id = resume_search_fts.rowid
+            WHERE resume_search_fts MATCH :query{extra_where}
+        """
+        total = db.execute(text(f"SELECT COUNT(*) {matches}"), params).scalar() or 0
+        rows = db.execute(
+            text(
+                f"""
+                SELECT resume_search_fts.rowid,
+                       -bm25(resume_search_fts, {_FTS5_WEIGHTS}) AS rank,
+                       snippet(resume_search_fts, 2, '[', ']', '...', 16)
+                {matches}
+                ORDER BY bm25(resume_search_fts, {_FTS5_WEIGHTS}), resume_search_fts.rowid DESC
+                LIMIT :limit OFFSET :offset
+                """
+            ),
+            params,
+        ).all()
+
+    from app.services.resume_service import latest_match_scores
+
+    resume_ids = [row[0] for row in rows]
+    match_scores = latest_match_scores(db, resume_ids)
+    resumes = {
+        resume.resume_id: resume
+        for resume in db.query(Resume).filter(Resume.resume_id.in_(resume_ids)).all()
+    } if resume_ids else {}
+
+    items: list[SearchResultItem] = []
+    for resume_id, rank, snippet in rows:
+        resume = resumes.get(resume_id)
+        if resume is None:
+            continue
+        items.append(
+            SearchResultItem(
+                resume_id=resume.resume_id,
+                jd_id=resume.jd_id,
+                file_name=resume.file_name,
+                candidate_name=resume.candidate_name,
+                status=resume.status,
+                match_score=match_scores.get(resume.resume_id),
+                rank=round(float(rank), 6),
+                snippet=snippet or None,
+            )
+        )
+
+    return SearchResponse(query=query, total=total, limit=limit, offset=offset, items=items)
@@ -0,0 +1,240 @@
+"""Deterministic skill extraction with an Aho-Corasick automaton.
+
+All taxonomy names and aliases are compiled into one automaton, so a resume
+is scanned once regardless of taxonomy size. Matches must sit on word
+boundaries ("java" does not match inside "javascript", "c" never matches
+inside "c++").
+"""
+
+import json
+import re
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.models.resume import Resume, ResumeSkill
+from app.services.skill_taxonomy import SKILL_TAXONOMY, UNMATCHED_CANONICAL_NAMES
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class ExtractedSkill:
+    skill: str  # canonical name
+    category: str
+    mentions: int
+
+
+class _Automaton:
+    def __init__(self, patterns: dict[str, int]):
+        # pattern text -> payload index; states are dict-based tries
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list[tuple[int, int]]] = [[]]  # (payload, pattern length)
+
+        for pattern, payload in patterns.items():
+            state = 0
+            for char in pattern:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append((payload, len(pattern)))
+
+        # breadth-first failure links; depth-1 states fail to the root
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0) if state else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yield (payload, start, end) for every pattern occurrence."""
+
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for payload, length in self.out[state]:
+                yield payload, index - length + 1, index + 1
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", (text or "").lower())
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char in "+#"
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    """No word character touches the match; a dot joining two words counts
+    as a word character ("js" is not a mention inside "node.js")."""
+
+    if start > 0:
+        before = text[start - 1]
+        if _is_word_char(before) or (before == "." and start > 1 and text[start - 2].isalnum()):
+            return False
+    if end < len(text):
+        after = text[end]
+        if _is_word_char(after) or (after == "." and end + 1 < len(text) and text[end + 1].isalnum()):
+            return False
+    return True
+
+
+_skills: list[tuple[str, str]] = []  # payload -> (canonical, category)
+_canonical_by_alias: dict[str, int] = {}
+_automaton: _Automaton | None = None
+_automaton_lock = threading.Lock()
+
+
+def _get_automaton() -> _Automaton:
+    global _automaton
+    with _automaton_lock:
+        if _automaton is None:
+            patterns: dict[str, int] = {}
+            for category, skills in SKILL_TAXONOMY.items():
+                for canonical, aliases in skills.items():
+                    payload = len(_skills)
+                    _skills.append((canonical, category))
+                    names = list(aliases)
+                    if canonical not in UNMATCHED_CANONICAL_NAMES:
+                        names.append(canonical)
+                    for name in names:
+                        patterns.setdefault(_normalize(name), payload)
+                    _canonical_by_alias.setdefault(_normalize(canonical), payload)
+                    for alias in aliases:
+                        _canonical_by_alias.setdefault(_normalize(alias), payload)
+            _automaton = _Automaton(patterns)
+        return _automaton
+
+
+def extract_skills(text: str) -> list[ExtractedSkill]:
+    """Taxonomy skills mentioned in the text, most-mentioned first."""
+
+    automaton = _get_automaton()
+    normalized = _normalize(text)
+    spans: dict[int, list[tuple[int, int]]] = defaultdict(list)
+    for payload, start, end in automaton.iter_matches(normalized):
+        if _on_word_boundary(normalized, start, end):
+            spans[payload].append((start, end))
+
+    # overlapping aliases of one skill ("aws lambda" / "lambda") are one mention
+    counts: dict[int, int] = {}
+    for payload, matches in spans.items():
+        mentions = 0
+        covered_until = -1
+        for start, end in sorted(matches):
+            if start >= covered_until:
+                mentions += 1
+            covered_until = max(covered_until, end)
+        counts[payload] = mentions
+
+    return [
+        ExtractedSkill(skill=_skills[payload][0], category=_skills[payload][1], mentions=mentions)
+        for payload, mentions in sorted(counts.items(), key=lambda item: (-item[1], _skills[item[0]][0]))
+    ]
+
+
+def canonical_skill(name: str) -> tuple[str, str | None]:
+    """(canonical name, category) for a skill name or alias; unknown names come back trimmed."""
+
+    _get_automaton()
+    payload = _canonical_by_alias.get(_normalize(name).strip())
+    if payload is None:
+        return name.strip(), None
+    return _skills[payload]
+
+
+def store_resume_skills(
+    db: Session,
+    *,
+    resume: Resume,
+    taxonomy_skills: list[ExtractedSkill] | None = None,
+    llm_skills: list[str] | None = None,
+) -> list[str]:
+    """Write resume_skill rows and refresh Resume.parsed_skills (JSON list).
+
+    Taxonomy rows are replaced when taxonomy_skills is given, LLM rows when
+    llm_skills is given; an LLM skill that maps to a taxonomy skill already
+    found in the text is not stored twice. The caller commits.
+    """
+
+    if taxonomy_skills is not None:
+        db.query(ResumeSkill).filter(
+            ResumeSkill.resume_id == resume.resume_id, ResumeSkill.source == "taxonomy"
+        ).delete()
+        for extracted in taxonomy_skills:
+            db.add(
+                ResumeSkill(
+                    resume_id=resume.resume_id,
+                    skill=extracted.skill.lower(),
+                    display_name=extracted.skill,
+                    category=extracted.category,
+                    source="taxonomy",
+                    mentions=extracted.mentions,
+                )
+            )
+        db.flush()
+
+    if llm_skills is not None:
+        db.query(ResumeSkill).filter(
+            ResumeSkill.resume_id == resume.resume_id, ResumeSkill.source == "llm"
+        ).delete()
+        known = {
+            skill
+            for (skill,) in db.query(ResumeSkill.skill).filter(ResumeSkill.resume_id == resume.resume_id).all()
+        }
+        for name in llm_skills:
+            if not isinstance(name, str) or not name.strip():
+                continue
+            display_name, category = canonical_skill(name[:100])
+            if display_name.lower() in known:
+                continue
+            known.add(display_name.lower())
+            db.add(
+                ResumeSkill(
+                    resume_id=resume.resume_id,
+                    skill=display_name.lower(),
+                    display_name=display_name,
+                    category=category,
+                    source="llm",
+                )
+            )
+        db.flush()
+
+    names = [
+        display_name
+        for (display_name,) in db.query(ResumeSkill.display_name)
+        .filter(ResumeSkill.resume_id == resume.resume_id)
+        .order_by(ResumeSkill.source.desc(), ResumeSkill.mentions.desc(), ResumeSkill.display_name.asc())
+        .all()
+    ]
+    resume.parsed_skills = json.dumps(names)
+    db.add(resume)
+    return names
+
+
+def parse_skill_list(parsed_skills: str | None) -> list[str] | None:
+    """Decode Resume.parsed_skills for API responses."""
+
+    if not parsed_skills:
+        return None
+    try:
+        value = json.loads(parsed_skills)
+    except ValueError:
+        return [part.strip() for part in parsed_skills.split(",") if part.strip()]
+    return [str(item) for item in value] if isinstance(value, list) else None
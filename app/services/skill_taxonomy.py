@@ -0,0 +1,125 @@
+"""Curated skill taxonomy for deterministic skill extraction.
+
+category -> canonical skill name -> aliases (matched case-insensitively on
+word boundaries; the canonical name is matched too unless it is listed in
+UNMATCHED_CANONICAL_NAMES). Names that are ordinary English words or single
+letters ("go", "r", "rust", "swift") are matched only through their
+unambiguous aliases.
+"""
+
+UNMATCHED_CANONICAL_NAMES = frozenset({"Go", "R", "Rust", "Swift"})
+
+SKILL_TAXONOMY: dict[str, dict[str, list[str]]] = {
+    "language": {
+        "Python": ["python3", "python 3"],
+        "Java": ["java 8", "java 11", "java 17", "core java"],
+        "JavaScript": ["javascript", "js", "ecmascript", "es6"],
+        "TypeScript": ["typescript"],
+        "C++": ["cpp", "c plus plus"],
+        "C#": ["csharp", "c sharp"],
+        "Go": ["golang"],
+        "Rust": ["rustlang", "rust programming"],
+        "Kotlin": [],
+        "Scala": [],
+        "Ruby": [],
+        "PHP": [],
+        "Swift": ["swiftui", "swift programming"],
+        "Objective-C": ["objective c", "objc"],
+        "R": ["r programming", "r language", "rstudio"],
+        "SQL": ["t-sql", "tsql", "pl/sql", "plsql"],
+        "Bash": ["shell scripting", "bash scripting"],
+        "Perl": [],
+        "MATLAB": [],
+        "Dart": [],
+        "Elixir": [],
+        "Haskell": [],
+    },
+    "framework": {
+        "Spring Boot": ["springboot", "spring framework", "spring mvc"],
+        "Django": ["django rest framework", "drf"],
+        "Flask": [],
+        "FastAPI": ["fast api"],
+        "Node.js": ["nodejs", "node js"],
+        "Express": ["express.js", "expressjs"],
+        "React": ["react.js", "reactjs", "react native"],
+        "Angular": ["angularjs", "angular.js"],
+        "Vue.js": ["vue", "vuejs"],
+        "Next.js": ["nextjs"],
+        ".NET": ["dotnet", "asp.net", ".net core", "asp.net core"],
+        "Ruby on Rails": ["rails", "ror"],
+        "Laravel": [],
+        "Hibernate": [],
+        "TensorFlow": [],
+        "PyTorch": ["torch"],
+        "scikit-learn": ["sklearn", "scikit learn"],
+        "Pandas": [],
+        "NumPy": [],
+        "Apache Spark": ["spark", "pyspark"],
+        "Hadoop": [],
+        "LangChain": [],
+        "GraphQL": [],
+        "gRPC": [],
+        "REST APIs": ["rest api", "restful", "restful apis", "rest services"],
+        "Microservices": ["microservice", "micro services"],
+    },
+    "data": {
+        "PostgreSQL": ["postgres", "postgresql"],
+        "MySQL": [],
+        "MongoDB": ["mongo"],
+        "Redis": [],
+        "Elasticsearch": ["elastic search", "opensearch"],
+        "Cassandra": [],
+        "DynamoDB": ["dynamo db"],
+        "Oracle Database": ["oracle db", "oracle database"],
+        "SQL Server": ["mssql", "ms sql", "microsoft sql server"],
+        "SQLite": [],
+        "Snowflake": [],
+        "BigQuery": ["big query"],
+        "Kafka": ["apache kafka"],
+        "RabbitMQ": ["rabbit mq"],
+        "Airflow": ["apache airflow"],
+        "dbt": [],
+    },
+    "cloud": {
+        "AWS": ["amazon web services", "ec2", "s3", "lambda", "aws lambda"],
+        "Azure": ["microsoft azure"],
+        "GCP": ["google cloud", "google cloud platform"],
+        "Docker": ["containers", "containerization"],
+        "Kubernetes": ["k8s", "eks", "aks", "gke"],
+        "Terraform": [],
+        "Ansible": [],
+        "Jenkins": [],
+        "GitHub Actions": [],
+        "GitLab CI": ["gitlab ci/cd"],
+        "CI/CD": ["ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+        "Linux": ["unix"],
+        "Git": [],
+        "Prometheus": [],
+        "Grafana": [],
+        "Helm": [],
+    },
+    "certification": {
+        "AWS Certified Solutions Architect": ["aws solutions architect", "aws certified solutions architect"],
+        "AWS Certified Developer": ["aws certified developer"],
+        "Azure Administrator": ["az-104", "azure administrator associate"],
+        "Google Professional Cloud Architect": ["professional cloud architect"],
+        "CKA": ["certified kubernetes administrator"],
+        "CKAD": ["certified kubernetes application developer"],
+        "PMP": ["project management professional"],
+        "Scrum Master": ["csm", "certified scrum master", "psm"],
+        "CISSP": [],
+        "CompTIA Security+": ["security+", "comptia security plus"],
+        "Oracle Certified Java Programmer": ["ocjp", "ocpjp", "oracle certified professional java"],
+    },
+    "practice": {
+        "Machine Learning": ["ml", "machine-learning"],
+        "Deep Learning": [],
+        "NLP": ["natural language processing"],
+        "Computer Vision": [],
+        "Data Engineering": [],
+        "DevOps": [],
+        "Agile": ["scrum", "kanban"],
+        "TDD": ["test driven development", "test-driven development"],
+        "System Design": ["distributed systems"],
+    },
+}
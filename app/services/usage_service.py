@@ -0,0 +1,407 @@
+import json
+import logging
+from datetime import date, datetime
+from functools import lru_cache
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.agents.llm import LLMUsageRecorder
+from app.core.config import settings
+from app.models.resume import ResumeAnalysis
+from app.models.usage import LLMUsageDailyRollup, LLMUsageLog
+
+
+logger = logging.getLogger(__name__)
+
+
+# USD per 1M tokens: (input, output, cached input). Override or extend with
+# LLM_PRICING_JSON, e.g. '{"gpt-4o-mini": [0.15, 0.6, 0.075], "my-model": [1.0, 2.0]}';
+# without a cached price, cached input tokens cost the full input price.
+DEFAULT_MODEL_PRICING_PER_1M: dict[str, tuple[float, float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60, 0.075),
+    "gpt-4o": (2.50, 10.00, 1.25),
+    "gpt-4.1": (2.00, 8.00, 0.50),
+    "gpt-4.1-mini": (0.40, 1.60, 0.10),
+    "gpt-4.1-nano": (0.10, 0.40, 0.025),
+}
+
+# Providers with no per-token price: our own Ollama endpoints, the offline fake
+# and cassette replays
+ZERO_COST_PROVIDERS = {"deepseek", "mistral", "fake", "cassette"}
+
+_ROLLUP_KEY_COLUMNS = ("usage_date", "jd_id", "user_name", "call_type", "llm_provider", "llm_model")
+_ROLLUP_SUM_COLUMNS = ("call_count", "input_tokens", "output_tokens", "llm_latency_ms", "estimated_cost_usd")
+
+
+@lru_cache(maxsize=1)
+def get_model_pricing() -> dict[str, tuple[float, float, float]]:
+    pricing = dict(DEFAULT_MODEL_PRICING_PER_1M)
+    if settings.llm_pricing_json:
+        try:
+            overrides = json.loads(settings.llm_pricing_json)
+            for model, prices in overrides.items():
+                input_price = float(prices[0])
+                cached_price = float(prices[2]) if len(prices) > 2 else input_price
+                pricing[model] = (input_price, float(prices[1]), cached_price)
+        except Exception as exc:
+            logger.warning("Invalid LLM_PRICING_JSON, using defaults: %s", exc)
+    return pricing
+
+
+def estimate_cost_usd(
+    provider: str | None,
+    model: str | None,
+    input_tokens: int | None,
+    output_tokens: int | None,
+    cached_input_tokens: int | None = None,
+) -> float | None:
+    """Estimated USD cost of one call; None when the model has no known price.
+
+    `cached_input_tokens` are part of `input_tokens`, charged at the model's
+    cached-input price.
+    """
+
+    if input_tokens is None and output_tokens is None:
+        return None
+
+    if (provider or "").lower() in ZERO_COST_PROVIDERS:
+        return 0.0
+
+    prices = get_model_pricing().get(model or "")
+    if prices is None:
+        return None
+
+    input_price, output_price, cached_price = prices
+    cached = min(cached_input_tokens or 0, input_tokens or 0)
+    return round(
+        (
+            ((input_tokens or 0) - cached) * input_price
+            + cached * cached_price
+            + (output_tokens or 0) * output_price
+        )
+        / 1_000_000,
+        8,
+    )
+
+
+def _upsert_rollup(db: Session, values: dict) -> None:
+    """Atomically add `values` into the matching daily rollup row."""
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        row = (
+            db.query(LLMUsageDailyRollup)
+            .filter_by(**{key: values[key] for key in _ROLLUP_KEY_COLUMNS})
+            .with_for_update()
+            .first()
+        )
+        if row is None:
+            db.add(LLMUsageDailyRollup(**values))
+        else:
+            for column in _ROLLUP_SUM_COLUMNS:
+                setattr(row, column, (getattr(row, column) or 0) + values[column])
+        return
+
+    stmt = insert(LLMUsageDailyRollup).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(_ROLLUP_KEY_COLUMNS),
+        set_={
+            column: getattr(LLMUsageDailyRollup, column) + stmt.excluded[column]
+            for column in _ROLLUP_SUM_COLUMNS
+        },
+    )
+    db.execute(stmt)
+
+
+def record_llm_usage(
+    db: Session,
+    recorder: LLMUsageRecorder,
+    *,
+    call_type: str,
+    jd_id: int | None = None,
+    resume_id: int | None = None,
+    user_name: str | None = None,
+) -> dict:
+    """Log one LLM-backed operation and add it to the daily rollup.
+
+    Does not commit, so it can share the caller's transaction. Returns the
+    usage fields (tokens, model, provider, latency, cost) for the caller to
+    store alongside its own row.
+    """
+
+    usage = {
+        "llm_provider": recorder.provider,
+        "llm_model": recorder.model,
+        "llm_endpoint": recorder.endpoint,
+        "input_tokens": recorder.input_tokens,
+        "output_tokens": recorder.output_tokens,
+        "cached_input_tokens": recorder.cached_input_tokens,
+        "llm_latency_ms": recorder.latency_ms,
+        "estimated_cost_usd": None,
+    }
+    if not recorder.calls:
+        return usage
+
+    cost = None
+    for call in recorder.calls:
+        call_cost = estimate_cost_usd(
+            call.get("provider"),
+            call.get("model"),
+            call.get("input_tokens"),
+            call.get("output_tokens"),
+            call.get("cached_input_tokens"),
+        )
+        if call_cost is not None:
+            cost = (cost or 0.0) + call_cost
+    usage["estimated_cost_usd"] = cost
+
+    db.add(
+        LLMUsageLog(
+            call_type=call_type,
+            jd_id=jd_id,
+            resume_id=resume_id,
+            user_name=user_name,
+            **usage,
+        )
+    )
+
+    _upsert_rollup(
+        db,
+        {
+            "usage_date": date.today(),
+            "jd_id": jd_id or 0,
+            "user_name": user_name or "",
+            "call_type": call_type,
+            "llm_provider": usage["llm_provider"] or "",
+            "llm_model": usage["llm_model"] or "",
+            "call_count": 1,
+            "input_tokens": usage["input_tokens"] or 0,
+            "output_tokens": usage["output_tokens"] or 0,
+            "llm_latency_ms": usage["llm_latency_ms"] or 0,
+            "estimated_cost_usd": cost or 0.0,
+        },
+    )
+    return usage
+
+
+def _aggregate(
+    db: Session,
+    group_column,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    jd_id: int | None = None,
+    user_name: str | None = None,
+) -> list[tuple]:
+    R = LLMUsageDailyRollup
+    query = db.query(
+        group_column,
+        func.sum(R.call_count),
+        func.sum(R.input_tokens),
+        func.sum(R.output_tokens),
+        func.sum(R.estimated_cost_usd),
+    )
+    if start_date is not None:
+        query = query.filter(R.usage_date >= start_date)
+    if end_date is not None:
+        query = query.filter(R.usage_date <= end_date)
+    if jd_id is not None:
+        query = query.filter(R.jd_id == jd_id)
+    if user_name is not None:
+        query = query.filter(R.user_name == user_name)
+    return query.group_by(group_column).order_by(group_column).all()
+
+
+def _to_item(key: dict, row: tuple) -> dict:
+    _, calls, input_tokens, output_tokens, cost = row
+    return {
+        **key,
+        "calls": int(calls or 0),
+        "input_tokens": int(input_tokens or 0),
+        "output_tokens": int(output_tokens or 0),
+        "estimated_cost_usd": round(float(cost or 0.0), 6),
+    }
+
+
+def usage_by_jd(db: Session, **filters) -> list[dict]:
+    rows = _aggregate(db, LLMUsageDailyRollup.jd_id, **filters)
+    return [_to_item({"jd_id": row[0] or None}, row) for row in rows]
+
+
+def usage_by_user(db: Session, **filters) -> list[dict]:
+    rows = _aggregate(db, LLMUsageDailyRollup.user_name, **filters)
+    return [_to_item({"user_name": row[0] or None}, row) for row in rows]
+
+
+def usage_by_day(db: Session, **filters) -> list[dict]:
+    rows = _aggregate(db, LLMUsageDailyRollup.usage_date, **filters)
+    items = []
+    for row in rows:
+        day = row[0]
+        day_str = day.isoformat() if isinstance(day, (date, datetime)) else str(day)
+        items.append(_to_item({"usage_date": day_str}, row))
+    return items
+
+
+def cascade_stats_by_jd(
+    db: Session,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    jd_id: int | None = None,
+) -> list[dict]:
+    """Escalation rate and cost savings of the model cascade, per JD.
+
+    The primary-only baseline prices each analysis on LLM_PROVIDER/LLM_MODEL:
+    escalated analyses use their actual primary-tier cost, analyses kept at
+    the cheap tier use the cheap call's token counts at primary prices.
+    """
+
+    A = ResumeAnalysis
+    query = db.query(
+        A.jd_id,
+        A.cascade_tier,
+        A.cascade_escalation_reason,
+        A.estimated_cost_usd,
+        A.cascade_cost_usd,
+        A.cascade_input_tokens,
+        A.cascade_output_tokens,
+    ).filter(A.cascade_tier.isnot(None))
+    if start_date is not None:
+        query = query.filter(func.date(A.processed_at) >= start_date)
+    if end_date is not None:
+        query = query.filter(func.date(A.processed_at) <= end_date)
+    if jd_id is not None:
+        query = query.filter(A.jd_id == jd_id)
+
+    stats: dict[int, dict] = {}
+    for row_jd_id, tier, reason, cost, cascade_cost, cascade_input, cascade_output in query.all():
+        item = stats.setdefault(
+            row_jd_id,
+            {
+                "jd_id": row_jd_id,
+                "analyses": 0,
+                "accepted_cheap": 0,
+                "escalated_uncertain": 0,
+                "escalated_invalid": 0,
+                "actual_cost_usd": 0.0,
+                "primary_only_cost_usd": 0.0,
+            },
+        )
+        item["analyses"] += 1
+        item["actual_cost_usd"] += cost or 0.0
+        if tier == "cheap":
+            item["accepted_cheap"] += 1
+            baseline = estimate_cost_usd(settings.llm_provider, settings.llm_model, cascade_input, cascade_output)
+        else:
+            item["escalated_invalid" if reason == "invalid_output" else "escalated_uncertain"] += 1
+            baseline = (cost or 0.0) - (cascade_cost or 0.0)
+        item["primary_only_cost_usd"] += baseline or 0.0
+
+    items = []
+    for item in sorted(stats.values(), key=lambda value: value["jd_id"]):
+        escalated = item["escalated_uncertain"] + item["escalated_invalid"]
+        items.append(
+            {
+                **item,
+                "escalated": escalated,
+                "escalation_rate": round(escalated / item["analyses"], 4),
+                "actual_cost_usd": round(item["actual_cost_usd"], 6),
+                "primary_only_cost_usd": round(item["primary_only_cost_usd"], 6),
+                "estimated_savings_usd": round(item["primary_only_cost_usd"] - item["actual_cost_usd"], 6),
+            }
+        )
+    return items
+
+
+def prompt_cache_stats(
+    db: Session,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    jd_id: int | None = None,
+    call_type: str | None = None,
+) -> list[dict]:
+    """Provider prompt-cache hits and what they saved, per call type and model.
+
+    Latency is compared between operations that had cached input tokens and
+    those that had none; the uncached baseline prices every input token at
+    the full input price.
+    """
+
+    L = LLMUsageLog
+    query = db.query(
+        L.call_type,
+        L.llm_provider,
+        L.llm_model,
+        L.input_tokens,
+        L.output_tokens,
+        L.cached_input_tokens,
+        L.llm_latency_ms,
+        L.estimated_cost_usd,
+    )
+    if start_date is not None:
+        query = query.filter(func.date(L.created_at) >= start_date)
+    if end_date is not None:
+        query = query.filter(func.date(L.created_at) <= end_date)
+    if jd_id is not None:
+        query = query.filter(L.jd_id == jd_id)
+    if call_type is not None:
+        query = query.filter(L.call_type == call_type)
+
+    stats: dict[tuple, dict] = {}
+    for row_call_type, provider, model, input_tokens, output_tokens, cached, latency_ms, cost in query.all():
+        item = stats.setdefault(
+            (row_call_type, provider or "", model or ""),
+            {
+                "call_type": row_call_type,
+                "llm_provider": provider,
+                "llm_model": model,
+                "calls": 0,
+                "calls_with_cache_hit": 0,
+                "input_tokens": 0,
+                "cached_input_tokens": 0,
+                "_latency": {True: [0, 0], False: [0, 0]},  # cache hit -> [sum ms, count]
+                "actual_cost_usd": 0.0,
+                "uncached_cost_usd": 0.0,
+            },
+        )
+        hit = bool(cached)
+        item["calls"] += 1
+        item["calls_with_cache_hit"] += int(hit)
+        item["input_tokens"] += input_tokens or 0
+        item["cached_input_tokens"] += cached or 0
+        if latency_ms is not None:
+            item["_latency"][hit][0] += latency_ms
+            item["_latency"][hit][1] += 1
+        item["actual_cost_usd"] += cost or 0.0
+        baseline = estimate_cost_usd(provider, model, input_tokens, output_tokens)
+        item["uncached_cost_usd"] += baseline if baseline is not None else cost or 0.0
+
+    def average(total_and_count: list[int]) -> int | None:
+        total, count = total_and_count
+        return round(total / count) if count else None
+
+    items = []
+    for key in sorted(stats):
+        item = stats[key]
+        latency = item.pop("_latency")
+        items.append(
+            {
+                **item,
+                "cached_input_ratio": (
+                    round(item["cached_input_tokens"] / item["input_tokens"], 4) if item["input_tokens"] else 0.0
+                ),
+                "avg_latency_ms_cache_hit": average(latency[True]),
+                "avg_latency_ms_no_cache_hit": average(latency[False]),
+                "actual_cost_usd": round(item["actual_cost_usd"], 6),
+                "uncached_cost_usd": round(item["uncached_cost_usd"], 6),
+                "estimated_savings_usd": round(item["uncached_cost_usd"] - item["actual_cost_usd"], 6),
+            }
+        )
+    return items
@@ -0,0 +1,297 @@
+"""Memory-mapped float32 vector store for resume embeddings.
+
+Files under VECTOR_INDEX_DIR:
+  vectors.f32  float32 [capacity, dim], rows are L2-normalized embeddings
+  ids.i64      int64 [capacity], resume_id per row (-1 = deleted / unused)
+  meta.json    {"dim", "count", "capacity"}
+
+Search is brute-force cosine (matrix @ query) in chunks; past
+VECTOR_INDEX_IVF_MIN_SIZE live vectors an in-memory IVF (k-means lists,
+probing the nearest VECTOR_INDEX_IVF_NPROBE) is built and used instead.
+Writes take an exclusive file lock; readers reload when meta.json changes,
+so the API and worker processes can share the directory. A reader that
+finds the index missing or of another dimension resets it only under the
+same lock, after checking again, so it never truncates files a writer is
+appending to.
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: in-process locking only
+    fcntl = None
+
+_INITIAL_CAPACITY = 1024
+_SEARCH_CHUNK_ROWS = 65536
+_IVF_TRAIN_SAMPLE = 20000
+_IVF_ITERATIONS = 10
+
+
+class _IVFIndex:
+    def __init__(self, centroids: np.ndarray, lists: list[np.ndarray], built_rows: int):
+        self.centroids = centroids
+        self.lists = lists
+        self.built_rows = built_rows
+
+
+class ResumeVectorIndex:
+    def __init__(self, directory: str, dim: int):
+        self.directory = directory
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._file_lock_depth = 0
+        self._meta_mtime: int | None = None
+        self._vectors: np.memmap | None = None
+        self._ids: np.memmap | None = None
+        self._count = 0
+        self._capacity = 0
+        self._rows: dict[int, int] = {}
+        self._ivf: _IVFIndex | None = None
+        os.makedirs(directory, exist_ok=True)
+
+    # -- files -------------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _file_lock(self):
+        with self._lock:
+            # Reentrant: flock on a second descriptor would wait on our own lock
+            if fcntl is None or self._file_lock_depth:
+                self._file_lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._file_lock_depth -= 1
+                return
+            with open(self._path(".lock"), "a+") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._file_lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._file_lock_depth -= 1
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _open_files(self, capacity: int) -> None:
+        for name, dtype, row_size in (("vectors.f32", np.float32, self.dim), ("ids.i64", np.int64, 1)):
+            path = self._path(name)
+            needed = capacity * row_size * np.dtype(dtype).itemsize
+            with open(path, "ab") as f:
+                if f.tell() < needed:
+                    f.truncate(needed)
+        self._vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._ids = np.memmap(self._path("ids.i64"), dtype=np.int64, mode="r+", shape=(capacity,))
+        self._capacity = capacity
+
+    def _write_meta(self) -> None:
+        self._vectors.flush()
+        self._ids.flush()
+        tmp_path = self._path("meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "count": self._count, "capacity": self._capacity}, f)
+        os.replace(tmp_path, self._path("meta.json"))
+        self._meta_mtime = os.stat(self._path("meta.json")).st_mtime_ns
+
+    def _reset(self) -> None:
+        for name in ("vectors.f32", "ids.i64", "meta.json"):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+        self._count = 0
+        self._rows = {}
+        self._ivf = None
+        self._open_files(_INITIAL_CAPACITY)
+        self._ids[:] = -1
+        self._write_meta()
+
+    def _read_meta(self) -> tuple[dict, int] | None:
+        """(meta.json contents, its mtime), or None if there is no index yet."""
+
+        meta_path = self._path("meta.json")
+        try:
+            mtime = os.stat(meta_path).st_mtime_ns
+            if mtime == self._meta_mtime and self._vectors is not None:
+                return {"dim": self.dim}, mtime
+            with open(meta_path, encoding="utf-8") as f:
+                return json.load(f), mtime
+        except FileNotFoundError:
+            return None
+
+    def _load_if_changed(self) -> None:
+        current = self._read_meta()
+        if current is None or current[0].get("dim") != self.dim:
+            # Resetting rewrites the files: only under the writers' lock, and
+            # only if the index is still missing or mismatched once it is held
+            with self._file_lock():
+                current = self._read_meta()
+                if current is None or current[0].get("dim") != self.dim:
+                    if current is not None:
+                        logger.warning(
+                            "Vector index dim %s != EMBEDDING_DIM %s; resetting index (run the backfill)",
+                            current[0].get("dim"),
+                            self.dim,
+                        )
+                    self._reset()
+                    return
+
+        meta, mtime = current
+        if mtime == self._meta_mtime and self._vectors is not None:
+            return
+
+        self._open_files(int(meta["capacity"]))
+        self._count = int(meta["count"])
+        ids = np.asarray(self._ids[: self._count])
+        self._rows = {int(resume_id): row for row, resume_id in enumerate(ids) if resume_id >= 0}
+        self._meta_mtime = mtime
+        self._ivf = None
+
+    # -- writes ------------------------------------------------------------
+
+    def add(self, resume_id: int, vector: np.ndarray) -> None:
+        """Insert or replace the vector for a resume."""
+
+        with self._file_lock():
+            self._load_if_changed()
+            row = self._rows.get(resume_id)
+            if row is None:
+                if self._count == self._capacity:
+                    self._open_files(self._capacity * 2)
+                    self._ids[self._count :] = -1
+                row = self._count
+                self._count += 1
+                self._rows[resume_id] = row
+            self._vectors[row] = vector.astype(np.float32, copy=False)
+            self._ids[row] = resume_id
+            self._write_meta()
+
+    def remove(self, resume_id: int) -> bool:
+        with self._file_lock():
+            self._load_if_changed()
+            row = self._rows.pop(resume_id, None)
+            if row is None:
+                return False
+            self._ids[row] = -1
+            self._vectors[row] = 0.0
+            self._write_meta()
+            return True
+
+    def contains(self, resume_id: int) -> bool:
+        with self._lock:
+            self._load_if_changed()
+            return resume_id in self._rows
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load_if_changed()
+            return len(self._rows)
+
+    # -- search ------------------------------------------------------------
+
+    def _scores_for_rows(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        return np.asarray(self._vectors[rows]) @ query
+
+    def _brute_force(self, query: np.ndarray, limit: int, exclude: set[int]) -> list[tuple[int, float]]:
+        best_rows: list[np.ndarray] = []
+        best_scores: list[np.ndarray] = []
+        for start in range(0, self._count, _SEARCH_CHUNK_ROWS):
+            stop = min(start + _SEARCH_CHUNK_ROWS, self._count)
+            scores = np.asarray(self._vectors[start:stop]) @ query
+            if len(scores) > limit:
+                top = np.argpartition(-scores, limit)[:limit]
+            else:
+                top = np.arange(len(scores))
+            best_rows.append(top + start)
+            best_scores.append(scores[top])
+        if not best_rows:
+            return []
+        return self._collect(np.concatenate(best_rows), np.concatenate(best_scores), limit, exclude)
+
+    def _collect(self, rows: np.ndarray, scores: np.ndarray, limit: int, exclude: set[int]) -> list[tuple[int, float]]:
+        results: list[tuple[int, float]] = []
+        for index in np.argsort(-scores):
+            resume_id = int(self._ids[rows[index]])
+            if resume_id < 0 or resume_id in exclude:
+                continue
+            results.append((resume_id, float(scores[index])))
+            if len(results) >= limit:
+                break
+        return results
+
+    def _build_ivf(self) -> _IVFIndex:
+        rows = np.fromiter(self._rows.values(), dtype=np.int64)
+        n_lists = max(1, int(np.sqrt(len(rows))))
+        rng = np.random.default_rng(0)
+        sample = rows if len(rows) <= _IVF_TRAIN_SAMPLE else rng.choice(rows, _IVF_TRAIN_SAMPLE, replace=False)
+        data = np.asarray(self._vectors[np.sort(sample)])
+        centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+
+        # spherical k-means on the sample
+        for _ in range(_IVF_ITERATIONS):
+            assignment = np.argmax(data @ centroids.T, axis=1)
+            for list_id in range(n_lists):
+                members = data[assignment == list_id]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[list_id] = centroid / norm if norm > 0 else centroid
+
+        assignments = np.empty(self._count, dtype=np.int64)
+        for start in range(0, self._count, _SEARCH_CHUNK_ROWS):
+            stop = min(start + _SEARCH_CHUNK_ROWS, self._count)
+            assignments[start:stop] = np.argmax(np.asarray(self._vectors[start:stop]) @ centroids.T, axis=1)
+        lists = [np.flatnonzero(assignments == list_id) for list_id in range(n_lists)]
+        logger.info("Vector index: built IVF with %d lists over %d vectors", n_lists, self._count)
+        return _IVFIndex(centroids, lists, self._count)
+
+    def _ivf_search(self, query: np.ndarray, limit: int, exclude: set[int]) -> list[tuple[int, float]]:
+        if self._ivf is None or self._count > self._ivf.built_rows * 1.2:
+            self._ivf = self._build_ivf()
+        ivf = self._ivf
+        nprobe = min(settings.vector_index_ivf_nprobe, len(ivf.lists))
+        probe = np.argsort(-(ivf.centroids @ query))[:nprobe]
+        candidate_rows = [ivf.lists[list_id] for list_id in probe]
+        # rows appended since the IVF was built are always scanned
+        candidate_rows.append(np.arange(ivf.built_rows, self._count))
+        rows = np.unique(np.concatenate(candidate_rows))
+        if not len(rows):
+            return []
+        return self._collect(rows, self._scores_for_rows(rows, query), limit, exclude)
+
+    def search(self, query: np.ndarray, top_k: int, exclude: set[int] | None = None) -> tuple[list[tuple[int, float]], str]:
+        """Top-k (resume_id, cosine) pairs and the method used ("brute_force" or "ivf")."""
+
+        exclude = exclude or set()
+        with self._lock:
+            self._load_if_changed()
+            if not self._rows:
+                return [], "brute_force"
+            limit = top_k + len(exclude)
+            ivf_min = settings.vector_index_ivf_min_size
+            if ivf_min > 0 and len(self._rows) >= ivf_min:
+                return self._ivf_search(query, limit, exclude)[:top_k], "ivf"
+            return self._brute_force(query, limit, exclude)[:top_k], "brute_force"
+
+
+_index: ResumeVectorIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_resume_vector_index() -> ResumeVectorIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ResumeVectorIndex(settings.vector_index_dir, settings.embedding_dim)
+        return _index
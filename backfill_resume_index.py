@@ -0,0 +1,11 @@
+from app.models.db import SessionLocal
+from app.services.resume_enrichment import backfill_resume_enrichment
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        count = backfill_resume_enrichment(db)
+    finally:
+        db.close()
+    print(f"Indexed {count} resume(s)")
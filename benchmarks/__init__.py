@@ -0,0 +1,5 @@
+"""End-to-end resume pipeline benchmarks (synthetic corpus + harness).
+
+    python -m benchmarks corpus --out bench/corpus --resumes 500
+    python -m benchmarks run --work-dir bench/sqlite --output bench/sqlite.json
+"""
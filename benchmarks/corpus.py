@@ -0,0 +1,268 @@
+"""Synthetic JD / resume corpus in txt, docx and pdf.
+
+Sizes follow a log-normal word-count distribution (resumes: median ~550
+words, i.e. one to three pages; JDs: median ~350 words). Everything is
+derived from the seed, so the same arguments always produce the same corpus.
+"""
+
+import json
+import math
+import os
+import random
+from dataclasses import asdict, dataclass
+
+
+FIRST_NAMES = [
+    "Aarav", "Priya", "Jane", "Carlos", "Mei", "Olu", "Sofia", "Liam", "Fatima", "Noah",
+    "Anika", "Diego", "Hana", "Ethan", "Zara", "Mateo", "Yuki", "Ravi", "Elena", "Kwame",
+]
+LAST_NAMES = [
+    "Sharma", "Doe", "Garcia", "Chen", "Adeyemi", "Rossi", "Murphy", "Khan", "Smith", "Patel",
+    "Novak", "Silva", "Tanaka", "Müller", "Okafor", "Kowalski", "Nguyen", "Reddy", "Ivanova", "Mensah",
+]
+SKILLS = [
+    "Python", "Java", "Go", "TypeScript", "JavaScript", "C#", "Kotlin", "Rust", "Scala", "SQL",
+    "Spring Boot", "Django", "FastAPI", "Flask", "React", "Angular", "Node.js", ".NET",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Cassandra", "Elasticsearch", "Kafka", "RabbitMQ",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins", "GitHub Actions",
+    "Spark", "Airflow", "dbt", "Snowflake", "TensorFlow", "PyTorch", "GraphQL", "gRPC", "Linux",
+]
+ROLES = [
+    "Backend Engineer", "Frontend Engineer", "Full Stack Engineer", "DevOps Engineer",
+    "Data Engineer", "Platform Engineer", "Site Reliability Engineer", "Machine Learning Engineer",
+]
+LEVELS = ["Junior", "Mid-level", "Senior", "Staff", "Lead"]
+DOMAINS = ["fintech", "healthtech", "e-commerce", "SaaS", "logistics", "gaming", "edtech", "adtech"]
+COMPANIES = [
+    "Acme Corp", "Globex", "Initech", "Umbrella Systems", "Hooli", "Stark Industries",
+    "Wayne Enterprises", "Soylent Labs", "Cyberdyne", "Tyrell Analytics",
+]
+VERBS = [
+    "Designed", "Built", "Led", "Migrated", "Optimized", "Maintained", "Automated",
+    "Scaled", "Refactored", "Implemented", "Owned", "Mentored engineers on",
+]
+OBJECTS = [
+    "a high-throughput event ingestion pipeline", "customer-facing REST APIs",
+    "the CI/CD pipeline", "a multi-tenant billing service", "observability dashboards and alerts",
+    "a real-time recommendation service", "batch ETL jobs", "the authentication platform",
+    "infrastructure as code for all environments", "a search indexing service",
+]
+OUTCOMES = [
+    "reducing p95 latency by 40%", "cutting cloud spend by 25%", "serving 2M requests per day",
+    "improving deployment frequency from weekly to daily", "reducing incident count by half",
+    "supporting 10x traffic growth", "with 99.95% availability",
+]
+
+FORMATS = ("txt", "docx", "pdf")
+
+
+@dataclass
+class CorpusDocument:
+    kind: str  # "jd" or "resume"
+    path: str
+    format: str
+    words: int
+    bytes: int
+
+
+def _target_words(rng: random.Random, median: int, sigma: float, low: int, high: int) -> int:
+    return int(min(max(rng.lognormvariate(math.log(median), sigma), low), high))
+
+
+def _bullet(rng: random.Random, skills: list[str]) -> str:
+    return (
+        f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} "
+        f"and {rng.choice(skills)}, {rng.choice(OUTCOMES)}."
+    )
+
+
+def _fill(lines: list[str], rng: random.Random, target_words: int, make_line) -> list[str]:
+    words = sum(len(line.split()) for line in lines)
+    while words < target_words:
+        line = make_line()
+        lines.append(line)
+        words += len(line.split())
+    return lines
+
+
+def generate_jd_lines(rng: random.Random, target_words: int) -> list[str]:
+    level, role, domain = rng.choice(LEVELS), rng.choice(ROLES), rng.choice(DOMAINS)
+    required = rng.sample(SKILLS, 6)
+    nice = rng.sample([s for s in SKILLS if s not in required], 4)
+    years = {"Junior": 1, "Mid-level": 3, "Senior": 5, "Staff": 8, "Lead": 7}[level]
+    lines = [
+        f"{level} {role}",
+        "",
+        f"We are a {domain} company hiring a {level.lower()} {role.lower()} to join a product team.",
+        f"Required: {', '.join(required)}. {years}+ years of professional experience.",
+        f"Nice to have: {', '.join(nice)}.",
+        "",
+        "Responsibilities:",
+    ]
+    return _fill(lines, rng, target_words, lambda: _bullet(rng, required))
+
+
+def generate_resume_lines(rng: random.Random, target_words: int) -> list[str]:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(SKILLS, rng.randint(6, 14))
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | +1 ({rng.randint(200, 999)}) "
+        f"{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        "",
+        f"Summary: {rng.choice(LEVELS)} {rng.choice(ROLES).lower()} with "
+        f"{rng.randint(1, 15)} years of experience in {rng.choice(DOMAINS)}.",
+        f"Skills: {', '.join(skills)}",
+        "",
+        "Experience:",
+    ]
+    year = 2025
+
+    def next_line() -> str:
+        nonlocal year
+        if rng.random() < 0.15:
+            start = year - rng.randint(1, 4)
+            header = f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({start}-{year})"
+            year = start
+            return header
+        return _bullet(rng, skills)
+
+    return _fill(lines, rng, target_words, next_line)
+
+
+def _write_txt(path: str, lines: list[str]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def _write_docx(path: str, lines: list[str]) -> None:
+    import docx  # python-docx
+
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def _pdf_escape(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(lines: list[str], width: int = 95) -> list[str]:
+    wrapped: list[str] = []
+    for line in lines:
+        while len(line) > width:
+            cut = line.rfind(" ", 0, width)
+            cut = cut if cut > 0 else width
+            wrapped.append(line[:cut])
+            line = line[cut:].lstrip()
+        wrapped.append(line)
+    return wrapped
+
+
+def _write_pdf(path: str, lines: list[str], lines_per_page: int = 55) -> None:
+    """Minimal multi-page PDF (Helvetica text objects) readable by PyPDF2."""
+
+    wrapped = _wrap(lines)
+    pages = [wrapped[i : i + lines_per_page] for i in range(0, len(wrapped), lines_per_page)] or [[]]
+
+    objects: list[bytes] = []
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    for index, page_lines in enumerate(pages):
+        content_id = page_ids[index] + 1
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+            ).encode()
+        )
+        body = "BT /F1 10 Tf 13 TL 50 750 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in page_lines
+        ) + " ET"
+        stream = body.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+
+
+_WRITERS = {"txt": _write_txt, "docx": _write_docx, "pdf": _write_pdf}
+
+
+def _pick_format(rng: random.Random, mix: dict[str, float]) -> str:
+    roll = rng.random() * sum(mix.values())
+    for fmt, weight in mix.items():
+        if roll < weight:
+            return fmt
+        roll -= weight
+    return next(iter(mix))
+
+
+def generate_corpus(
+    output_dir: str,
+    *,
+    jds: int = 3,
+    resumes: int = 100,
+    format_mix: dict[str, float] | None = None,
+    seed: int = 42,
+) -> list[CorpusDocument]:
+    """Write `jds` JDs and `resumes` resumes under output_dir plus a manifest.json."""
+
+    format_mix = format_mix or {"txt": 0.4, "docx": 0.3, "pdf": 0.3}
+    unknown = set(format_mix) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unsupported corpus formats: {', '.join(sorted(unknown))}")
+
+    rng = random.Random(seed)
+    documents: list[CorpusDocument] = []
+
+    for kind, count, generate, median, sigma, low, high in (
+        ("jd", jds, generate_jd_lines, 350, 0.35, 120, 1200),
+        ("resume", resumes, generate_resume_lines, 550, 0.45, 150, 2500),
+    ):
+        directory = os.path.join(output_dir, f"{kind}s")
+        os.makedirs(directory, exist_ok=True)
+        for index in range(count):
+            lines = generate(rng, _target_words(rng, median, sigma, low, high))
+            fmt = _pick_format(rng, format_mix)
+            path = os.path.join(directory, f"{kind}_{index:05d}.{fmt}")
+            _WRITERS[fmt](path, lines)
+            documents.append(
+                CorpusDocument(
+                    kind=kind,
+                    path=os.path.relpath(path, output_dir),
+                    format=fmt,
+                    words=sum(len(line.split()) for line in lines),
+                    bytes=os.path.getsize(path),
+                )
+            )
+
+    with open(os.path.join(output_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {"seed": seed, "format_mix": format_mix, "documents": [asdict(d) for d in documents]},
+            f,
+            indent=2,
+        )
+    return documents
+
+
+def load_corpus(corpus_dir: str) -> list[CorpusDocument]:
+    with open(os.path.join(corpus_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    return [CorpusDocument(**doc) for doc in manifest["documents"]]
@@ -0,0 +1,351 @@
+"""Drive upload -> worker -> analysis read in-process and write a JSON report.
+
+The app reads its database URL and LLM provider at import time, so
+`run_benchmark` sets the environment first and imports `app` afterwards;
+run one benchmark per process.
+"""
+
+import asyncio
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from benchmarks.corpus import CorpusDocument, generate_corpus, load_corpus
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARK_USER = "benchmark"
+BENCHMARK_PASSWORD = "benchmark"
+
+
+def percentiles(samples: list[float]) -> dict[str, float | int]:
+    """count / mean / p50 / p95 / p99 / max in milliseconds (nearest-rank)."""
+
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(rank(50) * 1000, 3),
+        "p95_ms": round(rank(95) * 1000, 3),
+        "p99_ms": round(rank(99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def peak_rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024, 1)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _configure_environment(database_url: str, llm_provider: str, latency: dict[str, str]) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["LLM_PROVIDER"] = llm_provider
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    for key, value in latency.items():
+        os.environ[key] = value
+
+
+def _init_schema(engine) -> None:
+    """Fresh schema: init.sql on SQLite (as at app startup), ORM metadata elsewhere."""
+
+    from app.models.db import Base, sync_schema_columns
+    from app.models.user import User
+    from app.services.search_index import ensure_search_schema
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+
+    if engine.dialect.name == "sqlite":
+        raw_conn = engine.raw_connection()
+        try:
+            with open(os.path.join(REPO_ROOT, "sql", "init.sql"), encoding="utf-8") as f:
+                raw_conn.cursor().executescript(f.read())
+            raw_conn.commit()
+        finally:
+            raw_conn.close()
+        sync_schema_columns()
+    else:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS resume_search_document"))
+        ensure_search_schema(engine)
+
+    with Session(engine) as session:
+        if not session.query(User).filter(User.user_name == BENCHMARK_USER).first():
+            session.add(
+                User(
+                    user_name=BENCHMARK_USER,
+                    password_hash=BENCHMARK_PASSWORD,
+                    role="employee",
+                    created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                )
+            )
+            session.commit()
+
+
+class _QueryCounter:
+    """Counts SQL statements per benchmark phase via a cursor event listener."""
+
+    def __init__(self):
+        self.phase = "setup"
+        self.counts: dict[str, int] = defaultdict(int)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.counts[self.phase] += 1
+
+
+def run_benchmark(
+    *,
+    work_dir: str,
+    db: str = "sqlite",
+    database_url: str | None = None,
+    corpus_dir: str | None = None,
+    jds: int = 3,
+    resumes: int = 100,
+    seed: int = 42,
+    batch_size: int = 10,
+    max_parallel: int = 3,
+    llm_provider: str = "fake",
+    latency_distribution: str = "lognormal",
+    latency_ms: float = 800.0,
+    latency_spread: float = 0.4,
+    ms_per_output_token: float = 0.0,
+    output_schema: str = "full",
+    cassette_path: str | None = None,
+    cassette_mode: str = "replay",
+    cassette_latency_scale: float = 1.0,
+    output: str | None = None,
+) -> dict:
+    """Run one benchmark and return (and optionally write) the report."""
+
+    work_dir = os.path.abspath(work_dir)
+    os.makedirs(work_dir, exist_ok=True)
+
+    if corpus_dir is None:
+        corpus_dir = os.path.join(work_dir, "corpus")
+        documents = generate_corpus(corpus_dir, jds=jds, resumes=resumes, seed=seed)
+    else:
+        corpus_dir = os.path.abspath(corpus_dir)
+        documents = load_corpus(corpus_dir)
+
+    if database_url is None:
+        if db != "sqlite":
+            raise ValueError("--database-url is required for non-SQLite benchmarks")
+        db_path = os.path.join(work_dir, "benchmark.db")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        database_url = f"sqlite:///{db_path}"
+
+    extra_env = {
+        "FAKE_LLM_LATENCY_DISTRIBUTION": latency_distribution,
+        "FAKE_LLM_LATENCY_MS": str(latency_ms),
+        "FAKE_LLM_LATENCY_SPREAD": str(latency_spread),
+        "FAKE_LLM_MS_PER_OUTPUT_TOKEN": str(ms_per_output_token),
+        "RESUME_OUTPUT_SCHEMA": output_schema,
+    }
+    if cassette_path:
+        extra_env.update(
+            {
+                "LLM_CASSETTE_MODE": cassette_mode,
+                "LLM_CASSETTE_PATH": os.path.abspath(cassette_path),
+                "LLM_CASSETTE_LATENCY_SCALE": str(cassette_latency_scale),
+            }
+        )
+    _configure_environment(database_url, llm_provider, extra_env)
+    # Uploads are written relative to the working directory
+    os.chdir(work_dir)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event, func
+
+    from app.core.config import settings
+    from app.core.metrics import add_stage_listener, remove_stage_listener
+    from app.main import app
+    from app.models.db import SessionLocal, engine
+    from app.models.resume import Resume, ResumeAnalysis
+    from app.services.resume_processing_service import run_once
+
+    settings.resume_process_batch_size = batch_size
+    settings.resume_process_max_parallel = max_parallel
+
+    _init_schema(engine)
+    # Resume ids restart with the fresh schema, so stale vectors would alias them
+    shutil.rmtree(settings.vector_index_dir, ignore_errors=True)
+
+    stage_samples: dict[str, list[float]] = defaultdict(list)
+
+    def on_stage(stage: str, elapsed: float) -> None:
+        stage_samples[stage].append(elapsed)
+
+    query_counter = _QueryCounter()
+    event.listen(engine, "before_cursor_execute", query_counter)
+    add_stage_listener(on_stage)
+
+    # No `with`: skip app startup, which would start the background worker
+    client = TestClient(app)
+    try:
+        token = client.post(
+            "/api/auth/login", json={"user_name": BENCHMARK_USER, "password": BENCHMARK_PASSWORD}
+        ).json()["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        jd_docs = [d for d in documents if d.kind == "jd"]
+        resume_docs = [d for d in documents if d.kind == "resume"]
+
+        # Upload phase
+        query_counter.phase = "upload"
+        upload_started = time.perf_counter()
+        jd_ids = []
+        for doc in jd_docs:
+            jd_ids.append(_post_file(client, "/api/jd/upload", corpus_dir, doc, headers, stage_samples, "jd_upload")["jd_id"])
+        resume_ids = []
+        for index, doc in enumerate(resume_docs):
+            url = f"/api/resumes/upload?jd_id={jd_ids[index % len(jd_ids)]}"
+            response = _post_file(client, url, corpus_dir, doc, headers, stage_samples, "resume_upload", field="files")
+            resume_ids.append(response[0]["resume_id"])
+        upload_seconds = time.perf_counter() - upload_started
+
+        # Worker phase: batches until nothing is left in "new" (errors are not retried here)
+        query_counter.phase = "worker"
+        worker_started = time.perf_counter()
+        batches = 0
+        max_batches = math.ceil(len(resume_ids) / max(batch_size, 1)) * 2 + 1
+        while batches < max_batches:
+            batch_started = time.perf_counter()
+            attempted = asyncio.run(run_once(processed_by="benchmark"))
+            if not attempted:
+                break
+            batches += 1
+            stage_samples["worker_batch"].append(time.perf_counter() - batch_started)
+            with SessionLocal() as session:
+                if not session.query(Resume).filter(Resume.status == "new").count():
+                    break
+        worker_seconds = time.perf_counter() - worker_started
+
+        # Read phase
+        query_counter.phase = "read"
+        for resume_id in resume_ids:
+            started = time.perf_counter()
+            client.get(f"/api/resumes/{resume_id}/analysis", headers=headers)
+            stage_samples["analysis_read"].append(time.perf_counter() - started)
+
+        with SessionLocal() as session:
+            outcomes = dict(
+                session.query(Resume.status, func.count(Resume.resume_id)).group_by(Resume.status).all()
+            )
+            analyses, input_tokens, output_tokens, llm_latency_ms = session.query(
+                func.count(ResumeAnalysis.analysis_id),
+                func.sum(ResumeAnalysis.input_tokens),
+                func.sum(ResumeAnalysis.output_tokens),
+                func.sum(ResumeAnalysis.llm_latency_ms),
+            ).one()
+    finally:
+        remove_stage_listener(on_stage)
+        event.remove(engine, "before_cursor_execute", query_counter)
+        client.close()
+
+    processed = outcomes.get("processed", 0)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "db_dialect": engine.dialect.name,
+        },
+        "params": {
+            "jds": len(jd_ids),
+            "resumes": len(resume_ids),
+            "seed": seed,
+            "batch_size": batch_size,
+            "max_parallel": max_parallel,
+            "llm_provider": llm_provider,
+            "latency_distribution": latency_distribution,
+            "latency_ms": latency_ms,
+            "latency_spread": latency_spread,
+            "ms_per_output_token": ms_per_output_token,
+            "output_schema": output_schema,
+            "cassette_mode": cassette_mode if cassette_path else None,
+            "cassette_latency_scale": cassette_latency_scale if cassette_path else None,
+            "formats": _format_counts(resume_docs),
+        },
+        "throughput": {
+            "upload_seconds": round(upload_seconds, 3),
+            "worker_seconds": round(worker_seconds, 3),
+            "worker_batches": batches,
+            "resumes_processed": processed,
+            "resumes_per_minute": round(processed / worker_seconds * 60, 2) if worker_seconds else None,
+            "end_to_end_resumes_per_minute": round(
+                processed / (upload_seconds + worker_seconds) * 60, 2
+            ) if processed else None,
+            "outcomes": outcomes,
+        },
+        "llm_tokens": {
+            "input_tokens": int(input_tokens or 0),
+            "output_tokens": int(output_tokens or 0),
+            "output_tokens_per_analysis": round((output_tokens or 0) / analyses, 1) if analyses else None,
+            "llm_latency_ms_per_analysis": round((llm_latency_ms or 0) / analyses, 1) if analyses else None,
+        },
+        "stages": {stage: percentiles(samples) for stage, samples in sorted(stage_samples.items())},
+        "db_queries": {
+            **dict(query_counter.counts),
+            "total": sum(query_counter.counts.values()),
+            "worker_per_resume": round(query_counter.counts["worker"] / len(resume_ids), 2) if resume_ids else None,
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def _post_file(client, url, corpus_dir, doc: CorpusDocument, headers, stage_samples, stage, field="file"):
+    with open(os.path.join(corpus_dir, doc.path), "rb") as f:
+        payload = f.read()
+    started = time.perf_counter()
+    response = client.post(
+        url,
+        files=[(field, (os.path.basename(doc.path), payload, "application/octet-stream"))],
+        headers=headers,
+    )
+    stage_samples[stage].append(time.perf_counter() - started)
+    response.raise_for_status()
+    return response.json()
+
+
+def _format_counts(documents: list[CorpusDocument]) -> dict[str, int]:
+    counts: dict[str, int] = defaultdict(int)
+    for doc in documents:
+        counts[doc.format] += 1
+    return dict(counts)
@@ -0,0 +1,31 @@
+import argparse
+import logging
+
+from app.models.db import SessionLocal
+from app.services.analysis_reparse import reparse_analyses
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-derive match_score, summary, issues and dimension columns from stored analysis_json"
+    )
+    parser.add_argument("--jd-id", type=int, help="Only analyses of this JD")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows read and updated per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    db = SessionLocal()
+    try:
+        report = reparse_analyses(db, chunk_size=args.chunk_size, jd_id=args.jd_id, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    verb = "would change" if args.dry_run else "changed"
+    print(f"Scanned {report.scanned} analysis row(s): {report.changed} {verb}, {report.invalid} not parseable")
+    for name, count in sorted(report.changed_columns.items(), key=lambda item: -item[1]):
+        print(f"  {name}: {count}")
+    if report.changed_ids:
+        more = " ..." if report.changed > len(report.changed_ids) else ""
+        print(f"  analysis_id(s): {', '.join(map(str, report.changed_ids))}{more}")
+    print(f"Invalid checkpoint(s) now parseable, set back to invoked: {report.checkpoints_recovered}")
@@ -1,5 +1,6 @@
 import asyncio
 from app.core.config import settings
+from app.core.tracing import configure_tracing
 from app.services.resume_processing_service import run_once as run_once_service
 
 
@@ -10,4 +11,5 @@ async def worker_loop():
 
 
 if __name__ == "__main__":
+    configure_tracing()
     asyncio.run(worker_loop())
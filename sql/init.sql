@@ -51,10 +51,22 @@ CREATE TABLE IF NOT EXISTS job_description_details (
     last_reviewed_at DATETIME,
     last_reviewed_by TEXT,
 
+    -- requirement profile sent to resume analysis instead of the JD text,
+    -- with the hash of the JD text it was built from
+    requirement_profile_json TEXT,
+    requirement_profile_hash TEXT,
+    requirement_profile_built_at DATETIME,
+
     -- resume counters
     resumes_uploaded_count INTEGER NOT NULL DEFAULT 0,
     processed_resumes_count INTEGER NOT NULL DEFAULT 0,
 
+    -- screening overrides
+    force_full_analysis BOOLEAN NOT NULL DEFAULT 0,
+    lexical_screen_threshold REAL,
+    screen_cutoff REAL,          -- LLM quick-screen cutoff (0..100); NULL = RESUME_SCREEN_CUTOFF
+    output_schema TEXT,          -- resume analysis output schema (full / compact); NULL = RESUME_OUTPUT_SCHEMA
+
     -- status & audit
     status TEXT NOT NULL DEFAULT 'active',
     uploaded_by TEXT,
@@ -78,12 +90,17 @@ CREATE TABLE IF NOT EXISTS resume_details (
     parsed_summary TEXT,
     parsed_skills TEXT,
     match_score REAL,
+    lexical_score REAL,            -- BM25 pre-screen score (0..1)
+    screen_score REAL,             -- LLM quick-screen estimated match score (0..100)
+    screen_reason TEXT,
+    force_full_analysis BOOLEAN NOT NULL DEFAULT 0, -- promoted: skip the lexical and LLM screens
 
     -- status & audit
-    status TEXT NOT NULL DEFAULT 'new',
+    status TEXT NOT NULL DEFAULT 'new', -- new, processed, error, screened_out
     failure_reason TEXT,
     uploaded_by TEXT,
     business_status TEXT, -- e.g., interview_scheduled, rejected, on_hold
+    correlation_id TEXT,  -- request ID of the upload, carried into the analysis row
     is_active BOOLEAN NOT NULL DEFAULT 1,
     created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME,
@@ -135,9 +152,36 @@ CREATE TABLE IF NOT EXISTS resume_analysis_details (
     consistency_trajectory_score REAL,
     consistency_trajectory_note TEXT,
 
+    -- LLM usage & cost for this analysis
+    llm_provider TEXT,
+    llm_model TEXT,
+    llm_endpoint TEXT,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    cached_input_tokens INTEGER,     -- part of input_tokens served from the prompt cache
+    llm_latency_ms INTEGER,
+    estimated_cost_usd REAL,
+    output_schema TEXT,              -- output schema the analysis was requested in (full / compact)
+    analysis_mode TEXT,              -- single (one call) / fanout (parallel per-dimension calls)
+    contact_keys_requested INTEGER,  -- contact keys the prompt asked for (0-3)
+    prompt_document_tokens INTEGER,  -- JD + resume tokens in the prompt after compaction
+    prompt_tokens_saved INTEGER,     -- tokens removed by compaction
+
+    -- model cascade: producing tier (cheap / primary), escalation reason and
+    -- the cheap model's own result; usage columns above cover both tiers
+    cascade_tier TEXT,
+    cascade_escalation_reason TEXT,
+    cascade_model TEXT,
+    cascade_match_score REAL,
+    cascade_analysis_json TEXT,
+    cascade_input_tokens INTEGER,
+    cascade_output_tokens INTEGER,
+    cascade_cost_usd REAL,
+
     -- audit fields
     processed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     processed_by TEXT,
+    correlation_id TEXT,
 
     FOREIGN KEY (resume_id) REFERENCES resume_details (resume_id),
     FOREIGN KEY (jd_id) REFERENCES job_description_details (jd_id)
@@ -154,3 +198,106 @@ CREATE TABLE IF NOT EXISTS resume_feedback (
     FOREIGN KEY (resume_id) REFERENCES resume_details (resume_id),
     FOREIGN KEY (jd_id) REFERENCES job_description_details (jd_id)
 );
+
+-- One row per LLM-backed operation (resume analysis, JD builder, JD analyze)
+CREATE TABLE IF NOT EXISTS llm_usage_log (
+    usage_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    call_type TEXT NOT NULL,
+    jd_id INTEGER,
+    resume_id INTEGER,
+    user_name TEXT,
+    llm_provider TEXT,
+    llm_model TEXT,
+    llm_endpoint TEXT,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    cached_input_tokens INTEGER,
+    llm_latency_ms INTEGER,
+    estimated_cost_usd REAL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_llm_usage_log_jd_id ON llm_usage_log (jd_id);
+
+-- Shared token buckets of the LLM rate limiter ("<model or endpoint>:requests" / ":tokens")
+CREATE TABLE IF NOT EXISTS llm_rate_limit_bucket (
+    bucket_key TEXT PRIMARY KEY,
+    available REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+-- Daily rollup served by the /usage endpoints (jd_id 0 / user_name '' = not attributable)
+CREATE TABLE IF NOT EXISTS llm_usage_daily_rollup (
+    rollup_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    usage_date DATE NOT NULL,
+    jd_id INTEGER NOT NULL DEFAULT 0,
+    user_name TEXT NOT NULL DEFAULT '',
+    call_type TEXT NOT NULL,
+    llm_provider TEXT NOT NULL DEFAULT '',
+    llm_model TEXT NOT NULL DEFAULT '',
+    call_count INTEGER NOT NULL DEFAULT 0,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    llm_latency_ms INTEGER NOT NULL DEFAULT 0,
+    estimated_cost_usd REAL NOT NULL DEFAULT 0,
+    CONSTRAINT uq_llm_usage_daily_rollup
+        UNIQUE (usage_date, jd_id, user_name, call_type, llm_provider, llm_model)
+);
+
+CREATE INDEX IF NOT EXISTS ix_llm_usage_daily_rollup_usage_date ON llm_usage_daily_rollup (usage_date);
+CREATE INDEX IF NOT EXISTS ix_llm_usage_daily_rollup_jd_id ON llm_usage_daily_rollup (jd_id);
+
+-- Analysis reply of a resume, stored before it is parsed so a worker crash
+-- does not cost a new LLM call; removed when the analysis row is stored
+CREATE TABLE IF NOT EXISTS resume_analysis_checkpoint (
+    resume_id INTEGER PRIMARY KEY,
+    jd_id INTEGER NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    stage TEXT NOT NULL,              -- invoked | invalid
+    raw_response TEXT NOT NULL,
+    pending_usage_json TEXT,
+    cascade_json TEXT,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (resume_id) REFERENCES resume_details (resume_id),
+    FOREIGN KEY (jd_id) REFERENCES job_description_details (jd_id)
+);
+
+-- Resume state transitions for the SSE progress stream, shared by all
+-- processes; the resume worker prunes rows past their retention
+CREATE TABLE IF NOT EXISTS resume_progress_event (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jd_id INTEGER NOT NULL,
+    resume_id INTEGER NOT NULL,
+    payload_json TEXT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_resume_progress_event_jd_id_event_id ON resume_progress_event (jd_id, event_id);
+CREATE INDEX IF NOT EXISTS ix_resume_progress_event_created_at ON resume_progress_event (created_at);
+
+-- Skills per resume: taxonomy matches from upload-time extraction plus any
+-- extra skills the LLM analysis reported (source = 'taxonomy' | 'llm')
+CREATE TABLE IF NOT EXISTS resume_skill (
+    resume_skill_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id INTEGER NOT NULL,
+    skill TEXT NOT NULL,          -- lower-cased canonical name
+    display_name TEXT NOT NULL,
+    category TEXT,
+    source TEXT NOT NULL,
+    mentions INTEGER,
+    FOREIGN KEY (resume_id) REFERENCES resume_details (resume_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_resume_skill_resume_id ON resume_skill (resume_id);
+CREATE INDEX IF NOT EXISTS ix_resume_skill_skill_resume_id ON resume_skill (skill, resume_id);
+
+-- Full-text keyword search (GET /search); rowid = resume_id. Postgres uses
+-- resume_search_document (tsvector + GIN), created at startup instead.
+CREATE VIRTUAL TABLE IF NOT EXISTS resume_search_fts USING fts5(
+    candidate,
+    analysis,
+    resume_text,
+    jd_id UNINDEXED,
+    tokenize = "porter unicode61 tokenchars '+#'"
+);
@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+
+# Point the app at a scratch SQLite file before app.models.db builds its engine
+_DB_DIR = tempfile.mkdtemp(prefix="hiresence-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from app.models import db as db_module  # noqa: E402
+import app.models.job_description  # noqa: E402,F401
+import app.models.resume  # noqa: E402,F401
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    db_module.Base.metadata.create_all(bind=db_module.engine)
+    yield
+
+
+@pytest.fixture
+def db_session():
+    session = db_module.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,19 @@
+from app.services.lexical_screening import bm25_scores
+
+JD = "Senior backend engineer: Python, Kafka, Terraform, Kubernetes, PostgreSQL, distributed systems."
+
+
+def test_long_resume_with_full_coverage_passes_screening():
+    terms = "Python Kafka Terraform Kubernetes PostgreSQL distributed systems senior backend engineer"
+    thin = f"Jane Doe. {terms}."
+    # A three-page CV: every JD term once, among ~1500 other tokens
+    filler = " ".join(f"achievement{i} delivered platform migration" for i in range(400))
+    long = f"John Roe. {terms}. {filler}"
+
+    thin_score, long_score = bm25_scores(JD, [thin, long])
+
+    assert thin_score == 1.0
+    # Above the README's suggested starting threshold (0.1) by a wide margin,
+    # and length costs a bounded share of the thin resume's score
+    assert long_score >= 0.8
+    assert bm25_scores(JD, [long])[0] == long_score
@@ -0,0 +1,45 @@
+import asyncio
+
+from app.core.config import settings
+from app.services import progress_events
+from app.services.progress_events import ProgressBroadcaster, publish_resume_event
+
+
+def test_subscribers_share_one_reader_per_jd(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "progress_events_poll_seconds", 0.02)
+    reads: list[int] = []
+    batches: list[int] = []
+    read_progress_events = progress_events.read_progress_events
+
+    def counting_read(jd_id, *, after_id, limit=500):
+        events, last_id = read_progress_events(jd_id, after_id=after_id, limit=limit)
+        reads.append(jd_id)
+        if events:
+            batches.append(len(events))
+        return events, last_id
+
+    monkeypatch.setattr(progress_events, "read_progress_events", counting_read)
+
+    async def scenario():
+        broadcaster = ProgressBroadcaster()
+        queues = [broadcaster.subscribe(901) for _ in range(5)]
+        await asyncio.sleep(0.1)
+        reads_before = len(reads)
+
+        for resume_id in (1, 2):
+            publish_resume_event(db_session, jd_id=901, resume_id=resume_id, state="processed", status="processed")
+        received = [[(await asyncio.wait_for(queue.get(), 2))["resume_id"] for _ in range(2)] for queue in queues]
+
+        polls = len(reads) - reads_before
+        for queue in queues:
+            broadcaster.unsubscribe(901, queue)
+        await asyncio.sleep(0.1)
+        return received, polls, broadcaster
+
+    received, polls, broadcaster = asyncio.run(scenario())
+
+    assert received == [[1, 2]] * 5
+    # One DB read per poll for all five subscribers, and the batch was read once
+    assert sum(batches) == 2
+    assert polls <= 0.5 / settings.progress_events_poll_seconds
+    assert not broadcaster._readers
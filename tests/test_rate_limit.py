@@ -0,0 +1,41 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.agents.rate_limit import RateLimitedChatModel
+
+
+class _Limiter:
+    output_estimate = 0.0
+
+    def estimate_tokens(self, messages):
+        return 1.0
+
+    def acquire(self, tokens):
+        return 0.0
+
+    def reconcile(self, estimated, actual):
+        pass
+
+    def observe_output_tokens(self, output_tokens):
+        pass
+
+
+class _Inner:
+    def __init__(self):
+        self.kwargs = []
+
+    def invoke(self, messages, stop=None, config=None, **kwargs):
+        self.kwargs.append(kwargs)
+        return AIMessage(content="{}")
+
+
+def test_call_options_reach_the_wrapped_model():
+    inner = _Inner()
+    model = RateLimitedChatModel(inner=inner, limiter=_Limiter())
+    response_format = {"type": "json_object"}
+
+    model.bind(response_format=response_format).invoke([HumanMessage(content="hi")])
+    asyncio.run(model.bind(response_format=response_format).ainvoke([HumanMessage(content="hi")]))
+
+    assert inner.kwargs == [{"response_format": response_format}] * 2
@@ -0,0 +1,20 @@
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import db as db_module
+from app.models.job_description import JobDescription
+from app.models.resume import Resume
+
+
+def _default(monkeypatch, dialect, column):
+    monkeypatch.setattr(db_module, "engine", SimpleNamespace(dialect=dialect))
+    return db_module._default_sql(column, column.server_default.arg)
+
+
+def test_boolean_defaults_compile_per_dialect(monkeypatch):
+    columns = JobDescription.__table__.c
+    assert _default(monkeypatch, postgresql.dialect(), columns.force_full_analysis) == "false"
+    assert _default(monkeypatch, sqlite.dialect(), columns.force_full_analysis) == "0"
+    # Legacy string defaults on BOOLEAN columns are translated too
+    assert _default(monkeypatch, postgresql.dialect(), Resume.__table__.c.is_active) == "true"
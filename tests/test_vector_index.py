@@ -0,0 +1,41 @@
+import multiprocessing
+import os
+
+import numpy as np
+
+from app.services.vector_index import ResumeVectorIndex
+
+DIM = 16
+
+
+def _vector(resume_id: int) -> np.ndarray:
+    vector = np.random.default_rng(resume_id).standard_normal(DIM).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _count(directory: str, result) -> None:
+    result.put(len(ResumeVectorIndex(directory, DIM)))
+
+
+def test_reader_waits_for_writer_instead_of_resetting(tmp_path):
+    directory = str(tmp_path)
+    writer = ResumeVectorIndex(directory, DIM)
+    writer.add(1, _vector(1))
+
+    context = multiprocessing.get_context("fork")
+    result = context.Queue()
+    with writer._file_lock():
+        # Mid-write, meta.json is briefly missing; a reader that resets now
+        # would wipe what the writer is appending
+        os.remove(os.path.join(directory, "meta.json"))
+        reader = context.Process(target=_count, args=(directory, result))
+        reader.start()
+        reader.join(0.5)
+        assert reader.is_alive()
+        writer._write_meta()
+        writer.add(2, _vector(2))
+
+    reader.join(10)
+    assert reader.exitcode == 0
+    assert result.get(timeout=1) == 2
+    assert len(ResumeVectorIndex(directory, DIM)) == 2